@@ -1,5 +1,5 @@
 
-import pandas as pd
+from models import instrumentation
 from models.dto.base_data_provider import BaseDataProvider
 from models.dto.option_information import OptionInformation
 from models.var_calculation import AssetInformation
@@ -8,44 +8,106 @@ from models.var_calculation import AssetInformation
   
 class AssessmentDataProvider(BaseDataProvider):
     """
-    DataProvider specific to the excel file in the assessment
+    DataProvider specific to the excel file in the assessment.
+    The workbook is opened only once per provider, and the parsed values are kept on the instance.
     """
+
+    VAR_SHEET_NAME = "VaR Calculation"
+    OPTION_SHEET_NAME = "Option"
+
+    # Layout of the assessment file (0-based rows)
+    SPOT_HEADER_ROW = 1
+    HISTORICAL_DATA_HEADER_ROW = 5
+    OPTION_HEADER_ROW = 2
+
+    def __init__(self, data_source):
+        super().__init__(data_source)
+        self.__spot_values = None
+        self.__historical_data = None
+        self.__option_values = None
+
+
+    def __load(self):
+        """
+        Reads all the required values from the workbook in a single pass.
+        The workbook is opened in read-only mode, and only the needed rows/columns are extracted from the sheets.
+        Parsing it directly with openpyxl avoids creating dataframes for the whole sheet.
+        openpyxl is imported here, so that it is loaded only when an excel file is actually read.
+        """
+        if self.__option_values is not None:
+            return
+
+        with instrumentation.stage("load_excel"):
+            import openpyxl
+
+            workbook = openpyxl.load_workbook(self.data_source, read_only=True, data_only=True)
+            try:
+                var_sheet = workbook[self.VAR_SHEET_NAME]
+
+                # Only the rows up to the historical data header are needed to find the spot values and the columns to read
+                header_rows = list(var_sheet.iter_rows(max_row=self.HISTORICAL_DATA_HEADER_ROW + 1, values_only=True))
+
+                spot_column = header_rows[self.SPOT_HEADER_ROW].index("SPOT Portfolio value")
+                self.__spot_values = [float(row[spot_column]) for row in header_rows[self.SPOT_HEADER_ROW + 1:self.SPOT_HEADER_ROW + 3]]
+
+                historical_header = header_rows[self.HISTORICAL_DATA_HEADER_ROW]
+                market_rate_columns = [column for column, name in enumerate(historical_header) if name == "market rate"][:2]
+                assert len(market_rate_columns) == 2, "Market rates of both currencies are required"
+
+                first_column, last_column = market_rate_columns
+                historical_rows = list(var_sheet.iter_rows(min_row=self.HISTORICAL_DATA_HEADER_ROW + 2,
+                                                           min_col=first_column + 1,
+                                                           max_col=last_column + 1,
+                                                           values_only=True))
+
+                # Sheet dimensions can include empty rows at the end, which are not part of the data
+                while historical_rows and historical_rows[-1][0] is None and historical_rows[-1][-1] is None:
+                    historical_rows.pop()
+
+                self.__historical_data = [[float("nan") if row[column] is None else float(row[column]) for row in historical_rows]
+                                          for column in (0, last_column - first_column)]
+
+                option_rows = list(workbook[self.OPTION_SHEET_NAME].iter_rows(min_row=self.OPTION_HEADER_ROW + 1, values_only=True))
+                name_column = option_rows[0].index("European Vanilla Call")
+                value_column = option_rows[0].index("base case")
+                self.__option_values = [(row[name_column], row[value_column]) for row in option_rows[1:]]
+            finally:
+                workbook.close()
+
+
     def get_assets(self):
         """
         Parse the provided excel file to fetch the required data.
         """
+        self.__load()
 
-        # This reads the same excel file twice. Not computatinally efficient but good enough for the use case
-        historical_data_df = pd.read_excel(self.data_source, header=5, sheet_name="VaR Calculation")
-        spot_data_df = pd.read_excel(self.data_source, header=1, sheet_name="VaR Calculation")
-
-        ccy1_spot_value = spot_data_df["SPOT Portfolio value"].iloc[0]
-        ccy2_spot_value = spot_data_df["SPOT Portfolio value"].iloc[1]
+        ccy1_spot_value, ccy2_spot_value = self.__spot_values
 
         # For more complex data, using dataframes would probably be a wiser choice to simplify the operations.
-        ccy1_historical_data = historical_data_df['market rate'].tolist()
-        ccy2_historical_data = historical_data_df['market rate.1'].tolist()
+        ccy1_historical_data, ccy2_historical_data = self.__historical_data
 
-        ccy1_asset_info = AssetInformation("ccy1", ccy1_spot_value, ccy1_historical_data)
-        ccy2_asset_info = AssetInformation("ccy2", ccy2_spot_value, ccy2_historical_data)
+        ccy1_asset_info = AssetInformation("ccy1", ccy1_spot_value, list(ccy1_historical_data))
+        ccy2_asset_info = AssetInformation("ccy2", ccy2_spot_value, list(ccy2_historical_data))
 
         return [ccy1_asset_info, ccy2_asset_info]
 
 
     def get_option_information(self) -> OptionInformation:
-        def get_value_for_parameter(df, param_name, index = 0):
-            return float(df.loc[df['European Vanilla Call'] == param_name, 'base case'].values[index])
-        
-        option_df = pd.read_excel(self.data_source, header=2, sheet_name="Option")
-        s0 = get_value_for_parameter(option_df, "S0")
-        k = get_value_for_parameter(option_df, "K (strike)")
-        t = get_value_for_parameter(option_df, "Time to Expiry")
-        r = get_value_for_parameter(option_df, "r")
-        v = get_value_for_parameter(option_df, "Vol")
-
-        call_price = get_value_for_parameter(option_df, "Call", 1)  # Using the second result for Spot call price
-        put_price = get_value_for_parameter(option_df, "Put", 0)  # Using the result for Put option with forward price
+        def get_value_for_parameter(option_values, param_name, index = 0):
+            return float([value for name, value in option_values if name == param_name][index])
+
+        self.__load()
+
+        option_values = self.__option_values
+        s0 = get_value_for_parameter(option_values, "S0")
+        k = get_value_for_parameter(option_values, "K (strike)")
+        t = get_value_for_parameter(option_values, "Time to Expiry")
+        r = get_value_for_parameter(option_values, "r")
+        v = get_value_for_parameter(option_values, "Vol")
+
+        call_price = get_value_for_parameter(option_values, "Call", 1)  # Using the second result for Spot call price
+        put_price = get_value_for_parameter(option_values, "Put", 0)  # Using the result for Put option with forward price
                                                        # as Spot/Put price was not provided.
                                                        # Checked manually to see if the values are close enough for our purpose.
 
-        return OptionInformation(s0, k, t, r, v, call_price, put_price)
\ No newline at end of file
+        return OptionInformation(s0, k, t, r, v, call_price, put_price)
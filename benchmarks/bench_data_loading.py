@@ -0,0 +1,50 @@
+"""
+Compares the time to load the same market data from the assessment excel file and from the columnar binary file.
+
+Usage:
+    python -m benchmarks.bench_data_loading [number of historical days]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from assessment_data_provider import AssessmentDataProvider
+from benchmarks.synthetic_data import create_assessment_workbook
+from columnar_data_provider import ColumnarDataProvider
+
+
+def measure_loading(provider_class, path, repeat=3):
+    """
+    Measure the time to create a provider and read all the data from it.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data_provider = provider_class(path)
+        data_provider.get_assets()
+        data_provider.get_option_information()
+        durations.append(time.perf_counter() - start)
+
+    return min(durations)
+
+
+if __name__ == "__main__":
+    day_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    with tempfile.TemporaryDirectory() as directory:
+        excel_path = os.path.join(directory, "assessment.xlsx")
+        columnar_path = os.path.join(directory, "assessment.npz")
+        create_assessment_workbook(excel_path, day_count)
+
+        start = time.perf_counter()
+        ColumnarDataProvider.convert(AssessmentDataProvider(excel_path), columnar_path)
+        conversion_duration = time.perf_counter() - start
+
+        excel_duration = measure_loading(AssessmentDataProvider, excel_path)
+        columnar_duration = measure_loading(ColumnarDataProvider, columnar_path)
+
+    print(f"Historical days: {day_count}")
+    print(f"One-time conversion: {conversion_duration:.3f}s")
+    print(f"Excel: {excel_duration:.4f}s")
+    print(f"Columnar: {columnar_duration:.4f}s ({excel_duration / columnar_duration:.0f}x)")
@@ -0,0 +1,91 @@
+"""
+Compares the memory footprint of many options and assets stored as dict-backed objects (the previous DTO layout),
+slot-based DTOs, and the columnar OptionBook/AssetPanel containers. Memory is measured with tracemalloc.
+
+Usage:
+    python -m benchmarks.bench_dto_memory [number of options] [number of assets] [number of historical days]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic_data import create_market_rates
+from models.dto.asset_information import AssetInformation
+from models.dto.asset_panel import AssetPanel
+from models.dto.option_book import OptionBook
+from models.dto.option_information import OptionInformation
+
+
+class DictOptionInformation:
+    """
+    Same layout as OptionInformation before it used slots.
+    """
+    def __init__(self, S_current_price, K_strike_price, T_time_to_maturity, r_risk_free_interest_rate, v_volatility,
+                 expected_call_price=None, expected_put_price=None):
+        self.S_current_price = S_current_price
+        self.K_strike_price = K_strike_price
+        self.T_time_to_maturity = T_time_to_maturity
+        self.r_risk_free_interest_rate = r_risk_free_interest_rate
+        self.v_volatility = v_volatility
+        self.expected_call_price = expected_call_price
+        self.expected_put_price = expected_put_price
+
+
+class DictAssetInformation:
+    """
+    Same layout as AssetInformation before it used slots.
+    """
+    def __init__(self, asset_name, spot_value, historical_data):
+        self.asset_name = asset_name
+        self.spot_value = spot_value
+        self.historical_data = historical_data
+
+
+def measure(create):
+    """
+    Returns:
+        memory kept by the created objects in bytes, and the duration of the creation in seconds
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = create()
+    duration = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return size, duration
+
+
+def print_measurements(title, measurements):
+    print(title)
+    base_size = measurements[0][1]
+    for name, size, duration in measurements:
+        print(f"    {name}: {size / 2 ** 20:.1f}MB ({size / base_size:.0%} of the dict-backed objects), created in {duration:.3f}s")
+
+
+if __name__ == "__main__":
+    option_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    asset_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    day_count = int(sys.argv[3]) if len(sys.argv) > 3 else 260
+
+    rng = np.random.default_rng(42)
+    option_parameters = [rng.uniform(50, 150, option_count), rng.uniform(50, 150, option_count), rng.uniform(0.01, 3, option_count),
+                         rng.uniform(-0.01, 0.05, option_count), rng.uniform(0.05, 1.0, option_count)]
+    # The objects get Python floats, like the values read from a file, and the floats are included in the measurement
+    measurements = [(name, *measure(lambda: [dto_class(*row) for row in zip(*[values.tolist() for values in option_parameters])]))
+                    for name, dto_class in (("dict-backed objects", DictOptionInformation), ("slot-based OptionInformation", OptionInformation))]
+    measurements.append(("OptionBook", *measure(lambda: OptionBook(*option_parameters))))
+    print_measurements(f"Options: {option_count}", measurements)
+
+    asset_names = [f"asset{i}" for i in range(asset_count)]
+    spot_values = rng.uniform(-1e6, 1e6, asset_count).tolist()
+    market_rates = create_market_rates(asset_count, day_count)
+
+    measurements = [(name, *measure(lambda: [dto_class(name, spot_value, rates) for name, spot_value, rates in zip(asset_names, spot_values, market_rates.tolist())]))
+                    for name, dto_class in (("dict-backed objects with lists", DictAssetInformation), ("slot-based AssetInformation with lists", AssetInformation))]
+    # The panel keeps the provided matrix without copying it, so a copy is made in the measurement to include the matrix
+    measurements.append(("AssetPanel", *measure(lambda: AssetPanel(asset_names, spot_values, market_rates.copy()))))
+    print_measurements(f"Assets: {asset_count}, historical days: {day_count}", measurements)
@@ -0,0 +1,57 @@
+"""
+Measures the time to load the assessment workbook with AssessmentDataProvider, compared to the previous
+implementation which read the "VaR Calculation" sheet twice and the workbook three times in total.
+
+Usage:
+    python -m benchmarks.bench_excel_loading [number of historical days]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from assessment_data_provider import AssessmentDataProvider
+from benchmarks.synthetic_data import create_assessment_workbook
+
+
+def load_with_separate_reads(path):
+    """
+    The reads done by the previous implementation of get_assets and get_option_information.
+    """
+    historical_data_df = pd.read_excel(path, header=5, sheet_name="VaR Calculation")
+    spot_data_df = pd.read_excel(path, header=1, sheet_name="VaR Calculation")
+    option_df = pd.read_excel(path, header=2, sheet_name="Option")
+
+    return historical_data_df['market rate'].tolist(), spot_data_df["SPOT Portfolio value"].iloc[0], option_df
+
+
+def load_with_provider(path):
+    data_provider = AssessmentDataProvider(path)
+    return data_provider.get_assets(), data_provider.get_option_information()
+
+
+def measure(function, path, repeat=3):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(path)
+        durations.append(time.perf_counter() - start)
+
+    return min(durations)
+
+
+if __name__ == "__main__":
+    day_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "assessment.xlsx")
+        create_assessment_workbook(path, day_count)
+
+        previous_duration = measure(load_with_separate_reads, path)
+        provider_duration = measure(load_with_provider, path)
+
+    print(f"Historical days: {day_count}")
+    print(f"Separate reads (previous implementation): {previous_duration:.3f}s")
+    print(f"AssessmentDataProvider single pass: {provider_duration:.3f}s ({previous_duration / provider_duration:.1f}x)")
@@ -0,0 +1,60 @@
+"""
+Compares the vectorized implied volatility solver against a scalar loop of scipy root finding over BlackScholesModel,
+which is how implied volatilities were calculated before the solver.
+
+Usage:
+    python -m benchmarks.bench_implied_volatility [number of options]
+"""
+import sys
+import time
+
+import numpy as np
+from scipy.optimize import brentq
+
+from models.black_and_scholes_model import BlackScholesModel, VectorizedBlackScholesModel
+from models.dto.option_information import OptionInformation
+from models.implied_volatility import ImpliedVolatilitySolver
+
+
+def create_market_prices(option_count, seed=42):
+    """
+    Create random calls with known volatilities and their prices.
+    """
+    rng = np.random.default_rng(seed)
+    S = rng.uniform(80, 120, option_count)
+    K = rng.uniform(80, 120, option_count)
+    T = rng.uniform(0.1, 2.0, option_count)
+    r = rng.uniform(0.0, 0.05, option_count)
+    v = rng.uniform(0.1, 0.6, option_count)
+
+    return VectorizedBlackScholesModel(S, K, T, r, v).calculate_call_option_price(), S, K, T, r
+
+
+def solve_with_scalar_loop(market_prices, S, K, T, r):
+    def call_price_difference(volatility, option_info, market_price):
+        option_info.v_volatility = volatility
+        return BlackScholesModel(option_info).calculate_call_option_price() - market_price
+
+    return [brentq(call_price_difference, 1e-6, 10.0, args=(OptionInformation(*params, None), price), xtol=1e-12)
+            for price, *params in zip(market_prices, S, K, T, r)]
+
+
+if __name__ == "__main__":
+    option_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    market_prices, S, K, T, r = create_market_prices(option_count)
+
+    start = time.perf_counter()
+    result = ImpliedVolatilitySolver().solve(market_prices, S, K, T, r)
+    vectorized_time = time.perf_counter() - start
+
+    # The scalar loop is slow, so it is measured on a subset and scaled up
+    scalar_count = min(option_count, 1000)
+    start = time.perf_counter()
+    scalar_volatilities = solve_with_scalar_loop(market_prices[:scalar_count], S[:scalar_count], K[:scalar_count], T[:scalar_count], r[:scalar_count])
+    scalar_time = (time.perf_counter() - start) * option_count / scalar_count
+
+    print(f"Options: {option_count}, converged: {np.count_nonzero(result.status == ImpliedVolatilitySolver.CONVERGED)}")
+    print(f"Vectorized solver: {vectorized_time:.3f}s ({vectorized_time / option_count * 1e6:.2f} us/option)")
+    print(f"Scalar brentq loop (estimated): {scalar_time:.3f}s ({scalar_time / option_count * 1e6:.2f} us/option)")
+    print(f"Speed-up: {scalar_time / vectorized_time:.1f}x")
+    print(f"Max difference to the scalar loop: {np.nanmax(np.abs(result.volatility[:scalar_count] - scalar_volatilities)):.2e}")
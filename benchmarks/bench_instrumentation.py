@@ -0,0 +1,61 @@
+"""
+Measures the overhead of the instrumentation hooks on the hot paths, when profiling is disabled and enabled.
+
+Usage:
+    python -m benchmarks.bench_instrumentation [number of repetitions]
+"""
+import sys
+import time
+
+from benchmarks.synthetic_data import create_market_rates
+from models import instrumentation
+from models.black_and_scholes_model import BlackScholesModel
+from models.dto.asset_information import AssetInformation
+from models.dto.option_information import OptionInformation
+from models.var_calculation import PortfolioVarModel
+
+
+def measure(function, repetitions):
+    """
+    Returns:
+        the fastest duration of the function in seconds, to reduce the noise in the small differences
+    """
+    durations = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def price_options():
+    for _ in range(1000):
+        model = BlackScholesModel(OptionInformation(19, 17, 0.46, 0.005, 0.3))
+        model.calculate_call_option_price()
+        model.calculate_put_option_price()
+
+
+if __name__ == "__main__":
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    assets = [AssetInformation(f"asset{i}", 1000.0, rates) for i, rates in enumerate(create_market_rates(100, 261))]
+
+    def calculate_var():
+        portfolio = PortfolioVarModel()
+        portfolio.add_assets(assets)
+        portfolio.calculate_var()
+        for asset in assets[:10]:
+            portfolio.calculate_incremental_var(asset)
+
+    def call_hooks():
+        for _ in range(1000):
+            with instrumentation.stage("stage"):
+                instrumentation.count("counter")
+
+    for name, function in (("1000 scalar options", price_options), ("VaR of 100 assets", calculate_var), ("1000 hooks", call_hooks)):
+        disabled = measure(function, repetitions)
+
+        instrumentation.enable()
+        enabled = measure(function, repetitions)
+        instrumentation.disable()
+
+        print(f"{name}: disabled {disabled * 1000:.3f}ms, enabled {enabled * 1000:.3f}ms ({enabled / disabled - 1:+.1%})")
@@ -0,0 +1,41 @@
+"""
+Measures the Monte Carlo VaR for increasing numbers of paths and assets, with the peak memory of the simulation.
+
+Usage:
+    python -m benchmarks.bench_monte_carlo_var [number of assets] [number of paths]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic_data import create_market_rates
+from models.monte_carlo_var import MonteCarloVarModel
+from models.var_calculation import PortfolioVarModel
+from models.dto.asset_information import AssetInformation
+
+
+if __name__ == "__main__":
+    asset_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    path_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+
+    market_rates = create_market_rates(asset_count, 2501)
+    spot_values = np.random.default_rng(42).uniform(-1e6, 1e6, asset_count)
+    print(f"Assets: {asset_count}, paths: {path_count}")
+
+    portfolio = PortfolioVarModel()
+    portfolio.add_assets(AssetInformation(f"asset{i}", spot_value, rates) for i, (spot_value, rates) in enumerate(zip(spot_values, market_rates)))
+    print(f"Historical 99% VaR: {portfolio.calculate_var():,.0f}")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = MonteCarloVarModel(path_count, seed=42).calculate_var_results(spot_values, market_rates, confidence_levels=(0.99, 0.975))
+    duration = time.perf_counter() - start
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"Monte Carlo: {duration:.3f}s, {path_count / duration:,.0f} paths/s, peak memory: {peak_memory / 2 ** 20:.1f}MB "
+          f"(all the shocks would be {path_count * asset_count * 8 / 2 ** 20:,.0f}MB)")
+    for result in results:
+        print(f"    {result.confidence_level:.1%} VaR: {result.var:,.0f}, expected shortfall: {result.expected_shortfall:,.0f}")
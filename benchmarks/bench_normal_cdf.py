@@ -0,0 +1,47 @@
+"""
+Compares the per-option pricing latency with the different normal distribution backends,
+and the array throughput of scipy.special.ndtr against scipy.stats.norm.cdf.
+
+Usage:
+    python -m benchmarks.bench_normal_cdf [number of repetitions]
+"""
+import sys
+import timeit
+
+import numpy as np
+
+from models.black_and_scholes_model import BlackScholesModel, VectorizedBlackScholesModel
+from models.dto.option_information import OptionInformation
+
+
+def measure_single_option_latency(backend, repetitions):
+    """
+    Measure the time to create a model and price a call and a put for a single option.
+    """
+    option_info = OptionInformation(100, 95, 1, 0.05, 0.2)
+
+    def price():
+        model = BlackScholesModel(option_info, normal_cdf_backend=backend)
+        return model.calculate_call_option_price(), model.calculate_put_option_price()
+
+    return min(timeit.repeat(price, number=repetitions, repeat=5)) / repetitions, price()
+
+
+if __name__ == "__main__":
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    reference_latency, reference_prices = measure_single_option_latency("scipy.stats", repetitions)
+    print(f"Single option, scipy.stats: {reference_latency * 1e6:.2f} us")
+    for backend in ("ndtr", "erfc"):
+        latency, prices = measure_single_option_latency(backend, repetitions)
+        difference = max(abs(price - reference_price) for price, reference_price in zip(prices, reference_prices))
+        print(f"Single option, {backend}: {latency * 1e6:.2f} us ({reference_latency / latency:.1f}x), max price difference {difference:.2e}")
+
+    rng = np.random.default_rng(42)
+    option_count = 1_000_000
+    S, K = rng.uniform(80, 120, option_count), rng.uniform(80, 120, option_count)
+    for backend in ("scipy.stats", "ndtr"):
+        def price_book():
+            return VectorizedBlackScholesModel(S, K, 1.0, 0.05, 0.2, normal_cdf_backend=backend).calculate_option_prices()
+        duration = min(timeit.repeat(price_book, number=1, repeat=3))
+        print(f"Book of {option_count} options, {backend}: {duration:.3f}s ({duration / option_count * 1e9:.1f} ns/option)")
@@ -0,0 +1,69 @@
+"""
+Compares the VaR of an option book calculated with full revaluation, with the delta-gamma approximation,
+and with repricing every option in every scenario with the scalar model (measured on a sample and extrapolated).
+
+Usage:
+    python -m benchmarks.bench_option_var [number of options] [number of scenarios]
+"""
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_data import create_market_rates
+from models.black_and_scholes_model import BlackScholesModel
+from models.dto.option_information import OptionInformation
+from models.dto.option_position_information import OptionPositionInformation
+from models.option_revaluation import OptionRevaluationModel
+from models.var_calculation import PortfolioVarModel
+
+
+def create_positions(option_count, market_rates, seed=42):
+    """
+    Create random option positions on the synthetic assets, at the current rate of their underlying.
+    """
+    rng = np.random.default_rng(seed)
+    underlyings = rng.integers(0, len(market_rates), option_count)
+    return [OptionPositionInformation(f"asset{underlying}", market_rates[underlying],
+                                      OptionInformation(market_rates[underlying][0], market_rates[underlying][0] * rng.uniform(0.8, 1.2),
+                                                        rng.uniform(0.1, 2), 0.02, rng.uniform(0.1, 0.4)),
+                                      rng.uniform(-1e4, 1e4), is_call=bool(rng.integers(0, 2)))
+            for underlying in underlyings]
+
+
+def measure_scalar_repricing(positions, spot_shifts):
+    """
+    Returns:
+        seconds to reprice the positions in all the scenarios with one BlackScholesModel per option and scenario
+    """
+    start = time.perf_counter()
+    for position, shifts in zip(positions, spot_shifts):
+        option = position.option_info
+        for shift in shifts:
+            BlackScholesModel(OptionInformation(option.S_current_price * (1 + shift), option.K_strike_price, option.T_time_to_maturity,
+                                                option.r_risk_free_interest_rate, option.v_volatility)).calculate_call_option_price()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    option_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    scenario_count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    market_rates = create_market_rates(50, scenario_count + 1)
+    positions = create_positions(option_count, market_rates)
+    print(f"Options: {option_count}, scenarios: {scenario_count}")
+
+    sample = positions[:20]
+    sample_shifts = [market_rates[int(position.asset_name[5:])][:-1] / market_rates[int(position.asset_name[5:])][1:] - 1 for position in sample]
+    scalar_duration = measure_scalar_repricing(sample, sample_shifts) * option_count / len(sample)
+    print(f"Scalar repricing (extrapolated from {len(sample)} options): {scalar_duration:.1f}s")
+
+    for method in OptionRevaluationModel.METHODS:
+        portfolio = PortfolioVarModel(option_revaluation=OptionRevaluationModel(method))
+        for position in positions:
+            portfolio.add_option_position(position)
+
+        start = time.perf_counter()
+        var = portfolio.calculate_var()
+        duration = time.perf_counter() - start
+        print(f"{method}: {duration:.3f}s ({scalar_duration / duration:.0f}x faster than scalar), 99% VaR: {var:,.0f}")
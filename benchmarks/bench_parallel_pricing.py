@@ -0,0 +1,51 @@
+"""
+Measures the chunked multi-threaded pricing of a large option book for different chunk sizes and numbers of threads.
+
+Usage:
+    python -m benchmarks.bench_parallel_pricing [number of options]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from models.black_and_scholes_model import VectorizedBlackScholesModel
+from models.parallel_pricing import ParallelOptionPricer
+
+
+def create_option_book(option_count, seed=42):
+    """
+    Create random option parameters in realistic ranges.
+    """
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(50, 150, option_count),
+            rng.uniform(50, 150, option_count),
+            rng.uniform(0.01, 3, option_count),
+            rng.uniform(-0.01, 0.05, option_count),
+            rng.uniform(0.05, 1.0, option_count))
+
+
+if __name__ == "__main__":
+    option_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    parameters = create_option_book(option_count)
+    call_prices = np.empty(option_count)
+    put_prices = np.empty(option_count)
+
+    print(f"Options: {option_count}, CPUs: {os.cpu_count()}")
+
+    start = time.perf_counter()
+    expected_calls, _ = VectorizedBlackScholesModel(*parameters).calculate_option_prices()
+    base_duration = time.perf_counter() - start
+    print(f"Single pass: {base_duration:.3f}s, {option_count / base_duration:,.0f} options/s")
+    del expected_calls
+
+    worker_counts = sorted(set([1, 2, 4, os.cpu_count() or 1]))
+    for chunk_size in (4096, 32768, 262144):
+        for worker_count in worker_counts:
+            pricer = ParallelOptionPricer(chunk_size=chunk_size, max_workers=worker_count)
+            start = time.perf_counter()
+            pricer.calculate_option_prices(*parameters, call_prices=call_prices, put_prices=put_prices)
+            duration = time.perf_counter() - start
+            print(f"Chunk size: {chunk_size}, threads: {worker_count}, duration: {duration:.3f}s, "
+                  f"{option_count / duration:,.0f} options/s, speed-up: {base_duration / duration:.2f}x")
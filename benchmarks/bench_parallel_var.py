@@ -0,0 +1,52 @@
+"""
+Measures how the VaR calculation of a portfolio hierarchy scales with the number of worker processes.
+
+Usage:
+    python -m benchmarks.bench_parallel_var [number of assets] [number of scenarios] [number of books]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_data import create_market_rates
+from models.dto.portfolio_node import PortfolioNode
+from models.parallel_var import ParallelPortfolioVarCalculator
+from models.var_calculation import HistoricalScenarioMatrix
+
+
+def create_hierarchy(asset_names, book_count, positions_per_book, books_per_desk=10, seed=42):
+    """
+    Create a firm -> desks -> books hierarchy where each book holds random positions.
+    """
+    rng = np.random.default_rng(seed)
+    books = [PortfolioNode(f"book{book}",
+                           [asset_names[i] for i in rng.integers(0, len(asset_names), positions_per_book)],
+                           rng.uniform(-1e6, 1e6, positions_per_book).tolist())
+             for book in range(book_count)]
+    desks = [PortfolioNode(f"desk{start // books_per_desk}", children=books[start:start + books_per_desk])
+             for start in range(0, book_count, books_per_desk)]
+
+    return PortfolioNode("firm", children=desks)
+
+
+if __name__ == "__main__":
+    asset_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    scenario_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2500
+    book_count = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+    asset_names = [f"asset{i}" for i in range(asset_count)]
+    scenario_matrix = HistoricalScenarioMatrix.from_market_rates(asset_names, create_market_rates(asset_count, scenario_count + 1))
+    root = create_hierarchy(asset_names, book_count, positions_per_book=2000)
+
+    print(f"Assets: {asset_count}, scenarios: {scenario_count}, books: {book_count}, CPUs: {os.cpu_count()}")
+    worker_counts = sorted(set([1, 2, 4, 8, os.cpu_count() or 1]))
+    base_duration = None
+    for worker_count in worker_counts:
+        calculator = ParallelPortfolioVarCalculator(scenario_matrix, max_workers=worker_count, task_size=2000)
+        start = time.perf_counter()
+        node_vars = calculator.calculate_var(root)
+        duration = time.perf_counter() - start
+        base_duration = base_duration or duration
+        print(f"Workers: {worker_count}, nodes: {len(node_vars)}, duration: {duration:.3f}s, speed-up: {base_duration / duration:.2f}x")
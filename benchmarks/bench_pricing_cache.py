@@ -0,0 +1,53 @@
+"""
+Compares the latency of pricing an option from scratch with a hit and a miss of the pricing cache.
+
+Usage:
+    python -m benchmarks.bench_pricing_cache [number of repetitions]
+"""
+import sys
+import time
+
+from models.black_and_scholes_model import BlackScholesModel
+from models.dto.option_information import OptionInformation
+from models.pricing_cache import PricingCache
+
+
+def measure(price, options, repetitions):
+    """
+    Returns:
+        average duration of pricing the call and put of an option in seconds
+    """
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        for option in options:
+            price(option)
+    return (time.perf_counter() - start) / (repetitions * len(options))
+
+
+def price_without_cache(option):
+    model = BlackScholesModel(option)
+    model.calculate_call_option_price()
+    model.calculate_put_option_price()
+
+
+if __name__ == "__main__":
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    options = [OptionInformation(19 + i * 0.01, 17, 0.46, 0.005, 0.3) for i in range(10)]
+
+    cache = PricingCache()
+
+    def price_with_cache(option):
+        cache.calculate_call_option_price(option)
+        cache.calculate_put_option_price(option)
+
+    def price_with_misses(option):
+        cache.invalidate()
+        price_with_cache(option)
+
+    fresh_latency = measure(price_without_cache, options, repetitions)
+    hit_latency = measure(price_with_cache, options, repetitions)
+    miss_latency = measure(price_with_misses, options, repetitions)
+
+    print(f"Call and put without cache: {fresh_latency * 1e6:.2f} us")
+    print(f"Call and put, cache hit: {hit_latency * 1e6:.2f} us ({fresh_latency / hit_latency:.1f}x faster)")
+    print(f"Call and put, cache miss: {miss_latency * 1e6:.2f} us ({miss_latency / fresh_latency - 1:+.0%} overhead)")
@@ -0,0 +1,78 @@
+"""
+Measures the throughput and latency of the pricing service with concurrent clients, compared to running main.py once per request.
+
+Usage:
+    python -m benchmarks.bench_pricing_service [number of clients] [requests per client]
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from assessment_data_provider import AssessmentDataProvider
+from benchmarks.synthetic_data import create_assessment_workbook
+from pricing_service import PricingService
+
+
+async def run_client(host, port, request_count, in_flight, latencies, seed):
+    """
+    Send pricing requests with random volatilities, keeping at most in_flight requests waiting for a response.
+    """
+    rng = np.random.default_rng(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    send_times = {}
+
+    async def read_responses():
+        for _ in range(request_count):
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - send_times.pop(response["id"]))
+
+    reader_task = asyncio.create_task(read_responses())
+    for request_id in range(request_count):
+        while len(send_times) >= in_flight:
+            await asyncio.sleep(0)
+        send_times[request_id] = time.perf_counter()
+        writer.write(json.dumps({"id": request_id, "method": "price", "params": {"v_volatility": rng.uniform(0.1, 0.5)}}).encode() + b"\n")
+        await writer.drain()
+
+    await reader_task
+    writer.close()
+
+
+async def run_benchmark(data_provider, client_count, request_count, in_flight=16):
+    service = PricingService(data_provider, port=0)
+    await service.start()
+    latencies = []
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*[run_client(service.host, service.port, request_count, in_flight, latencies, seed) for seed in range(client_count)])
+        duration = time.perf_counter() - start
+    finally:
+        await service.stop()
+
+    batch_sizes = service.batcher.batch_sizes
+    average_batch_size = sum(size * count for size, count in batch_sizes.items()) / sum(batch_sizes.values())
+    p50, p99, p999 = np.percentile(np.array(latencies) * 1000, [50, 99, 99.9])
+    print(f"Service: {len(latencies) / duration:,.0f} requests/s, average batch size: {average_batch_size:.1f}, "
+          f"latency p50: {p50:.2f}ms, p99: {p99:.2f}ms, p99.9: {p999:.2f}ms")
+
+
+if __name__ == "__main__":
+    client_count = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    request_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "input.xlsx")
+        create_assessment_workbook(path)
+
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "main.py", path], check=True, stdout=subprocess.DEVNULL)
+        print(f"One-shot main.py: {time.perf_counter() - start:.3f}s per request")
+
+        print(f"Clients: {client_count}, requests per client: {request_count}")
+        asyncio.run(run_benchmark(AssessmentDataProvider(path), client_count, request_count))
@@ -0,0 +1,35 @@
+"""
+Compares the rolling VaR time series with calculating the VaR of every window from scratch.
+
+Usage:
+    python -m benchmarks.bench_rolling_var [number of dates] [window size]
+"""
+import sys
+import time
+
+import numpy as np
+
+from models.quantile import calculate_lower_tail_statistics
+from models.rolling_var import RollingVarCalculator
+
+
+if __name__ == "__main__":
+    date_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2520
+    window_size = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    confidence_levels = (0.975, 0.99)
+
+    pnl = np.random.default_rng(42).standard_t(4, date_count + window_size) * 1000
+
+    start = time.perf_counter()
+    for date in range(date_count):
+        calculate_lower_tail_statistics(pnl[date + 1:date + 1 + window_size], [1 - level for level in confidence_levels])
+    full_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = RollingVarCalculator(window_size, confidence_levels).calculate(pnl)
+    rolling_duration = time.perf_counter() - start
+
+    print(f"Dates: {date_count}, window size: {window_size}")
+    print(f"Every window from scratch: {full_duration:.3f}s")
+    print(f"Rolling window: {rolling_duration:.3f}s ({full_duration / rolling_duration:.1f}x faster)")
+    print(f"Exceptions: {result.exception_counts.tolist()}, expected: {np.round(result.expected_exception_counts, 1).tolist()}")
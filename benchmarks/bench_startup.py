@@ -0,0 +1,70 @@
+"""
+Measures the import time of main.py with python -X importtime, and the wall time of a full one-shot run on a columnar file.
+If a maximum import time is provided, exits with an error when it is exceeded, so it can be used to catch startup regressions.
+
+Usage:
+    python -m benchmarks.bench_startup [maximum import time in ms]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from assessment_data_provider import AssessmentDataProvider
+from benchmarks.synthetic_data import create_assessment_workbook
+from columnar_data_provider import ColumnarDataProvider
+
+
+def measure_import_times(module="main", repeat=5):
+    """
+    Import the module in a new interpreter and parse the -X importtime output.
+
+    Returns:
+        the cumulative import time of each module in microseconds, from the fastest of the runs
+    """
+    best_times = None
+    for _ in range(repeat):
+        stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True).stderr
+
+        # Lines are formatted as "import time: self [us] | cumulative | imported package"
+        times = {}
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            times[name.strip()] = int(cumulative)
+
+        if best_times is None or times[module] < best_times[module]:
+            best_times = times
+
+    return best_times
+
+
+if __name__ == "__main__":
+    maximum_import_time = float(sys.argv[1]) if len(sys.argv) > 1 else None
+
+    import_times = measure_import_times()
+    total = import_times["main"] / 1000
+    print(f"Import time of main: {total:.1f}ms")
+    print("Slowest imported modules without a parent package:")
+    top_level_times = {name: duration for name, duration in import_times.items() if "." not in name and name != "main"}
+    for name, duration in sorted(top_level_times.items(), key=lambda item: -item[1])[:10]:
+        print(f"    {name}: {duration / 1000:.1f}ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        excel_path = os.path.join(directory, "input.xlsx")
+        npz_path = os.path.join(directory, "input.npz")
+        create_assessment_workbook(excel_path)
+        ColumnarDataProvider.convert(AssessmentDataProvider(excel_path), npz_path)
+
+        durations = []
+        for _ in range(5):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "main.py", npz_path], check=True, stdout=subprocess.DEVNULL)
+            durations.append(time.perf_counter() - start)
+        print(f"One-shot run of main.py on a columnar file: {min(durations) * 1000:.1f}ms")
+
+    if maximum_import_time is not None and total > maximum_import_time:
+        print(f"Import time exceeds the maximum of {maximum_import_time}ms")
+        exit(1)
@@ -0,0 +1,241 @@
+"""
+Benchmark suite for the pricing and VaR hot paths, with baselines to catch performance regressions.
+
+Every case is measured for several sizes of synthetic data: the latency is the median of the repetitions, the throughput
+is the number of items (options, assets or historical days) per second, and the peak memory is measured with tracemalloc
+in a separate run, so that it doesn't slow down the timed runs.
+
+Usage:
+    python -m benchmarks.suite [quick|full] [--baseline <path>] [--save-baseline <path>] [--threshold <ratio>] [--cases <name,name>]
+
+    quick: small sizes, runs in seconds (default)
+    full: up to 10^7 options and 50k assets
+    --baseline: compares the results with a saved baseline, and exits with an error if a case is slower (or uses more
+                memory) than the baseline by more than the threshold (default 0.2, i.e. 20%)
+    --save-baseline: saves the results to be used as a baseline
+"""
+import atexit
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing
+
+import numpy as np
+
+from benchmarks.synthetic_data import create_assessment_workbook, create_market_rates
+
+
+DEFAULT_THRESHOLD = 0.2
+
+
+class BenchmarkCase:
+    """
+    A benchmark of one hot path. create(size) prepares the data outside of the measurement and returns the function to be timed.
+    """
+    def __init__(self, name, unit, sizes: typing.Dict[str, typing.Sequence[int]], create: typing.Callable[[int], typing.Callable[[], typing.Any]]):
+        """
+        Parameters:
+            name: name of the case
+            unit: what the size counts, used in the throughput
+            sizes: sizes to be measured for each profile
+            create: creates the function to be measured for a size
+        """
+        self.name = name
+        self.unit = unit
+        self.sizes = sizes
+        self.create = create
+
+
+def create_option_parameters(option_count, seed=42):
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(50, 150, option_count), rng.uniform(50, 150, option_count), rng.uniform(0.01, 3, option_count),
+            rng.uniform(-0.01, 0.05, option_count), rng.uniform(0.05, 1.0, option_count))
+
+
+def create_scalar_pricing(option_count):
+    from models.black_and_scholes_model import BlackScholesModel
+    from models.dto.option_information import OptionInformation
+
+    options = [OptionInformation(*parameters) for parameters in zip(*[values.tolist() for values in create_option_parameters(option_count)])]
+
+    def price():
+        for option in options:
+            model = BlackScholesModel(option)
+            model.calculate_call_option_price()
+            model.calculate_put_option_price()
+
+    return price
+
+
+def create_vectorized_pricing(option_count):
+    from models.black_and_scholes_model import VectorizedBlackScholesModel
+
+    parameters = create_option_parameters(option_count)
+    return lambda: VectorizedBlackScholesModel(*parameters).calculate_option_prices()
+
+
+def create_assets(asset_count, day_count=261):
+    from models.dto.asset_information import AssetInformation
+
+    spot_values = np.random.default_rng(42).uniform(-1e6, 1e6, asset_count).tolist()
+    market_rates = create_market_rates(asset_count, day_count)
+    return [AssetInformation(f"asset{i}", spot_value, rates) for i, (spot_value, rates) in enumerate(zip(spot_values, market_rates))]
+
+
+def create_pnl_vector_calculation(asset_count):
+    from models.var_calculation import HistoricalVarCalculationModel
+
+    assets = create_assets(asset_count)
+    return lambda: [HistoricalVarCalculationModel(asset.spot_value, asset.historical_data).calculate_pnl_vector() for asset in assets]
+
+
+def create_portfolio_var_calculation(asset_count):
+    from models.var_calculation import PortfolioVarModel
+
+    assets = create_assets(asset_count)
+
+    def calculate_var():
+        portfolio = PortfolioVarModel()
+        portfolio.add_assets(assets)
+        return portfolio.calculate_var()
+
+    return calculate_var
+
+
+def create_excel_loading(day_count):
+    from assessment_data_provider import AssessmentDataProvider
+
+    # The file is kept until the end of the process, the cases are measured several times
+    directory = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    path = os.path.join(directory, f"input_{day_count}.xlsx")
+    create_assessment_workbook(path, day_count)
+
+    def load():
+        data_provider = AssessmentDataProvider(path)
+        data_provider.get_assets()
+        data_provider.get_option_information()
+
+    return load
+
+
+CASES = [
+    BenchmarkCase("black_scholes_scalar", "options", {"quick": [1, 1000], "full": [1, 100, 10000, 100000]}, create_scalar_pricing),
+    BenchmarkCase("black_scholes_vectorized", "options", {"quick": [1000, 100000], "full": [1000, 100000, 1000000, 10000000]}, create_vectorized_pricing),
+    BenchmarkCase("pnl_vector", "assets", {"quick": [2, 1000], "full": [2, 1000, 10000, 50000]}, create_pnl_vector_calculation),
+    BenchmarkCase("portfolio_var", "assets", {"quick": [2, 1000], "full": [2, 1000, 10000, 50000]}, create_portfolio_var_calculation),
+    BenchmarkCase("excel_loading", "days", {"quick": [260], "full": [260, 2600, 10000]}, create_excel_loading),
+]
+
+
+# Every case is repeated at least MINIMUM_REPEAT times, and until MINIMUM_DURATION seconds have passed,
+# so that the median of the fast cases is not dominated by the timer resolution and noise
+MINIMUM_REPEAT = 3
+MINIMUM_DURATION = 0.2
+MAXIMUM_REPEAT = 1000
+
+
+def measure(function: typing.Callable[[], typing.Any]) -> typing.Dict[str, float]:
+    """
+    Returns:
+        median and minimum duration in seconds, and the peak memory allocated during a run in bytes
+    """
+    durations = []
+    while len(durations) < MINIMUM_REPEAT or (sum(durations) < MINIMUM_DURATION and len(durations) < MAXIMUM_REPEAT):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"median_seconds": statistics.median(durations), "min_seconds": min(durations), "peak_memory_bytes": peak_memory}
+
+
+def run_suite(profile="quick", case_names: typing.Optional[typing.Sequence[str]] = None, print_results=True) -> typing.Dict[str, dict]:
+    """
+    Runs the cases for the sizes of the profile.
+
+    Returns:
+        measurements keyed by "case[size]", with the throughput in items per second
+    """
+    results = {}
+    for case in CASES:
+        if case_names and case.name not in case_names:
+            continue
+        for size in case.sizes[profile]:
+            result = measure(case.create(size))
+            result["throughput"] = size / result["median_seconds"]
+            results[f"{case.name}[{size}]"] = result
+
+            if print_results:
+                print(f"{case.name}[{size}]: {result['median_seconds'] * 1000:.3f}ms, "
+                      f"{result['throughput']:,.0f} {case.unit}/s, peak memory: {result['peak_memory_bytes'] / 2 ** 20:.1f}MB")
+
+    return results
+
+
+def find_regressions(results: typing.Dict[str, dict], baseline: typing.Dict[str, dict], threshold=DEFAULT_THRESHOLD) -> typing.List[str]:
+    """
+    Compares the results with the baseline. Cases that are not in both of them are ignored.
+
+    Returns:
+        a description of each case that is slower, or uses more memory, than the baseline by more than the threshold
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for metric in ("median_seconds", "peak_memory_bytes"):
+            base_value = baseline[name][metric]
+            if base_value and result[metric] > base_value * (1 + threshold):
+                regressions.append(f"{name} {metric}: {result[metric]:.6g} vs baseline {base_value:.6g} (+{result[metric] / base_value - 1:.0%})")
+
+    return regressions
+
+
+def parse_arguments(arguments: typing.Sequence[str]) -> typing.Dict[str, typing.Any]:
+    """
+    Parses the command line arguments. argparse would be an overkill for a few options, similar to main.py.
+    """
+    options = {"profile": "quick", "baseline": None, "save_baseline": None, "threshold": DEFAULT_THRESHOLD, "cases": None}
+    arguments = list(arguments)
+    if arguments and not arguments[0].startswith("--"):
+        options["profile"] = arguments.pop(0)
+    assert options["profile"] in ("quick", "full"), f"Unknown profile: {options['profile']}"
+    assert len(arguments) % 2 == 0, "Every option must have a value"
+
+    for option, value in zip(arguments[::2], arguments[1::2]):
+        name = option[2:].replace("-", "_")
+        assert option.startswith("--") and name in options, f"Unknown option: {option}"
+        options[name] = float(value) if name == "threshold" else value.split(",") if name == "cases" else value
+
+    return options
+
+
+if __name__ == "__main__":
+    options = parse_arguments(sys.argv[1:])
+    results = run_suite(options["profile"], options["cases"])
+
+    if options["save_baseline"]:
+        with open(options["save_baseline"], "w") as baseline_file:
+            json.dump({"profile": options["profile"], "results": results}, baseline_file, indent=2)
+        print(f"Baseline saved to {options['save_baseline']}")
+
+    if options["baseline"]:
+        with open(options["baseline"]) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+
+        regressions = find_regressions(results, baseline, options["threshold"])
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            exit(1)
+        print(f"No regression above {options['threshold']:.0%} compared to {options['baseline']}")
@@ -0,0 +1,60 @@
+"""
+Synthetic data generators shared by the benchmarks.
+"""
+import numpy as np
+
+
+def create_market_rates(asset_count, day_count, seed=42, daily_volatility=0.006):
+    """
+    Create random walk market rates for the assets, sorted from recent to old like the assessment data.
+
+    Returns:
+        market rates matrix of assets x days
+    """
+    rng = np.random.default_rng(seed)
+    log_returns = rng.normal(0, daily_volatility, (asset_count, day_count))
+    log_returns[:, 0] = 0
+
+    return rng.uniform(0.5, 1.5, (asset_count, 1)) * np.exp(np.cumsum(log_returns, axis=1))
+
+
+def create_assessment_workbook(path, day_count=260, seed=42):
+    """
+    Create an excel file with the same layout as the assessment input file, with synthetic values.
+    Option prices are calculated with the Black&Scholes formula, so the file can also be used for the E2E tests.
+    """
+    from openpyxl import Workbook
+    from models.black_and_scholes_model import BlackScholesModel
+    from models.dto.option_information import OptionInformation
+
+    market_rates = create_market_rates(2, day_count, seed)
+
+    workbook = Workbook()
+    var_sheet = workbook.active
+    var_sheet.title = "VaR Calculation"
+    var_sheet.append(["VaR calculation"])
+    var_sheet.append(["Asset", "SPOT Portfolio value"])
+    var_sheet.append(["ccy1", 153084.81])
+    var_sheet.append(["ccy2", 95891.51])
+    var_sheet.append([])
+    var_sheet.append(["Date", "market rate", "shift", "Date", "market rate", "shift"])
+    for day in range(day_count):
+        var_sheet.append([day, market_rates[0, day], None, day, market_rates[1, day], None])
+
+    option_info = OptionInformation(19, 17, 0.46, 0.005, 0.3)
+    model = BlackScholesModel(option_info)
+    option_sheet = workbook.create_sheet("Option")
+    option_sheet.append(["Option pricing"])
+    option_sheet.append([])
+    option_sheet.append(["European Vanilla Call", "base case"])
+    for name, value in (("S0", option_info.S_current_price),
+                        ("K (strike)", option_info.K_strike_price),
+                        ("Time to Expiry", option_info.T_time_to_maturity),
+                        ("r", option_info.r_risk_free_interest_rate),
+                        ("Vol", option_info.v_volatility),
+                        ("Call", 0.0),  # placeholder for the forward price based call, which is not used
+                        ("Call", model.calculate_call_option_price()),
+                        ("Put", model.calculate_put_option_price())):
+        option_sheet.append([name, value])
+
+    workbook.save(path)
@@ -0,0 +1,119 @@
+import sys
+import typing
+
+import numpy as np
+from models import instrumentation
+from models.dto.asset_panel import AssetPanel
+from models.dto.base_data_provider import BaseDataProvider
+from models.dto.option_information import OptionInformation
+from models.var_calculation import AssetInformation
+
+
+class ColumnarDataProvider(BaseDataProvider):
+    """
+    DataProvider reading the market data from a columnar binary file (uncompressed numpy .npz archive).
+    Historical rates are stored as a single float64 matrix (assets x days), so they are loaded without any parsing
+    and the assets get contiguous float64 arrays instead of lists of Python floats.
+
+    The file can be created once from any other data provider, e.g. the excel file of the assessment:
+        python columnar_data_provider.py <path to input excel file> <path to output npz file>
+    """
+
+    # Order of the values in the option_parameters array of the file
+    OPTION_PARAMETERS = ("S_current_price", "K_strike_price", "T_time_to_maturity", "r_risk_free_interest_rate", "v_volatility",
+                         "expected_call_price", "expected_put_price")
+
+    def __init__(self, data_source):
+        super().__init__(data_source)
+        self.__arrays = None
+
+
+    def __load(self) -> typing.Dict[str, np.ndarray]:
+        """
+        Reads all the arrays from the file once.
+        """
+        if self.__arrays is None:
+            with instrumentation.stage("load_npz"), np.load(self.data_source, allow_pickle=False) as archive:
+                self.__arrays = {name: archive[name] for name in archive.files}
+
+        return self.__arrays
+
+
+    def get_historical_rates(self) -> typing.Tuple[typing.List[str], np.ndarray]:
+        """
+        Returns:
+            asset names and the historical rates matrix (assets x days, sorted from recent to old).
+            The matrix can be used directly in HistoricalScenarioMatrix.from_market_rates
+        """
+        arrays = self.__load()
+        return arrays["asset_names"].tolist(), arrays["historical_rates"]
+
+
+    def get_assets(self) -> typing.List[AssetInformation]:
+        """
+        Returns the assets, where the historical data of each asset is a row of the historical rates matrix.
+        """
+        return list(self.iter_assets())
+
+
+    def iter_assets(self) -> typing.Iterator[AssetInformation]:
+        """
+        Yields the assets one by one, creating the AssetInformation objects only when they are requested.
+        """
+        arrays = self.__load()
+        asset_names, historical_rates = self.get_historical_rates()
+
+        for asset_name, spot_value, historical_data in zip(asset_names, arrays["spot_values"], historical_rates):
+            yield AssetInformation(asset_name, float(spot_value), historical_data)
+
+
+    def get_asset_panel(self) -> AssetPanel:
+        """
+        Returns all the assets in a columnar AssetPanel, without creating an object per asset.
+        """
+        asset_names, historical_rates = self.get_historical_rates()
+        return AssetPanel(asset_names, self.__load()["spot_values"], historical_rates)
+
+
+    def get_option_information(self) -> OptionInformation:
+        option_parameters = {name: float(value) for name, value in zip(self.OPTION_PARAMETERS, self.__load()["option_parameters"])}
+
+        # Missing expected prices are stored as NaN
+        for name in ("expected_call_price", "expected_put_price"):
+            if np.isnan(option_parameters[name]):
+                option_parameters[name] = None
+
+        return OptionInformation(**option_parameters)
+
+
+    @classmethod
+    def convert(cls, data_provider: BaseDataProvider, output_path):
+        """
+        One-time conversion of the data from another provider to the columnar format.
+
+        Parameters:
+            data_provider: provider to read the data from, e.g. AssessmentDataProvider
+            output_path: path of the file to be created
+        """
+        assets = data_provider.get_assets()
+        option_info = data_provider.get_option_information()
+
+        assert len(set(len(asset.historical_data) for asset in assets)) == 1, "All assets must have the same amount of historical data"
+
+        option_parameters = [getattr(option_info, name) for name in cls.OPTION_PARAMETERS]
+
+        np.savez(output_path,
+                 asset_names=np.array([asset.asset_name for asset in assets], dtype=str),
+                 spot_values=np.array([asset.spot_value for asset in assets], dtype=np.float64),
+                 historical_rates=np.array([asset.historical_data for asset in assets], dtype=np.float64),
+                 option_parameters=np.array([np.nan if value is None else value for value in option_parameters], dtype=np.float64))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python columnar_data_provider.py <path to input excel file> <path to output npz file>")
+        exit(1)
+
+    from assessment_data_provider import AssessmentDataProvider
+
+    ColumnarDataProvider.convert(AssessmentDataProvider(sys.argv[1]), sys.argv[2])
@@ -1,6 +1,8 @@
 import os
 import sys
 from assessment_data_provider import AssessmentDataProvider
+from columnar_data_provider import ColumnarDataProvider
+from models import instrumentation
 from models.black_and_scholes_model import BlackScholesModel
 from models.var_calculation import PortfolioVarModel
 
@@ -8,8 +10,8 @@ from models.var_calculation import PortfolioVarModel
 if __name__ == "__main__":
     # It is usually a better option to use argparse, but would be an overkill for this purpose
 
-    if len(sys.argv) != 2:
-        print("Usage: python main.py <path to input excel file>")
+    if len(sys.argv) not in (2, 3, 4) or (len(sys.argv) > 2 and sys.argv[2] not in ("--serve", "--profile")):
+        print("Usage: python main.py <path to input excel or npz file> [--serve [port] | --profile [path to report json]]")
         exit(1)
 
     input_file = sys.argv[1]
@@ -17,20 +19,57 @@ if __name__ == "__main__":
         print(f"Provided parameter is not a valid file: {input_file}")
         exit(1)
 
-    data_provider = AssessmentDataProvider(input_file)
+    # Files converted with columnar_data_provider.py are loaded without parsing excel
+    if input_file.endswith(".npz"):
+        data_provider = ColumnarDataProvider(input_file)
+    else:
+        data_provider = AssessmentDataProvider(input_file)
 
-    bm = BlackScholesModel(data_provider.get_option_information())
+    # Service mode keeps the market data in memory and answers the requests until it is stopped
+    if len(sys.argv) > 2 and sys.argv[2] == "--serve":
+        # asyncio is imported only in the service mode to keep the startup of the one-shot mode fast
+        import asyncio
+        from pricing_service import PricingService
 
-    call_price = bm.calculate_call_option_price()
-    print("Call option price with Spot price calculation: " + str(call_price))
+        port = int(sys.argv[3]) if len(sys.argv) > 3 else PricingService.DEFAULT_PORT
+        service = PricingService(data_provider, port=port)
+        print(f"Serving on {service.host}:{port}")
+        try:
+            asyncio.run(service.serve_forever())
+        except KeyboardInterrupt:
+            pass
+        exit(0)
 
-    put_price = bm.calculate_put_option_price()
-    print("Put option price with Spot price calculation: " + str(put_price.real))
+    # Profile mode measures the stages of the calculation, including the peak memory
+    profiler = instrumentation.enable(track_memory=True) if len(sys.argv) > 2 else None
 
+    with instrumentation.stage("load_data"):
+        option_info = data_provider.get_option_information()
+        assets = data_provider.get_assets()
 
-    portfolio_manager = PortfolioVarModel()
-    for asset in data_provider.get_assets():
-        portfolio_manager.add_asset(asset)
+    with instrumentation.stage("option_pricing"):
+        bm = BlackScholesModel(option_info)
 
-    total_var = portfolio_manager.calculate_var()
-    print("VaR 1D 0.99 calculation result: " + str(total_var.real))
\ No newline at end of file
+        call_price = bm.calculate_call_option_price()
+        print("Call option price with Spot price calculation: " + str(call_price))
+
+        put_price = bm.calculate_put_option_price()
+        print("Put option price with Spot price calculation: " + str(put_price.real))
+
+
+    with instrumentation.stage("var"):
+        portfolio_manager = PortfolioVarModel()
+        for asset in assets:
+            portfolio_manager.add_asset(asset)
+
+        total_var = portfolio_manager.calculate_var()
+        print("VaR 1D 0.99 calculation result: " + str(total_var.real))
+
+    if profiler is not None:
+        instrumentation.disable()
+        print()
+        print(profiler.format_report())
+
+        if len(sys.argv) > 3:
+            profiler.export(sys.argv[3])
+            print(f"Profile saved to {sys.argv[3]}")
\ No newline at end of file
@@ -1,14 +1,159 @@
 import math
-from scipy.stats import norm
+import typing
 
+import numpy as np
+
+from models import instrumentation
+from models.dto.option_greeks import OptionGreeks
 from models.dto.option_information import OptionInformation
+from models.normal_distribution import get_normal_cdf
+
+
+SQRT_2_PI = math.sqrt(2.0 * math.pi)
+
+
+class CachedIntermediatesMixin:
+    """
+    Keeps the intermediate values (d1, d2, N(d1), discount factor, etc.) of a pricing model
+    so that call, put and sensitivity calculations on the same option share them.
+    The cache is invalidated whenever one of the PARAMETER_NAMES attributes is assigned.
+    """
+
+    PARAMETER_NAMES = ("S_current_price", "K_strike_price", "T_time_to_maturity", "r_risk_free_interest_rate", "v_volatility")
+
+    def __setattr__(self, name, value):
+        if name in self.PARAMETER_NAMES:
+            self.invalidate_cache()
+        super().__setattr__(name, value)
+
+
+    def invalidate_cache(self):
+        """
+        Drops all the cached intermediate values. Only needed if a parameter is modified in place.
+        """
+        self.__dict__["_intermediates"] = {}
+
+
+    def get_intermediate(self, name, calculate):
+        """
+        Returns the cached intermediate value, calculating it with the provided callable on the first access.
+        """
+        intermediates = self.__dict__.setdefault("_intermediates", {})
+        if name not in intermediates:
+            intermediates[name] = calculate()
+
+        return intermediates[name]
+
+
+class BlackScholesGreeksMixin:
+    """
+    Closed-form Black&Scholes sensitivities.
+    They only use the cached intermediates of the model (d1, N(d1), discount factor, etc.) and plain arithmetic,
+    so the same formulas work for both the scalar and the vectorized models.
+    """
+
+    def calculate_density_d1(self):
+        """
+        Returns:
+            n(d1), the standard normal density at d1
+        """
+        return self.get_intermediate("density_d1", lambda: self.calculate_normal_density(self.calculate_d1()))
+
+
+    def calculate_call_delta(self):
+        """
+        Calculates the call delta: N(d1)
+        """
+        return self.calculate_cumulative_probabilities()[0]
+
+
+    def calculate_put_delta(self):
+        """
+        Calculates the put delta: -N(-d1)
+        """
+        return -self.calculate_cumulative_probabilities()[2]
+
+
+    def calculate_gamma(self):
+        """
+        Calculates the gamma, same for call and put: n(d1) / (S * v * sqrt(t))
+        """
+        return self.calculate_density_d1() / (self.S_current_price * self.v_volatility * self.calculate_sqrt_time_to_maturity())
+
+
+    def calculate_vega(self):
+        """
+        Calculates the vega, same for call and put: S * n(d1) * sqrt(t)
+        """
+        return self.S_current_price * self.calculate_density_d1() * self.calculate_sqrt_time_to_maturity()
+
 
+    def __calculate_theta_decay(self):
+        # Common term of call and put theta: -S * n(d1) * v / (2 * sqrt(t))
+        return self.get_intermediate("theta_decay", lambda: -self.S_current_price * self.calculate_density_d1() * self.v_volatility / (2.0 * self.calculate_sqrt_time_to_maturity()))
 
-class BlackScholesModel:
+
+    def calculate_call_theta(self):
+        """
+        Calculates the call theta (per year): -S * n(d1) * v / (2 * sqrt(t)) - r * K * e^(-rt) * N(d2)
+        """
+        norm_d2 = self.calculate_cumulative_probabilities()[1]
+        return self.__calculate_theta_decay() - self.r_risk_free_interest_rate * self.K_strike_price * self.calculate_discount_factor() * norm_d2
+
+
+    def calculate_put_theta(self):
+        """
+        Calculates the put theta (per year): -S * n(d1) * v / (2 * sqrt(t)) + r * K * e^(-rt) * N(-d2)
+        """
+        norm_minus_d2 = self.calculate_cumulative_probabilities()[3]
+        return self.__calculate_theta_decay() + self.r_risk_free_interest_rate * self.K_strike_price * self.calculate_discount_factor() * norm_minus_d2
+
+
+    def calculate_call_rho(self):
+        """
+        Calculates the call rho: K * t * e^(-rt) * N(d2)
+        """
+        norm_d2 = self.calculate_cumulative_probabilities()[1]
+        return self.K_strike_price * self.T_time_to_maturity * self.calculate_discount_factor() * norm_d2
+
+
+    def calculate_put_rho(self):
+        """
+        Calculates the put rho: -K * t * e^(-rt) * N(-d2)
+        """
+        norm_minus_d2 = self.calculate_cumulative_probabilities()[3]
+        return -self.K_strike_price * self.T_time_to_maturity * self.calculate_discount_factor() * norm_minus_d2
+
+
+    def calculate_greeks(self) -> OptionGreeks:
+        """
+        Calculates all the sensitivities in one go, reusing the intermediates of the pricing calculation.
+
+        Returns:
+            OptionGreeks for the call and put options
+        """
+        return OptionGreeks(call_delta=self.calculate_call_delta(),
+                            put_delta=self.calculate_put_delta(),
+                            gamma=self.calculate_gamma(),
+                            vega=self.calculate_vega(),
+                            call_theta=self.calculate_call_theta(),
+                            put_theta=self.calculate_put_theta(),
+                            call_rho=self.calculate_call_rho(),
+                            put_rho=self.calculate_put_rho())
+
+
+class BlackScholesModel(CachedIntermediatesMixin, BlackScholesGreeksMixin):
     """
     Manages asset information to calculate Call/Put options for an asset.
+    Intermediate values are calculated once and reused until one of the parameters changes.
     """
-    def __init__(self, option_info:OptionInformation):
+    def __init__(self, option_info:OptionInformation, normal_cdf_backend="erfc"):
+        """
+        Parameters:
+            option_info: option to be priced
+            normal_cdf_backend: normal distribution implementation, see models.normal_distribution.NORMAL_CDF_BACKENDS
+        """
+        self.normal_cdf = get_normal_cdf(normal_cdf_backend)
         self.S_current_price = option_info.S_current_price
         self.K_strike_price = option_info.K_strike_price
         self.T_time_to_maturity = option_info.T_time_to_maturity
@@ -16,6 +161,22 @@ class BlackScholesModel:
         self.v_volatility = option_info.v_volatility
 
 
+    def calculate_sqrt_time_to_maturity(self) -> float:
+        """
+        Returns:
+            sqrt(T) for the current asset information
+        """
+        return self.get_intermediate("sqrt_t", lambda: math.sqrt(self.T_time_to_maturity))
+
+
+    def calculate_discount_factor(self) -> float:
+        """
+        Returns:
+            e^(-rt) for the current asset information
+        """
+        return self.get_intermediate("discount_factor", lambda: math.exp(-self.r_risk_free_interest_rate * self.T_time_to_maturity))
+
+
     def calculate_d1(self) -> float:
         """
         Calculates the d1 value using the following formula
@@ -24,12 +185,10 @@ class BlackScholesModel:
         Returns:
             d1 value for the current asset information
         """
+        return self.get_intermediate("d1", self.__calculate_d1)
 
-        # This method calls multiple times with same parameters in our current flow.
-        # Ideally, we can ensure that the parameters do not change between the calls
-        # and reuse the calculated d1 value.
-        # It doesn't make much of a difference in the assessment context
 
+    def __calculate_d1(self) -> float:
         assert self.v_volatility, "Volatility is not provided or zero"
         assert self.T_time_to_maturity, "Time to maturity is not provided or zero"
 
@@ -38,8 +197,8 @@ class BlackScholesModel:
         upper_right = self.T_time_to_maturity * (self.r_risk_free_interest_rate + (self.v_volatility * self.v_volatility / 2.0))
 
         upper = ln + upper_right
-        lower = self.v_volatility * math.sqrt(self.T_time_to_maturity)
-        
+        lower = self.v_volatility * self.calculate_sqrt_time_to_maturity()
+
         return upper / lower
 
 
@@ -51,16 +210,40 @@ class BlackScholesModel:
         Returns:
             d2 value for the current asset information
         """
-        d1 = self.calculate_d1()
-        return d1 - (self.v_volatility * math.sqrt(self.T_time_to_maturity))
+        return self.get_intermediate("d2", lambda: self.calculate_d1() - (self.v_volatility * self.calculate_sqrt_time_to_maturity()))
 
 
     def calculate_normal_distribution(self, d) -> float:
         """
         Calculates normal distribution for the provided value
         """
-        return norm.cdf(d)
-    
+        return self.normal_cdf(d)
+
+
+    def calculate_normal_density(self, d) -> float:
+        """
+        Calculates standard normal density for the provided value
+        """
+        return math.exp(-0.5 * d * d) / SQRT_2_PI
+
+
+    def calculate_cumulative_probabilities(self) -> typing.Tuple[float, float, float, float]:
+        """
+        Calculates the normal distribution values used by the call and put formulas.
+
+        Returns:
+            N(d1), N(d2), N(-d1), N(-d2)
+        """
+        def calculate():
+            d1 = self.calculate_d1()
+            d2 = self.calculate_d2()
+            return (self.calculate_normal_distribution(d1),
+                    self.calculate_normal_distribution(d2),
+                    self.calculate_normal_distribution(-d1),
+                    self.calculate_normal_distribution(-d2))
+
+        return self.get_intermediate("cumulative_probabilities", calculate)
+
 
     def calculate_call_option_price(self) -> float:
         """
@@ -70,16 +253,14 @@ class BlackScholesModel:
         Returns:
             Call option price for the asset
         """
-        d1 = self.calculate_d1()
-        d2 = self.calculate_d2()
-
-        norm_d1 = self.calculate_normal_distribution(d1)
-        norm_d2 = self.calculate_normal_distribution(d2)
+        # Counted when a price is calculated, models created only for the Greeks don't price any option
+        instrumentation.count("options_priced")
+        norm_d1, norm_d2, _, _ = self.calculate_cumulative_probabilities()
 
-        call_option_price = norm_d1 * self.S_current_price - norm_d2 * self.K_strike_price * math.exp(-1 * self.r_risk_free_interest_rate * self.T_time_to_maturity)
+        call_option_price = norm_d1 * self.S_current_price - norm_d2 * self.K_strike_price * self.calculate_discount_factor()
 
         return call_option_price
-    
+
 
     def calculate_put_option_price(self) -> float:
         """
@@ -89,13 +270,185 @@ class BlackScholesModel:
         Returns:
             Put option price for the asset
         """
+        instrumentation.count("options_priced")
+        _, _, norm_minus_d1, norm_minus_d2 = self.calculate_cumulative_probabilities()
 
-        d1 = self.calculate_d1()
-        d2 = self.calculate_d2()
-        norm_d1 = self.calculate_normal_distribution(-d1)
-        norm_d2 = self.calculate_normal_distribution(-d2)
-
-        put_option_price = self.K_strike_price * math.exp(-self.r_risk_free_interest_rate * self.T_time_to_maturity) * norm_d2 - self.S_current_price*norm_d1
+        put_option_price = self.K_strike_price * self.calculate_discount_factor() * norm_minus_d2 - self.S_current_price * norm_minus_d1
 
         return put_option_price
-    
+
+
+class VectorizedBlackScholesModel(CachedIntermediatesMixin, BlackScholesGreeksMixin):
+    """
+    Vectorized counterpart of BlackScholesModel to price a whole book of options in one pass.
+    Every parameter can be a scalar or an array, and they are broadcast against each other.
+    The parameter arrays are treated as immutable; intermediate arrays are cached the same way as in BlackScholesModel.
+    """
+
+    # Column names used when the parameters are provided as a columnar table.
+    # They are the same as the OptionInformation attribute names to keep both APIs consistent.
+    TABLE_COLUMNS = CachedIntermediatesMixin.PARAMETER_NAMES
+
+    def __init__(self, S_current_price, K_strike_price, T_time_to_maturity, r_risk_free_interest_rate, v_volatility,
+                 normal_cdf_backend="ndtr"):
+        """
+        Parameters:
+            S_current_price: current price(s) of the underlying
+            K_strike_price: strike price(s)
+            T_time_to_maturity: time(s) to maturity in years
+            r_risk_free_interest_rate: risk free interest rate(s)
+            v_volatility: volatility(ies)
+            normal_cdf_backend: normal distribution implementation, it must support arrays. See models.normal_distribution.
+                                A callable loaded once with get_normal_cdf avoids looking up the backend for every model
+        """
+        self.normal_cdf = get_normal_cdf(normal_cdf_backend)
+        parameters = [np.asarray(value, dtype=np.float64) for value in (S_current_price,
+                                                                         K_strike_price,
+                                                                         T_time_to_maturity,
+                                                                         r_risk_free_interest_rate,
+                                                                         v_volatility)]
+
+        (self.S_current_price,
+         self.K_strike_price,
+         self.T_time_to_maturity,
+         self.r_risk_free_interest_rate,
+         self.v_volatility) = np.broadcast_arrays(*parameters)
+
+        # Same validation as the scalar model, applied to every option in the book.
+        assert np.all(self.v_volatility), "Volatility is not provided or zero"
+        assert np.all(self.T_time_to_maturity), "Time to maturity is not provided or zero"
+
+
+    @classmethod
+    def from_table(cls, table, columns: typing.Optional[typing.Sequence[str]] = None, normal_cdf_backend="ndtr") -> "VectorizedBlackScholesModel":
+        """
+        Creates the model from a columnar table, e.g. a pandas DataFrame or a dict of arrays.
+
+        Parameters:
+            table: any mapping that returns a column for a column name
+            columns: column names for S, K, T, r and v, in this order. Defaults to TABLE_COLUMNS
+            normal_cdf_backend: normal distribution implementation
+        Returns:
+            Vectorized model for all the rows in the table
+        """
+        columns = columns or cls.TABLE_COLUMNS
+        assert len(columns) == 5, "Column names must be provided for S, K, T, r and v"
+
+        return cls(*[np.asarray(table[column], dtype=np.float64) for column in columns], normal_cdf_backend=normal_cdf_backend)
+
+
+    @classmethod
+    def from_option_informations(cls, options: typing.Iterable[OptionInformation], normal_cdf_backend="ndtr") -> "VectorizedBlackScholesModel":
+        """
+        Creates the model from a list of OptionInformation DTOs.
+        """
+        options = list(options)
+        return cls(*[[getattr(option, column) for option in options] for column in cls.TABLE_COLUMNS], normal_cdf_backend=normal_cdf_backend)
+
+
+    def calculate_sqrt_time_to_maturity(self) -> np.ndarray:
+        """
+        Returns:
+            sqrt(T) for every option
+        """
+        return self.get_intermediate("sqrt_t", lambda: np.sqrt(self.T_time_to_maturity))
+
+
+    def calculate_discount_factor(self) -> np.ndarray:
+        """
+        Returns:
+            e^(-rt) for every option
+        """
+        return self.get_intermediate("discount_factor", lambda: np.exp(-self.r_risk_free_interest_rate * self.T_time_to_maturity))
+
+
+    def calculate_d1(self) -> np.ndarray:
+        """
+        Calculates the d1 values for every option, using the same formula as BlackScholesModel.calculate_d1
+
+        Returns:
+            d1 values for the book
+        """
+        def calculate():
+            ln = np.log(self.S_current_price / self.K_strike_price)
+
+            upper_right = self.T_time_to_maturity * (self.r_risk_free_interest_rate + (self.v_volatility * self.v_volatility / 2.0))
+
+            upper = ln + upper_right
+            lower = self.v_volatility * self.calculate_sqrt_time_to_maturity()
+
+            return upper / lower
+
+        return self.get_intermediate("d1", calculate)
+
+
+    def calculate_d2(self) -> np.ndarray:
+        """
+        Calculates the d2 values for every option.
+
+        Returns:
+            d2 values for the book
+        """
+        return self.get_intermediate("d2", lambda: self.calculate_d1() - (self.v_volatility * self.calculate_sqrt_time_to_maturity()))
+
+
+    def calculate_normal_distribution(self, d) -> np.ndarray:
+        """
+        Calculates normal distribution for the provided values
+        """
+        return self.normal_cdf(d)
+
+
+    def calculate_normal_density(self, d) -> np.ndarray:
+        """
+        Calculates standard normal density for the provided values
+        """
+        return np.exp(-0.5 * d * d) / SQRT_2_PI
+
+
+    def calculate_cumulative_probabilities(self) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculates the normal distribution values used by the call and put formulas.
+
+        Returns:
+            N(d1), N(d2), N(-d1), N(-d2) arrays
+        """
+        def calculate():
+            d1 = self.calculate_d1()
+            d2 = self.calculate_d2()
+            return (self.calculate_normal_distribution(d1),
+                    self.calculate_normal_distribution(d2),
+                    self.calculate_normal_distribution(-d1),
+                    self.calculate_normal_distribution(-d2))
+
+        return self.get_intermediate("cumulative_probabilities", calculate)
+
+
+    def calculate_call_option_price(self) -> np.ndarray:
+        """
+        Calculates the call option prices for the book.
+        """
+        instrumentation.count("options_priced", self.v_volatility.size)
+        norm_d1, norm_d2, _, _ = self.calculate_cumulative_probabilities()
+
+        return norm_d1 * self.S_current_price - norm_d2 * self.K_strike_price * self.calculate_discount_factor()
+
+
+    def calculate_put_option_price(self) -> np.ndarray:
+        """
+        Calculates the put option prices for the book.
+        """
+        instrumentation.count("options_priced", self.v_volatility.size)
+        _, _, norm_minus_d1, norm_minus_d2 = self.calculate_cumulative_probabilities()
+
+        return self.K_strike_price * self.calculate_discount_factor() * norm_minus_d2 - self.S_current_price * norm_minus_d1
+
+
+    def calculate_option_prices(self) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculates both call and put prices, sharing d1, d2 and the normal distribution values between the legs.
+
+        Returns:
+            A tuple of call and put price arrays
+        """
+        return self.calculate_call_option_price(), self.calculate_put_option_price()
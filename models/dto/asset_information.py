@@ -1,7 +1,10 @@
 class AssetInformation:
     """
-    DTO to store asset information
+    DTO to store asset information.
+    Slots avoid a per-instance dict, which is most of the memory of a small object. Use AssetPanel for many assets.
     """
+    __slots__ = ("asset_name", "spot_value", "historical_data")
+
     def __init__(self, asset_name, spot_value, historical_data):
         self.asset_name = asset_name
         self.spot_value = spot_value
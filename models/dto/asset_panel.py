@@ -0,0 +1,84 @@
+import typing
+
+import numpy as np
+
+from models.dto.asset_information import AssetInformation
+
+
+class AssetView:
+    """
+    A single asset of an AssetPanel with the same attributes as AssetInformation.
+    historical_data is a row view of the panel's matrix, so no value is copied.
+    """
+    __slots__ = ("panel", "index")
+
+    def __init__(self, panel: "AssetPanel", index: int):
+        self.panel = panel
+        self.index = index
+
+
+    @property
+    def asset_name(self):
+        return self.panel.asset_names[self.index]
+
+
+    @property
+    def spot_value(self) -> float:
+        return float(self.panel.spot_values[self.index])
+
+
+    @spot_value.setter
+    def spot_value(self, value):
+        self.panel.spot_values[self.index] = value
+
+
+    @property
+    def historical_data(self) -> np.ndarray:
+        return self.panel.historical_rates[self.index]
+
+
+class AssetPanel:
+    """
+    Columnar container of many assets sharing the same historical dates.
+    Spot values are a float64 array and the historical data is a single float64 matrix (assets x days, sorted from
+    recent to old), which can be used directly in HistoricalScenarioMatrix.from_market_rates.
+    Indexing returns an AssetView of a single asset, and iterating it can be used wherever AssetInformation objects are.
+    """
+
+    def __init__(self, asset_names: typing.Sequence[str], spot_values, historical_rates):
+        """
+        Parameters:
+            asset_names: name of each asset
+            spot_values: spot value of each asset
+            historical_rates: matrix of assets x days
+        """
+        self.asset_names = list(asset_names)
+        self.spot_values = np.array(spot_values, dtype=np.float64)
+        self.historical_rates = np.asarray(historical_rates, dtype=np.float64)
+
+        assert self.spot_values.shape == (len(self.asset_names),), "A spot value must be provided for each asset"
+        assert self.historical_rates.ndim == 2 and len(self.historical_rates) == len(self.asset_names), "Historical rates must be provided for each asset"
+
+
+    @classmethod
+    def from_asset_informations(cls, assets: typing.Iterable[AssetInformation]) -> "AssetPanel":
+        """
+        Creates the panel from AssetInformation objects, which must have the same number of historical rates.
+        """
+        assets = list(assets)
+        return cls([asset.asset_name for asset in assets],
+                   [asset.spot_value for asset in assets],
+                   np.array([asset.historical_data for asset in assets], dtype=np.float64).reshape(len(assets), -1))
+
+
+    def __len__(self):
+        return len(self.asset_names)
+
+
+    def __getitem__(self, index) -> AssetView:
+        assert -len(self) <= index < len(self), f"Asset index out of range: {index}"
+        return AssetView(self, index % len(self))
+
+
+    def __iter__(self) -> typing.Iterator[AssetView]:
+        return (AssetView(self, index) for index in range(len(self)))
@@ -29,6 +29,16 @@ class BaseDataProvider(ABC):
             a list of AssetInformation
         """
 
+    def iter_assets(self) -> typing.Iterator[AssetInformation]:
+        """
+        Yield the assets one by one. Providers that can read the assets lazily should override it,
+        so that the assets can be processed without keeping all of them in memory (e.g. a streaming PortfolioVarModel).
+
+        Returns:
+            an iterator of AssetInformation
+        """
+        yield from self.get_assets()
+
     @abstractmethod
     def get_option_information(self) -> OptionInformation:
         """
@@ -0,0 +1,15 @@
+class ImpliedVolatilityResult:
+    """
+    DTO to store the implied volatilities solved for a set of options, with per-option convergence information.
+    """
+    def __init__(self, volatility, status, iterations):
+        """
+        Parameters:
+            volatility: implied volatility for each option, NaN where the price or the volatility is out of bounds.
+                        Options which didn't converge keep the last estimate, so the status must be checked
+            status: solver status for each option, see ImpliedVolatilitySolver status constants
+            iterations: number of iterations used for each option
+        """
+        self.volatility = volatility
+        self.status = status
+        self.iterations = iterations
@@ -0,0 +1,87 @@
+import typing
+
+import numpy as np
+
+from models.dto.option_information import OptionInformation
+
+
+def _column_property(name, optional=False):
+    """
+    Creates a property reading and writing the value of the view's option in a column of the book.
+    Missing optional values are stored as NaN and returned as None, like in OptionInformation.
+    """
+    def get_value(self):
+        value = float(self.book.columns[name][self.index])
+        return None if optional and np.isnan(value) else value
+
+    def set_value(self, value):
+        self.book.columns[name][self.index] = np.nan if value is None else value
+
+    return property(get_value, set_value)
+
+
+class OptionView:
+    """
+    A single option of an OptionBook with the same attributes as OptionInformation.
+    It doesn't copy any value: reading an attribute reads the book, and assigning it updates the book.
+    """
+    __slots__ = ("book", "index")
+
+    def __init__(self, book: "OptionBook", index: int):
+        self.book = book
+        self.index = index
+
+    S_current_price = _column_property("S_current_price")
+    K_strike_price = _column_property("K_strike_price")
+    T_time_to_maturity = _column_property("T_time_to_maturity")
+    r_risk_free_interest_rate = _column_property("r_risk_free_interest_rate")
+    v_volatility = _column_property("v_volatility")
+    expected_call_price = _column_property("expected_call_price", optional=True)
+    expected_put_price = _column_property("expected_put_price", optional=True)
+
+
+class OptionBook:
+    """
+    Columnar container of many options, where each OptionInformation field is a float64 array.
+    No Python object is created per option, and the columns can be used directly in
+    VectorizedBlackScholesModel.from_table(book.columns). Indexing returns an OptionView of a single option.
+    """
+    FIELDS = OptionInformation.__slots__
+
+    def __init__(self, S_current_price,
+                       K_strike_price,
+                       T_time_to_maturity,
+                       r_risk_free_interest_rate,
+                       v_volatility,
+                       expected_call_price = None,
+                       expected_put_price = None):
+        """
+        Parameters are arrays (or scalars broadcast to the other arrays) of the OptionInformation fields.
+        Missing expected prices are stored as NaN.
+        """
+        values = np.broadcast_arrays(*[np.asarray(np.nan if value is None else value, dtype=np.float64)
+                                       for value in (S_current_price, K_strike_price, T_time_to_maturity, r_risk_free_interest_rate,
+                                                     v_volatility, expected_call_price, expected_put_price)])
+        assert values[0].ndim == 1, "Option book must be one dimensional"
+
+        # Broadcast arrays are views that may share memory between elements, so the book keeps its own copies
+        self.columns = {name: value.copy() for name, value in zip(self.FIELDS, values)}
+
+
+    @classmethod
+    def from_option_informations(cls, options: typing.Iterable[OptionInformation]) -> "OptionBook":
+        options = list(options)
+        return cls(*[[np.nan if getattr(option, name) is None else getattr(option, name) for option in options] for name in cls.FIELDS])
+
+
+    def __len__(self):
+        return len(self.columns["S_current_price"])
+
+
+    def __getitem__(self, index) -> OptionView:
+        assert -len(self) <= index < len(self), f"Option index out of range: {index}"
+        return OptionView(self, index % len(self))
+
+
+    def __iter__(self) -> typing.Iterator[OptionView]:
+        return (OptionView(self, index) for index in range(len(self)))
@@ -0,0 +1,22 @@
+class OptionGreeks:
+    """
+    DTO to store the sensitivities of call and put options.
+    Values are floats for a single option, or arrays for a book of options.
+    Vega and rho are per 1.0 change in volatility/rate, theta is per year.
+    """
+    def __init__(self, call_delta,
+                       put_delta,
+                       gamma,
+                       vega,
+                       call_theta,
+                       put_theta,
+                       call_rho,
+                       put_rho):
+        self.call_delta = call_delta
+        self.put_delta = put_delta
+        self.gamma = gamma
+        self.vega = vega
+        self.call_theta = call_theta
+        self.put_theta = put_theta
+        self.call_rho = call_rho
+        self.put_rho = put_rho
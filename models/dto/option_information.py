@@ -1,7 +1,11 @@
 class OptionInformation:
     """
-    DTO to store option related information
+    DTO to store option related information.
+    Slots avoid a per-instance dict, which is most of the memory of a small object. Use OptionBook for many options.
     """
+    __slots__ = ("S_current_price", "K_strike_price", "T_time_to_maturity", "r_risk_free_interest_rate", "v_volatility",
+                 "expected_call_price", "expected_put_price")
+
     def __init__(self, S_current_price,
                         K_strike_price,
                         T_time_to_maturity,
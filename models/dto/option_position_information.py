@@ -0,0 +1,24 @@
+class OptionPositionInformation:
+    """
+    DTO to store an option position on an asset, to be added to a PortfolioVarModel.
+    The option is repriced with the underlying's historical shifts applied to its spot price (S_current_price).
+    """
+    __slots__ = ("asset_name", "historical_data", "option_info", "quantity", "is_call", "volatility_history")
+
+    def __init__(self, asset_name, historical_data, option_info, quantity, is_call=True, volatility_history=None):
+        """
+        Parameters:
+            asset_name: name of the underlying asset, its shifts are taken from the scenario matrix if it is in it
+            historical_data: market rates of the underlying, sorted from recent to old
+            option_info: OptionInformation of the option
+            quantity: number of options, negative for short positions
+            is_call: whether the option is a call or a put
+            volatility_history: optional implied volatilities sorted from recent to old, whose changes over the
+                                horizon of the scenarios are applied to the volatility of the option in the same scenarios
+        """
+        self.asset_name = asset_name
+        self.historical_data = historical_data
+        self.option_info = option_info
+        self.quantity = quantity
+        self.is_call = is_call
+        self.volatility_history = volatility_history
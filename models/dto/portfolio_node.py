@@ -0,0 +1,18 @@
+class PortfolioNode:
+    """
+    DTO to store a node of a portfolio hierarchy (e.g. desk, book, sub-book).
+    A node can hold positions directly, have child nodes, or both. The PnL of a node includes all the nodes below it.
+    """
+    def __init__(self, name, asset_names=None, spot_values=None, children=None):
+        """
+        Parameters:
+            name: unique name of the node in the hierarchy
+            asset_names: asset of each position directly held by the node
+            spot_values: spot value of each position directly held by the node
+            children: child nodes
+        """
+        self.name = name
+        # Arrays have no truth value, so None is checked explicitly
+        self.asset_names = [] if asset_names is None else list(asset_names)
+        self.spot_values = [] if spot_values is None else list(spot_values)
+        self.children = [] if children is None else list(children)
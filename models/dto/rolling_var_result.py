@@ -0,0 +1,36 @@
+class RollingVarResult:
+    """
+    DTO to store a VaR and expected shortfall time series and its backtest against the realized PnL.
+    Rows are the dates, sorted from recent to old like the historical data, and columns are the confidence levels.
+    Values are in PnL terms, i.e. losses are negative.
+    """
+    def __init__(self, confidence_levels, var, expected_shortfall, realized_pnl, exceptions):
+        """
+        Parameters:
+            confidence_levels: confidence level of each column
+            var: VaR of each date, calculated from the window of scenarios before the date
+            expected_shortfall: expected shortfall of each date, from the same window
+            realized_pnl: PnL of each date
+            exceptions: whether the realized PnL of the date is a larger loss than its VaR
+        """
+        self.confidence_levels = confidence_levels
+        self.var = var
+        self.expected_shortfall = expected_shortfall
+        self.realized_pnl = realized_pnl
+        self.exceptions = exceptions
+
+
+    @property
+    def exception_counts(self):
+        """
+        Number of backtest exceptions for each confidence level.
+        """
+        return self.exceptions.sum(axis=0)
+
+
+    @property
+    def expected_exception_counts(self):
+        """
+        Number of exceptions expected for each confidence level if the VaR is accurate.
+        """
+        return len(self.exceptions) * (1 - self.confidence_levels)
@@ -0,0 +1,9 @@
+class VarResult:
+    """
+    DTO to store the VaR and expected shortfall for a confidence level.
+    Both values are in PnL terms, i.e. losses are negative.
+    """
+    def __init__(self, confidence_level, var, expected_shortfall):
+        self.confidence_level = confidence_level
+        self.var = var
+        self.expected_shortfall = expected_shortfall
@@ -0,0 +1,95 @@
+import math
+import typing
+
+import numpy as np
+
+from models.dto.var_result import VarResult
+from models.var_calculation import HistoricalScenarioMatrix, HistoricalVarCalculationModel
+
+
+class HorizonScenarioGenerator:
+    """
+    Creates the historical scenarios of several VaR horizons (e.g. 1 and 10 days) from the same market rates.
+
+    Two methods are supported:
+        overlapping: the scenarios of an h-day horizon are the overlapping h-day shifts rate[d] / rate[d + h] - 1,
+                     one for each day that has h days of history after it. This is the difference of the cumulative
+                     log returns ln(rate[d]) - ln(rate[d + h]) without the rounding of exp and log.
+        sqrt_time: the 1 day shifts are scaled by sqrt(h). It is cheaper, as only the 1 day PnL is aggregated,
+                   but it assumes that the daily returns are independent and identically distributed.
+    """
+
+    OVERLAPPING = "overlapping"
+    SQRT_TIME = "sqrt_time"
+    METHODS = (OVERLAPPING, SQRT_TIME)
+
+    def __init__(self, horizons: typing.Sequence[int] = (1, 10), method=OVERLAPPING):
+        """
+        Parameters:
+            horizons: number of days of each horizon
+            method: one of METHODS
+        """
+        assert method in self.METHODS, f"Unknown scenario method: {method}"
+        assert all(horizon >= 1 for horizon in horizons), "Horizons must be at least 1 day"
+
+        self.horizons = list(horizons)
+        self.method = method
+
+
+    def calculate_shift_matrices(self, market_rates) -> typing.Dict[int, np.ndarray]:
+        """
+        Parameters:
+            market_rates: market rates sorted from recent to old, a single series or a matrix of assets x days
+        Returns:
+            shift matrix of each horizon, with the same layout as the market rates
+        """
+        if self.method == self.OVERLAPPING:
+            market_rates = np.asarray(market_rates, dtype=np.float64)
+            return {horizon: HistoricalVarCalculationModel.calculate_shift_matrix(market_rates, horizon) for horizon in self.horizons}
+
+        one_day_shifts = HistoricalVarCalculationModel.calculate_shift_matrix(market_rates)
+        return {horizon: one_day_shifts * math.sqrt(horizon) if horizon > 1 else one_day_shifts for horizon in self.horizons}
+
+
+    def create_scenario_matrices(self, asset_names: typing.Sequence[str], market_rates) -> typing.Dict[int, HistoricalScenarioMatrix]:
+        """
+        Creates a scenario matrix for each horizon, e.g. to be used in PortfolioVarModel.
+
+        Parameters:
+            asset_names: name of each asset
+            market_rates: matrix of assets x days, sorted from recent to old
+        Returns:
+            scenario matrix of each horizon
+        """
+        # sqrt_time scenarios are scaled 1 day shifts, see PortfolioVarModel for the volatility changes of option positions
+        return {horizon: HistoricalScenarioMatrix(asset_names, shift_matrix, horizon if self.method == self.OVERLAPPING else 1)
+                for horizon, shift_matrix in self.calculate_shift_matrices(market_rates).items()}
+
+
+    def calculate_var_results(self, asset_names: typing.Sequence[str],
+                                    spot_values,
+                                    market_rates,
+                                    confidence_levels: typing.Sequence[float] = (0.99,),
+                                    interpolation="exclusive") -> typing.Dict[int, typing.List[VarResult]]:
+        """
+        Calculates the VaR and expected shortfall of a portfolio for every horizon.
+
+        Parameters:
+            asset_names: name of each asset, i.e. each row of the market rates
+            spot_values: spot value of each asset
+            market_rates: matrix of assets x days, sorted from recent to old
+            confidence_levels: confidence levels of the VaR
+            interpolation: quantile interpolation, see models.quantile.INTERPOLATIONS
+        Returns:
+            VarResult for each confidence level, for each horizon
+        """
+        if self.method == self.SQRT_TIME:
+            # Scaling the shifts scales the aggregated PnL, so the 1 day PnL is aggregated only once
+            one_day_pnl = HistoricalScenarioMatrix.from_market_rates(asset_names, market_rates).aggregate_pnl(asset_names, spot_values)
+            horizon_pnls = {horizon: one_day_pnl * math.sqrt(horizon) for horizon in self.horizons}
+        else:
+            horizon_pnls = {horizon: scenario_matrix.aggregate_pnl(asset_names, spot_values)
+                            for horizon, scenario_matrix in self.create_scenario_matrices(asset_names, market_rates).items()}
+
+        return {horizon: HistoricalVarCalculationModel.calculate_external_var_results(pnl, confidence_levels, interpolation)
+                for horizon, pnl in horizon_pnls.items()}
@@ -0,0 +1,140 @@
+import math
+import typing
+
+import numpy as np
+
+from models.black_and_scholes_model import VectorizedBlackScholesModel
+from models.dto.implied_volatility_result import ImpliedVolatilityResult
+
+
+class ImpliedVolatilitySolver:
+    """
+    Backs out Black&Scholes volatilities from market prices for many options at once.
+
+    Every iteration reprices all the unconverged options in a single vectorized call and takes a Newton step
+    using the analytic vega. Each option also keeps a volatility bracket, updated from the sign of the pricing
+    error (option prices are monotonic in volatility). Whenever the vega is too small or the Newton step leaves
+    the bracket, a bisection step is taken instead, so the solver can't diverge on deep in/out-of-the-money options.
+    """
+
+    CONVERGED = 0
+    NOT_CONVERGED = 1        # maximum number of iterations is reached
+    PRICE_OUT_OF_BOUNDS = 2  # market price is outside of the no-arbitrage bounds, no volatility can match it
+    VOLATILITY_OUT_OF_BOUNDS = 3  # implied volatility is outside of [min_volatility, max_volatility]
+
+    def __init__(self, price_tolerance=1e-10, volatility_tolerance=1e-12, max_iterations=100,
+                 min_vega=1e-8, min_volatility=1e-6, max_volatility=10.0):
+        """
+        Parameters:
+            price_tolerance: absolute difference between model and market price to accept the solution
+            volatility_tolerance: the solution is also accepted once the bracket is narrower than this,
+                                  unless the bracket collapsed onto min_volatility or max_volatility
+            max_iterations: maximum number of Newton/bisection iterations
+            min_vega: Newton steps are not taken below this vega, bisection is used instead
+            min_volatility: lower end of the initial volatility bracket
+            max_volatility: upper end of the initial volatility bracket
+        """
+        self.price_tolerance = price_tolerance
+        self.volatility_tolerance = volatility_tolerance
+        self.max_iterations = max_iterations
+        self.min_vega = min_vega
+        self.min_volatility = min_volatility
+        self.max_volatility = max_volatility
+
+
+    @staticmethod
+    def calculate_initial_guess(call_prices, S, K, T, r) -> np.ndarray:
+        """
+        Calculates the initial volatility guess using the Corrado-Miller rational approximation.
+        Falls back to the Brenner-Subrahmanyam at-the-money approximation where Corrado-Miller is not defined.
+
+        Parameters:
+            call_prices: market prices of the calls (puts need to be converted with the put-call parity beforehand)
+            S, K, T, r: option parameters, in the same convention as VectorizedBlackScholesModel
+        Returns:
+            Initial volatility guesses
+        """
+        discounted_strike = K * np.exp(-r * T)
+        moneyness = (S - discounted_strike) / 2.0
+        half_distance = call_prices - moneyness
+
+        discriminant = np.maximum(half_distance * half_distance - (S - discounted_strike) ** 2 / math.pi, 0.0)
+        corrado_miller = math.sqrt(2.0 * math.pi) / (S + discounted_strike) * (half_distance + np.sqrt(discriminant)) / np.sqrt(T)
+        brenner_subrahmanyam = math.sqrt(2.0 * math.pi) * call_prices / (S * np.sqrt(T))
+
+        return np.where(np.isfinite(corrado_miller) & (corrado_miller > 0), corrado_miller, brenner_subrahmanyam)
+
+
+    def solve(self, market_prices, S_current_price, K_strike_price, T_time_to_maturity, r_risk_free_interest_rate,
+              is_call: typing.Union[bool, np.ndarray] = True) -> ImpliedVolatilityResult:
+        """
+        Solves the implied volatilities for the provided options. Parameters are broadcast against each other.
+
+        Parameters:
+            market_prices: observed option prices
+            S_current_price, K_strike_price, T_time_to_maturity, r_risk_free_interest_rate: option parameters
+            is_call: True for calls, False for puts. Can be an array for a book with both
+        Returns:
+            ImpliedVolatilityResult with the volatilities, status and iteration counts for each option
+        """
+        (market_prices, S, K, T, r, is_call) = np.broadcast_arrays(*[np.asarray(value, dtype=np.float64) for value in (market_prices,
+                                                                                                                     S_current_price,
+                                                                                                                     K_strike_price,
+                                                                                                                     T_time_to_maturity,
+                                                                                                                     r_risk_free_interest_rate)],
+                                                                   np.asarray(is_call, dtype=bool))
+        assert np.all(T), "Time to maturity is not provided or zero"
+
+        shape = market_prices.shape
+        market_prices, S, K, T, r, is_call = [value.ravel() for value in (market_prices, S, K, T, r, is_call)]
+
+        volatility = np.full(market_prices.shape, np.nan)
+        status = np.full(market_prices.shape, ImpliedVolatilitySolver.NOT_CONVERGED, dtype=np.int8)
+        iterations = np.zeros(market_prices.shape, dtype=np.int32)
+
+        # Prices outside of the no-arbitrage bounds can't be matched by any volatility
+        discounted_strike = K * np.exp(-r * T)
+        call_prices = np.where(is_call, market_prices, market_prices + S - discounted_strike)
+        out_of_bounds = (call_prices <= np.maximum(S - discounted_strike, 0.0)) | (call_prices >= S)
+        status[out_of_bounds] = ImpliedVolatilitySolver.PRICE_OUT_OF_BOUNDS
+
+        active = np.flatnonzero(~out_of_bounds)
+        sigma = np.clip(self.calculate_initial_guess(call_prices[active], S[active], K[active], T[active], r[active]),
+                        self.min_volatility, self.max_volatility)
+        lower = np.full(active.shape, self.min_volatility)
+        upper = np.full(active.shape, self.max_volatility)
+
+        for iteration in range(1, self.max_iterations + 1):
+            if not active.size:
+                break
+
+            model = VectorizedBlackScholesModel(S[active], K[active], T[active], r[active], sigma)
+            model_prices = np.where(is_call[active], model.calculate_call_option_price(), model.calculate_put_option_price())
+            difference = model_prices - market_prices[active]
+            iterations[active] = iteration
+
+            # A bracket collapsing onto min_volatility or max_volatility means the solution is outside of the bracket
+            collapsed = upper - lower <= self.volatility_tolerance
+            at_bounds = collapsed & ((lower <= self.min_volatility) | (upper >= self.max_volatility))
+            converged = (np.abs(difference) <= self.price_tolerance) | (collapsed & ~at_bounds)
+            volatility[active[converged]] = sigma[converged]
+            status[active[converged]] = ImpliedVolatilitySolver.CONVERGED
+            status[active[at_bounds & ~converged]] = ImpliedVolatilitySolver.VOLATILITY_OUT_OF_BOUNDS
+
+            # Price is increasing with volatility, so the sign of the difference tells which side the solution is
+            upper = np.where(difference > 0, sigma, upper)
+            lower = np.where(difference > 0, lower, sigma)
+
+            vega = model.calculate_vega()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                newton_sigma = sigma - difference / vega
+            use_bisection = (vega < self.min_vega) | ~(newton_sigma > lower) | ~(newton_sigma < upper)
+            sigma = np.where(use_bisection, (lower + upper) / 2.0, newton_sigma)
+
+            remaining = ~(converged | at_bounds)
+            active, sigma, lower, upper = active[remaining], sigma[remaining], lower[remaining], upper[remaining]
+
+        # Keep the last estimate for the options that didn't converge, status tells that it is not reliable
+        volatility[active] = sigma
+
+        return ImpliedVolatilityResult(volatility.reshape(shape), status.reshape(shape), iterations.reshape(shape))
@@ -0,0 +1,190 @@
+import collections
+import json
+import time
+import tracemalloc
+import typing
+
+
+class Profiler:
+    """
+    Collects the duration and the peak memory of the stages, and the counters reported by the instrumented code.
+
+    Stages can be nested, and they are reported with their path, e.g. "var/aggregation". Peak memory is measured
+    with tracemalloc only when track_memory is set, as tracing the allocations slows down the code.
+    """
+
+    def __init__(self, track_memory=False):
+        self.track_memory = track_memory
+        self.stages: typing.Dict[str, typing.Dict[str, float]] = {}
+        self.counters = collections.Counter()
+        self.peak_memory = 0
+        self.__start_time = None
+        self.__duration = None
+        # Stack of [stage path, start time, peak memory of the stage so far]
+        self.__frames = []
+
+
+    def start(self):
+        self.__start_time = time.perf_counter()
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+
+    def stop(self):
+        self.__duration = time.perf_counter() - self.__start_time
+        if self.track_memory and tracemalloc.is_tracing():
+            self.peak_memory = max(self.peak_memory, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+
+    def enter_stage(self, name):
+        path = f"{self.__frames[-1][0]}/{name}" if self.__frames else name
+        # Stages are reported in the order they are entered, so an enclosing stage is before its nested stages
+        self.stages.setdefault(path, {"count": 0, "total_seconds": 0.0, "peak_memory_bytes": 0})
+        if self.track_memory:
+            # The peak is reset for the new stage, the peak so far is kept by the enclosing stage
+            peak = tracemalloc.get_traced_memory()[1]
+            self.peak_memory = max(self.peak_memory, peak)
+            if self.__frames:
+                self.__frames[-1][2] = max(self.__frames[-1][2], peak)
+            tracemalloc.reset_peak()
+
+        self.__frames.append([path, time.perf_counter(), 0])
+
+
+    def exit_stage(self):
+        path, start_time, peak = self.__frames.pop()
+        duration = time.perf_counter() - start_time
+
+        stage = self.stages[path]
+        stage["count"] += 1
+        stage["total_seconds"] += duration
+
+        if self.track_memory:
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            stage["peak_memory_bytes"] = max(stage["peak_memory_bytes"], peak)
+            self.peak_memory = max(self.peak_memory, peak)
+            if self.__frames:
+                self.__frames[-1][2] = max(self.__frames[-1][2], peak)
+
+
+    def get_report(self) -> dict:
+        """
+        Returns:
+            total duration, peak memory, the stages and the counters, in a JSON serializable dictionary
+        """
+        duration = self.__duration if self.__duration is not None else time.perf_counter() - self.__start_time
+        return {"total_seconds": duration,
+                "peak_memory_bytes": self.peak_memory if self.track_memory else None,
+                "stages": {path: dict(stage) for path, stage in self.stages.items()},
+                "counters": dict(self.counters)}
+
+
+    def export(self, path):
+        """
+        Writes the report to a JSON file.
+        """
+        with open(path, "w") as report_file:
+            json.dump(self.get_report(), report_file, indent=2)
+
+
+    def format_report(self) -> str:
+        """
+        Returns:
+            a human readable breakdown of the stages and the counters
+        """
+        report = self.get_report()
+        lines = [f"{'Stage':<40} {'Calls':>8} {'Total ms':>12} {'% of run':>9} {'Peak MB':>9}"]
+        for path, stage in report["stages"].items():
+            peak = f"{stage['peak_memory_bytes'] / 2 ** 20:9.2f}" if self.track_memory else f"{'-':>9}"
+            lines.append(f"{path:<40} {stage['count']:>8} {stage['total_seconds'] * 1000:>12.3f} "
+                         f"{stage['total_seconds'] / report['total_seconds']:>9.1%} {peak}")
+
+        lines.append(f"Total: {report['total_seconds'] * 1000:.3f}ms" +
+                     (f", peak memory: {report['peak_memory_bytes'] / 2 ** 20:.2f}MB" if self.track_memory else ""))
+        lines.extend(f"{name}: {value}" for name, value in sorted(report["counters"].items()))
+        return "\n".join(lines)
+
+
+class _Stage:
+    """
+    Context manager of a stage of the active profiler.
+    """
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler: Profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.enter_stage(self.name)
+
+    def __exit__(self, *exception_info):
+        self.profiler.exit_stage()
+
+
+class _NullStage:
+    """
+    Context manager doing nothing, used when profiling is disabled.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exception_info):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+# Instrumentation is disabled unless a profiler is enabled. The instrumented code only checks this global,
+# so the cost of a disabled hook is a function call and a comparison.
+_active_profiler: typing.Optional[Profiler] = None
+
+
+def enable(track_memory=False) -> Profiler:
+    """
+    Starts collecting the stages and the counters of the instrumented code in a new profiler.
+    """
+    global _active_profiler
+    _active_profiler = Profiler(track_memory)
+    _active_profiler.start()
+    return _active_profiler
+
+
+def disable() -> typing.Optional[Profiler]:
+    """
+    Stops the active profiler.
+
+    Returns:
+        the stopped profiler with its results, None if profiling was not enabled
+    """
+    global _active_profiler
+    profiler, _active_profiler = _active_profiler, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def get_profiler() -> typing.Optional[Profiler]:
+    return _active_profiler
+
+
+def stage(name):
+    """
+    Measures the code in a with block as a stage of the active profiler:
+        with instrumentation.stage("aggregation"):
+            ...
+    """
+    if _active_profiler is None:
+        return _NULL_STAGE
+    return _Stage(_active_profiler, name)
+
+
+def count(name, value=1):
+    """
+    Increments a counter of the active profiler, e.g. the number of priced options.
+    """
+    if _active_profiler is not None:
+        _active_profiler.counters[name] += value
@@ -0,0 +1,160 @@
+import typing
+
+import numpy as np
+
+from models.dto.asset_information import AssetInformation
+from models.dto.var_result import VarResult
+from models.quantile import get_quantile_position, get_tail_count
+
+
+class MonteCarloVarModel:
+    """
+    Calculates the VaR and expected shortfall of a linear portfolio with correlated Monte Carlo simulation.
+
+    The covariance of the daily log returns is estimated from the same historical rates as the historical VaR.
+    Normal shocks are generated in blocks of paths, correlated with the Cholesky factor of the covariance,
+    and only the aggregated PnL of each path is calculated. The paths are not kept: after every block, only the
+    smallest PnL values that the quantiles and the expected shortfall need are kept, so the memory usage doesn't
+    depend on the number of paths and the results are the same as sorting all the paths.
+    """
+
+    DEFAULT_PATH_COUNT = 100000
+
+    # Maximum number of shocks (paths x assets) generated at once, about 32MB of float64
+    DEFAULT_BLOCK_ELEMENTS = 2 ** 22
+
+    def __init__(self, path_count: typing.Optional[int] = None,
+                       seed: typing.Optional[int] = None,
+                       horizon=1,
+                       block_size: typing.Optional[int] = None):
+        """
+        Parameters:
+            path_count: number of simulated paths, defaults to DEFAULT_PATH_COUNT
+            seed: seed of the random number generator. The results are reproducible with the same seed,
+                  whatever the block size is
+            horizon: number of days of the simulated returns, the daily covariance is scaled by it
+            block_size: number of paths generated at once, defaults to DEFAULT_BLOCK_ELEMENTS / number of assets
+        """
+        self.path_count = path_count or self.DEFAULT_PATH_COUNT
+        self.seed = seed
+        self.horizon = horizon
+        self.block_size = block_size
+
+
+    @staticmethod
+    def calculate_covariance(market_rates) -> np.ndarray:
+        """
+        Estimates the covariance matrix of the daily log returns.
+
+        Parameters:
+            market_rates: matrix of assets x days, sorted from recent to old
+        Returns:
+            covariance matrix of assets x assets
+        """
+        market_rates = np.asarray(market_rates, dtype=np.float64)
+        assert market_rates.ndim == 2 and market_rates.shape[1] > 2, "At least three market rates are required for each asset"
+
+        log_returns = np.log(market_rates[:, :-1] / market_rates[:, 1:])
+        return np.atleast_2d(np.cov(log_returns))
+
+
+    @staticmethod
+    def calculate_cholesky_factor(covariance) -> np.ndarray:
+        """
+        Calculates a lower triangular L where L . L^T is the covariance.
+        With more assets than historical days, the estimated covariance is singular and Cholesky decomposition fails.
+        In that case, a factor is calculated from the eigen decomposition instead, ignoring the negative eigenvalues
+        of the rounding errors. It is not triangular, but it correlates the shocks the same way.
+        """
+        try:
+            return np.linalg.cholesky(covariance)
+        except np.linalg.LinAlgError:
+            eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+            return eigenvectors * np.sqrt(np.maximum(eigenvalues, 0.0))
+
+
+    def __get_block_size(self, asset_count: int) -> int:
+        return self.block_size or max(1, self.DEFAULT_BLOCK_ELEMENTS // asset_count)
+
+
+    def simulate_pnl_tail(self, spot_values, factor, tail_size: int) -> np.ndarray:
+        """
+        Simulates the paths block by block and keeps the lowest PnL values.
+
+        Parameters:
+            spot_values: spot value of each asset
+            factor: assets x assets factor of the covariance, see calculate_cholesky_factor
+            tail_size: number of lowest PnL values to keep
+        Returns:
+            the lowest tail_size PnL values, sorted
+        """
+        spot_values = np.asarray(spot_values, dtype=np.float64)
+        factor_transposed = np.ascontiguousarray(factor.T) * np.sqrt(self.horizon)
+        rng = np.random.default_rng(self.seed)
+        block_size = self.__get_block_size(len(spot_values))
+
+        tail = np.empty(0)
+        for start in range(0, self.path_count, block_size):
+            path_count = min(block_size, self.path_count - start)
+
+            # Paths x assets log returns, converted to relative shifts in place
+            shifts = rng.standard_normal((path_count, len(spot_values))) @ factor_transposed
+            np.expm1(shifts, out=shifts)
+            candidates = np.concatenate([tail, shifts @ spot_values])
+
+            if len(candidates) > tail_size:
+                candidates = np.partition(candidates, tail_size - 1)[:tail_size]
+            tail = candidates
+
+        return np.sort(tail)
+
+
+    def calculate_var_results(self, spot_values, market_rates,
+                                    confidence_levels: typing.Sequence[float] = (0.99,),
+                                    interpolation="exclusive") -> typing.List[VarResult]:
+        """
+        Calculates the VaR and the expected shortfall of the portfolio for several confidence levels.
+
+        Parameters:
+            spot_values: spot value of each asset
+            market_rates: matrix of assets x days, sorted from recent to old
+            confidence_levels: confidence levels of the VaR
+            interpolation: quantile interpolation over the simulated paths, see models.quantile.INTERPOLATIONS
+        Returns:
+            VarResult for each confidence level, in the same order
+        """
+        spot_values = np.asarray(spot_values, dtype=np.float64)
+        assert len(spot_values) == len(market_rates), "A spot value must be provided for each asset"
+
+        probabilities = [1 - confidence_level for confidence_level in confidence_levels]
+        positions = [get_quantile_position(self.path_count, probability, interpolation) for probability in probabilities]
+        tail_counts = [get_tail_count(self.path_count, probability) for probability in probabilities]
+
+        # The quantiles and the expected shortfall only use the lowest values of all the paths
+        tail_size = max([upper_index + 1 for _, upper_index, _ in positions] + tail_counts)
+        tail = self.simulate_pnl_tail(spot_values, self.calculate_cholesky_factor(self.calculate_covariance(market_rates)), tail_size)
+
+        return [VarResult(confidence_level,
+                          float((1 - weight) * tail[lower_index] + weight * tail[upper_index]),
+                          float(tail[:tail_count].mean()))
+                for confidence_level, (lower_index, upper_index, weight), tail_count in zip(confidence_levels, positions, tail_counts)]
+
+
+    def calculate_portfolio_var_results(self, assets: typing.Iterable[AssetInformation],
+                                              confidence_levels: typing.Sequence[float] = (0.99,),
+                                              interpolation="exclusive") -> typing.List[VarResult]:
+        """
+        Calculates the VaR of the assets of a portfolio, e.g. PortfolioVarModel.assets.
+        Positions of the same asset are netted, and the historical data of its first position is used.
+        """
+        spot_values = {}
+        historical_data = {}
+        for asset in assets:
+            spot_values[asset.asset_name] = spot_values.get(asset.asset_name, 0.0) + asset.spot_value
+            historical_data.setdefault(asset.asset_name, asset.historical_data)
+
+        assert historical_data, "Portfolio doesn't have any assets"
+        assert len(set(len(rates) for rates in historical_data.values())) == 1, "All assets must have the same amount of historical data"
+
+        return self.calculate_var_results(list(spot_values.values()), np.array(list(historical_data.values()), dtype=np.float64),
+                                          confidence_levels, interpolation)
@@ -0,0 +1,127 @@
+import typing
+
+import numpy as np
+
+from models.black_and_scholes_model import VectorizedBlackScholesModel
+from models.dto.option_position_information import OptionPositionInformation
+
+
+class OptionRevaluationModel:
+    """
+    Calculates the scenario PnL of option positions from the shifts of their underlyings (and optionally their volatilities).
+
+    Two methods are supported:
+        full_revaluation: every option is repriced in every scenario in a single scenarios x options array evaluation
+                          of VectorizedBlackScholesModel, and the PnL is the difference to the current price.
+        delta_gamma: second order approximation delta * dS + gamma * dS^2 / 2 (+ vega * dv), calculated from the
+                     sensitivities of the current prices. It is faster, but inaccurate for large moves.
+    The options are repriced with the same time to maturity, i.e. the time decay over the horizon is not included.
+    """
+
+    FULL_REVALUATION = "full_revaluation"
+    DELTA_GAMMA = "delta_gamma"
+    METHODS = (FULL_REVALUATION, DELTA_GAMMA)
+
+    # Number of options repriced at once. It limits the memory usage to about a dozen arrays of DEFAULT_CHUNK_SIZE x scenarios
+    DEFAULT_CHUNK_SIZE = 1024
+
+    # Shocked volatilities are floored to keep the options priceable when a scenario would make them zero or negative
+    MINIMUM_VOLATILITY = 1e-6
+
+    def __init__(self, method=FULL_REVALUATION, chunk_size: typing.Optional[int] = None, normal_cdf_backend="ndtr"):
+        """
+        Parameters:
+            method: one of METHODS
+            chunk_size: number of options to reprice at once, defaults to DEFAULT_CHUNK_SIZE
+            normal_cdf_backend: normal distribution implementation to be used by VectorizedBlackScholesModel
+        """
+        assert method in self.METHODS, f"Unknown revaluation method: {method}"
+        self.method = method
+        self.chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        self.normal_cdf_backend = normal_cdf_backend
+
+
+    @staticmethod
+    def calculate_volatility_shifts(positions: typing.Sequence[OptionPositionInformation], scenario_count: int, horizon=1) -> typing.Optional[np.ndarray]:
+        """
+        Parameters:
+            positions: option positions
+            scenario_count: number of scenarios
+            horizon: number of days of each volatility change, the same as the spot shifts
+        Returns:
+            absolute volatility changes over the horizon, positions x scenarios. Positions without volatility history have zero changes.
+            None if none of the positions have volatility history
+        """
+        if all(position.volatility_history is None for position in positions):
+            return None
+
+        volatility_shifts = np.zeros((len(positions), scenario_count))
+        for row, position in enumerate(positions):
+            if position.volatility_history is not None:
+                volatilities = np.asarray(position.volatility_history, dtype=np.float64)
+                assert len(volatilities) == scenario_count + horizon, \
+                    f"Volatility history must have {scenario_count + horizon} values for {scenario_count} scenarios of {horizon} day(s): {len(volatilities)}"
+                volatility_shifts[row] = volatilities[:-horizon] - volatilities[horizon:]
+
+        return volatility_shifts
+
+
+    def calculate_pnl_matrix(self, positions: typing.Sequence[OptionPositionInformation], spot_shifts, volatility_shifts=None) -> np.ndarray:
+        """
+        Calculates the PnL of each position in each scenario.
+
+        Parameters:
+            positions: option positions
+            spot_shifts: relative shifts of the underlying of each position, positions x scenarios
+            volatility_shifts: optional absolute volatility changes, positions x scenarios
+        Returns:
+            PnL matrix of scenarios x positions
+        """
+        spot_shifts = np.asarray(spot_shifts, dtype=np.float64)
+        assert spot_shifts.ndim == 2 and len(spot_shifts) == len(positions), "Spot shifts must be provided for each position"
+
+        parameters = np.array([[getattr(position.option_info, column) for column in VectorizedBlackScholesModel.TABLE_COLUMNS]
+                               for position in positions], dtype=np.float64).reshape(len(positions), 5)
+        quantities = np.array([position.quantity for position in positions], dtype=np.float64)
+        is_call = np.array([position.is_call for position in positions], dtype=bool)
+
+        base_model = VectorizedBlackScholesModel(*parameters.T, normal_cdf_backend=self.normal_cdf_backend)
+        S, K, T, r, v = parameters.T
+        spot_changes = S * spot_shifts.T
+        volatility_changes = volatility_shifts.T if volatility_shifts is not None else None
+
+        if self.method == self.DELTA_GAMMA:
+            greeks = base_model.calculate_greeks()
+            delta = np.where(is_call, greeks.call_delta, greeks.put_delta)
+            pnl = delta * spot_changes + 0.5 * greeks.gamma * spot_changes * spot_changes
+            if volatility_changes is not None:
+                pnl += greeks.vega * volatility_changes
+            return quantities * pnl
+
+        base_call_prices, base_put_prices = base_model.calculate_option_prices()
+        base_prices = np.where(is_call, base_call_prices, base_put_prices)
+
+        # Scenarios x options: every option is repriced with its shocked spot (and volatility) in every scenario
+        shocked_volatilities = v if volatility_changes is None else np.maximum(v + volatility_changes, self.MINIMUM_VOLATILITY)
+        call_prices, put_prices = VectorizedBlackScholesModel(S + spot_changes, K, T, r, shocked_volatilities,
+                                                              normal_cdf_backend=self.normal_cdf_backend).calculate_option_prices()
+
+        return quantities * (np.where(is_call, call_prices, put_prices) - base_prices)
+
+
+    def calculate_aggregated_pnl(self, positions: typing.Sequence[OptionPositionInformation], spot_shifts, volatility_shifts=None) -> np.ndarray:
+        """
+        Calculates the total PnL of the positions in each scenario, repricing chunk_size positions at a time.
+
+        Returns:
+            aggregated PnL vector with a value for each scenario
+        """
+        spot_shifts = np.asarray(spot_shifts, dtype=np.float64)
+        aggregated_pnl = np.zeros(spot_shifts.shape[1])
+
+        for start in range(0, len(positions), self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            aggregated_pnl += self.calculate_pnl_matrix(positions[chunk], spot_shifts[chunk],
+                                                        volatility_shifts[chunk] if volatility_shifts is not None else None).sum(axis=1)
+
+        return aggregated_pnl
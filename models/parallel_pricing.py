@@ -0,0 +1,86 @@
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from models.black_and_scholes_model import VectorizedBlackScholesModel
+
+
+class ParallelOptionPricer:
+    """
+    Prices very large option books on multiple cores with VectorizedBlackScholesModel.
+
+    The book is split into chunks that are small enough to keep the intermediate arrays in the CPU cache,
+    and the chunks are priced in a thread pool. Threads are enough to use all the cores as NumPy and SciPy
+    release the GIL in the array operations, and unlike processes they don't need to copy the inputs and results.
+    Each chunk writes its prices directly into the preallocated result arrays. Every option is priced with the same
+    element-wise operations as in a single pass, so the results are exactly the same as the single-threaded model.
+    """
+
+    # Number of options priced at once. About a dozen intermediate arrays are alive per chunk,
+    # so 32k options keep them around 3MB, which fits in the L2/L3 cache of most CPUs.
+    DEFAULT_CHUNK_SIZE = 32768
+
+    def __init__(self, chunk_size: typing.Optional[int] = None, max_workers: typing.Optional[int] = None, normal_cdf_backend="ndtr"):
+        """
+        Parameters:
+            chunk_size: number of options to price at once, defaults to DEFAULT_CHUNK_SIZE
+            max_workers: number of threads, defaults to ThreadPoolExecutor's default
+            normal_cdf_backend: normal distribution implementation to be used by VectorizedBlackScholesModel
+        """
+        self.chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        self.max_workers = max_workers
+        self.normal_cdf_backend = normal_cdf_backend
+
+
+    def calculate_option_prices(self, S_current_price, K_strike_price, T_time_to_maturity, r_risk_free_interest_rate, v_volatility,
+                                call_prices: typing.Optional[np.ndarray] = None,
+                                put_prices: typing.Optional[np.ndarray] = None) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculates the call and put prices of the book. Parameters are broadcast against each other.
+
+        Parameters:
+            S_current_price, K_strike_price, T_time_to_maturity, r_risk_free_interest_rate, v_volatility: option parameters
+            call_prices: optional preallocated float64 array to write the call prices into, with the broadcast shape
+            put_prices: optional preallocated float64 array to write the put prices into, with the broadcast shape
+        Returns:
+            call and put prices
+        """
+        parameters = np.broadcast_arrays(*[np.asarray(value, dtype=np.float64) for value in (S_current_price,
+                                                                                             K_strike_price,
+                                                                                             T_time_to_maturity,
+                                                                                             r_risk_free_interest_rate,
+                                                                                             v_volatility)])
+        shape = parameters[0].shape
+        option_count = parameters[0].size
+
+        # Scalars broadcast to 1-D keep their zero stride, other shapes are flattened so that chunks are simple slices
+        flat_parameters = [parameter.reshape(-1) for parameter in parameters]
+
+        results = []
+        for prices in (call_prices, put_prices):
+            if prices is None:
+                prices = np.empty(shape)
+            assert prices.shape == shape and prices.dtype == np.float64, f"Result array must be float64 with shape {shape}"
+            assert prices.flags.c_contiguous, "Result array must be contiguous"
+            results.append(prices)
+
+        # reshape returns a view for the contiguous result arrays, so the chunks write into them directly
+        flat_results = [prices.reshape(-1) for prices in results]
+
+        def price_chunk(start):
+            chunk = slice(start, start + self.chunk_size)
+            model = VectorizedBlackScholesModel(*[parameter[chunk] for parameter in flat_parameters], normal_cdf_backend=self.normal_cdf_backend)
+            flat_results[0][chunk] = model.calculate_call_option_price()
+            flat_results[1][chunk] = model.calculate_put_option_price()
+
+        chunk_starts = range(0, option_count, self.chunk_size)
+        if self.max_workers == 1 or len(chunk_starts) <= 1:
+            for start in chunk_starts:
+                price_chunk(start)
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # list() propagates the exceptions of the chunks, e.g. invalid parameters
+                list(executor.map(price_chunk, chunk_starts))
+
+        return results[0], results[1]
@@ -0,0 +1,144 @@
+import typing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from models.dto.portfolio_node import PortfolioNode
+from models.var_calculation import HistoricalScenarioMatrix, HistoricalVarCalculationModel
+
+
+# Scenario matrix of the worker process, attached once by the pool initializer
+_worker_scenario_matrix: typing.Optional[HistoricalScenarioMatrix] = None
+_worker_shared_memory: typing.Optional[shared_memory.SharedMemory] = None
+
+
+def _initialize_worker(asset_names, directory, shared_memory_name, shape):
+    """
+    Attaches the worker process to the scenario data without copying it: either memory-maps the saved matrix,
+    or maps the shared memory block created by the parent process.
+    """
+    global _worker_scenario_matrix, _worker_shared_memory
+
+    if directory is not None:
+        _worker_scenario_matrix = HistoricalScenarioMatrix.open_memmap(directory)
+        return
+
+    # The reference is kept, otherwise the block is unmapped while the matrix is still in use
+    _worker_shared_memory = shared_memory.SharedMemory(name=shared_memory_name)
+    _worker_scenario_matrix = HistoricalScenarioMatrix(asset_names, np.ndarray(shape, dtype=np.float64, buffer=_worker_shared_memory.buf))
+
+
+def _aggregate_positions(asset_names, spot_values) -> np.ndarray:
+    return _worker_scenario_matrix.aggregate_pnl(asset_names, spot_values)
+
+
+class ParallelPortfolioVarCalculator:
+    """
+    Calculates the VaR of every node of a portfolio hierarchy, spreading the PnL aggregation over a process pool.
+
+    The positions of the nodes are split into tasks of at most task_size positions, and each worker aggregates the PnL
+    of its task from the shared scenario matrix. The scenario matrix is never pickled: workers memory-map it if it is
+    already saved to the disk, otherwise it is copied once into a shared memory block that all the workers map.
+    Only the aggregated PnL vectors (one value per scenario) are sent back, and the PnL of the parent nodes is the
+    sum of their own positions and their children, which is cheap to do in the main process.
+    """
+
+    # Maximum number of positions aggregated in a single task
+    DEFAULT_TASK_SIZE = 10000
+
+    def __init__(self, scenario_matrix: HistoricalScenarioMatrix, max_workers: typing.Optional[int] = None, task_size: typing.Optional[int] = None):
+        """
+        Parameters:
+            scenario_matrix: scenario matrix containing all the assets of the hierarchy
+            max_workers: number of worker processes, defaults to the number of CPUs
+            task_size: maximum number of positions in a task, defaults to DEFAULT_TASK_SIZE
+        """
+        self.scenario_matrix = scenario_matrix
+        self.max_workers = max_workers
+        self.task_size = task_size or self.DEFAULT_TASK_SIZE
+
+
+    @staticmethod
+    def get_nodes(root: PortfolioNode) -> typing.List[PortfolioNode]:
+        """
+        Returns all the nodes of the hierarchy, parents before their children.
+        """
+        nodes = []
+        pending = [root]
+        while pending:
+            node = pending.pop()
+            nodes.append(node)
+            pending.extend(reversed(node.children))
+
+        assert len(set(node.name for node in nodes)) == len(nodes), "Node names must be unique in the hierarchy"
+        return nodes
+
+
+    def __create_tasks(self, nodes: typing.List[PortfolioNode]):
+        for node in nodes:
+            assert len(node.asset_names) == len(node.spot_values), f"A spot value must be provided for each position of {node.name}"
+            for start in range(0, len(node.asset_names), self.task_size):
+                yield node.name, node.asset_names[start:start + self.task_size], node.spot_values[start:start + self.task_size]
+
+
+    def calculate_node_pnls(self, root: PortfolioNode) -> typing.Dict[str, np.ndarray]:
+        """
+        Calculates the aggregated PnL vector of every node in the hierarchy.
+
+        Returns:
+            aggregated PnL vector for each node name
+        """
+        nodes = self.get_nodes(root)
+        tasks = list(self.__create_tasks(nodes))
+
+        own_pnls = {node.name: np.zeros(self.scenario_matrix.scenario_count) for node in nodes}
+        for (node_name, _, _), pnl in zip(tasks, self.__run_tasks(tasks)):
+            own_pnls[node_name] += pnl
+
+        # Children are after their parents in the list, so the totals are built from the bottom up
+        node_pnls = {}
+        for node in reversed(nodes):
+            node_pnls[node.name] = own_pnls[node.name] + sum((node_pnls[child.name] for child in node.children), np.zeros(self.scenario_matrix.scenario_count))
+
+        return node_pnls
+
+
+    def __run_tasks(self, tasks) -> typing.List[np.ndarray]:
+        # A single worker doesn't need the overhead of the process pool
+        if self.max_workers == 1:
+            return [self.scenario_matrix.aggregate_pnl(asset_names, spot_values) for _, asset_names, spot_values in tasks]
+
+        return self.__run_tasks_in_pool(tasks)
+
+
+    def __run_tasks_in_pool(self, tasks) -> typing.List[np.ndarray]:
+        shift_matrix = self.scenario_matrix.shift_matrix
+        shared_block = None
+        try:
+            if self.scenario_matrix.directory is None:
+                shared_block = shared_memory.SharedMemory(create=True, size=max(shift_matrix.nbytes, 1))
+                np.ndarray(shift_matrix.shape, dtype=np.float64, buffer=shared_block.buf)[:] = shift_matrix
+
+            initializer_arguments = (self.scenario_matrix.asset_names,
+                                     self.scenario_matrix.directory,
+                                     shared_block.name if shared_block else None,
+                                     shift_matrix.shape)
+
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_initialize_worker, initargs=initializer_arguments) as executor:
+                return list(executor.map(_aggregate_positions, [task[1] for task in tasks], [task[2] for task in tasks]))
+        finally:
+            if shared_block is not None:
+                shared_block.close()
+                shared_block.unlink()
+
+
+    def calculate_var(self, root: PortfolioNode, confidence_level=0.99, interpolation="exclusive") -> typing.Dict[str, float]:
+        """
+        Calculates the VaR of every node in the hierarchy.
+
+        Returns:
+            VaR for each node name
+        """
+        return {node_name: HistoricalVarCalculationModel.calculate_external_var(pnl, confidence_level, interpolation)
+                for node_name, pnl in self.calculate_node_pnls(root).items()}
@@ -0,0 +1,151 @@
+import collections
+import time
+import typing
+
+from models import instrumentation
+from models.black_and_scholes_model import BlackScholesModel
+from models.dto.option_greeks import OptionGreeks
+from models.dto.option_information import OptionInformation
+
+
+class PricingCache:
+    """
+    Bounded LRU cache of pricing results, keyed on the option parameters rounded to a number of decimals.
+
+    The same (S, K, T, r, v) is often priced many times between two market data updates. Each entry keeps the
+    BlackScholesModel of the option and the results calculated so far, so a repeated call/put/Greeks request is a
+    dictionary lookup, and the other results of a cached option reuse the intermediate values of its model.
+    Options are priced with the rounded parameters, so the results don't depend on which of the nearly identical
+    options was priced first.
+
+    Entries can also expire after a time to live, and invalidate() should be called when new market data arrives.
+    The cache is not thread-safe, each thread or task should use its own instance or a lock.
+    """
+
+    DEFAULT_MAX_SIZE = 100000
+    DEFAULT_DECIMALS = 10
+
+    def __init__(self, max_size: typing.Optional[int] = None,
+                       ttl: typing.Optional[float] = None,
+                       decimals: typing.Optional[int] = None,
+                       normal_cdf_backend="erfc",
+                       clock: typing.Callable[[], float] = time.monotonic):
+        """
+        Parameters:
+            max_size: maximum number of cached options, the least recently used one is evicted above it
+            ttl: seconds after which an entry expires, entries don't expire if not provided
+            decimals: number of decimals the parameters are rounded to in the key, defaults to DEFAULT_DECIMALS
+            normal_cdf_backend: normal distribution implementation to be used by BlackScholesModel
+            clock: function returning the current time in seconds, used for the time to live
+        """
+        self.max_size = max_size or self.DEFAULT_MAX_SIZE
+        self.ttl = ttl
+        self.decimals = self.DEFAULT_DECIMALS if decimals is None else decimals
+        self.__scale = 10.0 ** self.decimals
+        self.normal_cdf_backend = normal_cdf_backend
+        self.clock = clock
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        # key -> (model, expiry time, results by name), ordered from the least to the most recently used
+        self.__entries: typing.OrderedDict[tuple, typing.Tuple[BlackScholesModel, float, dict]] = collections.OrderedDict()
+
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+    def get_key(self, option_info: OptionInformation) -> tuple:
+        """
+        Returns:
+            the option parameters as integer multiples of 10^-decimals.
+            Rounding the scaled values to integers is several times faster than round(value, decimals).
+        """
+        scale = self.__scale
+        return (round(option_info.S_current_price * scale),
+                round(option_info.K_strike_price * scale),
+                round(option_info.T_time_to_maturity * scale),
+                round(option_info.r_risk_free_interest_rate * scale),
+                round(option_info.v_volatility * scale))
+
+
+    def get_model(self, option_info: OptionInformation) -> BlackScholesModel:
+        """
+        Returns the cached model of the option, creating it on a miss.
+        The returned model is shared, so its parameters must not be modified.
+        """
+        return self.__get_entry(option_info)[0]
+
+
+    def __get_entry(self, option_info: OptionInformation):
+        key = self.get_key(option_info)
+        entry = self.__entries.get(key)
+
+        if entry is not None:
+            if self.ttl is None or entry[1] > self.clock():
+                self.hits += 1
+                instrumentation.count("cache_hits")
+                self.__entries.move_to_end(key)
+                return entry
+
+            self.expirations += 1
+            del self.__entries[key]
+
+        self.misses += 1
+        instrumentation.count("cache_misses")
+        entry = (BlackScholesModel(OptionInformation(*[value / self.__scale for value in key]), self.normal_cdf_backend),
+                 self.clock() + self.ttl if self.ttl is not None else 0.0,
+                 {})
+        self.__entries[key] = entry
+
+        if len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+            self.evictions += 1
+
+        return entry
+
+
+    def __get_result(self, option_info: OptionInformation, name, calculate: typing.Callable[[BlackScholesModel], typing.Any]):
+        model, _, results = self.__get_entry(option_info)
+        if name not in results:
+            results[name] = calculate(model)
+        return results[name]
+
+
+    def calculate_call_option_price(self, option_info: OptionInformation) -> float:
+        return self.__get_result(option_info, "call", BlackScholesModel.calculate_call_option_price)
+
+
+    def calculate_put_option_price(self, option_info: OptionInformation) -> float:
+        return self.__get_result(option_info, "put", BlackScholesModel.calculate_put_option_price)
+
+
+    def calculate_greeks(self, option_info: OptionInformation) -> OptionGreeks:
+        """
+        The returned OptionGreeks is shared by all the requests of the option, so it must not be modified.
+        """
+        return self.__get_result(option_info, "greeks", BlackScholesModel.calculate_greeks)
+
+
+    def invalidate(self):
+        """
+        Removes all the entries, e.g. when a market data update arrives. The counters are kept.
+        """
+        self.__entries.clear()
+
+
+    def get_statistics(self) -> typing.Dict[str, float]:
+        """
+        Returns:
+            number of entries, hits, misses, evictions and expirations, and the ratio of hits to all the requests
+        """
+        requests = self.hits + self.misses
+        return {"size": len(self.__entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / requests if requests else 0.0}
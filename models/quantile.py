@@ -0,0 +1,110 @@
+import math
+import typing
+
+import numpy as np
+
+from models import instrumentation
+
+
+# Supported interpolation conventions between the order statistics, for a probability p and n sorted values
+# (position is 0-based, fractional positions are interpolated linearly between the two neighbour values):
+#   exclusive: position (n + 1) * p - 1, same as Excel PERCENTILE.EXC. This is the convention of the assessment,
+#              for its 259 scenarios at 99% it gives 0.4 * x[1] + 0.6 * x[2], which was hardcoded before.
+#   inclusive: position (n - 1) * p, same as Excel PERCENTILE.INC and numpy's default "linear" method
+#   lower / higher / nearest: inclusive position rounded down / up / to the nearest value, without interpolation.
+#              Like numpy's "nearest" method, an exact tie is rounded to the even index
+INTERPOLATIONS = ("exclusive", "inclusive", "lower", "higher", "nearest")
+
+
+def get_quantile_position(value_count: int, probability: float, interpolation: str = "exclusive") -> typing.Tuple[int, int, float]:
+    """
+    Calculates which order statistics are used for the quantile and how they are weighted.
+
+    Parameters:
+        value_count: number of values
+        probability: probability of the quantile, between 0 and 1
+        interpolation: one of INTERPOLATIONS
+    Returns:
+        lower index, upper index and the weight of the upper value in the sorted values
+    """
+    assert value_count > 0, "At least one value is required to calculate a quantile"
+    assert 0 <= probability <= 1, f"Probability must be between 0 and 1: {probability}"
+    assert interpolation in INTERPOLATIONS, f"Unknown interpolation: {interpolation}"
+
+    if interpolation == "exclusive":
+        position = (value_count + 1) * probability - 1
+    else:
+        position = (value_count - 1) * probability
+
+    # Positions outside of the data are clamped to the first/last values.
+    # Rounding removes the floating point error of the multiplication, e.g. 260 * 0.01 - 1 = 1.6000000000000001
+    position = round(min(max(position, 0.0), value_count - 1.0), 9)
+    lower_index = math.floor(position)
+    weight = round(position - lower_index, 9)
+
+    if interpolation == "lower" or (interpolation == "nearest" and (weight < 0.5 or (weight == 0.5 and lower_index % 2 == 0))):
+        weight = 0.0
+    elif interpolation == "higher" or interpolation == "nearest":
+        lower_index, weight = math.ceil(position), 0.0
+
+    upper_index = min(lower_index + 1, value_count - 1) if weight else lower_index
+
+    return lower_index, upper_index, weight
+
+
+def get_tail_count(value_count: int, probability: float) -> int:
+    """
+    Number of values in the lower tail used for the expected shortfall: ceil(n * p), at least 1.
+    """
+    # Rounding is applied before ceil so that e.g. 259 * 0.01 doesn't become 3 due to the floating point error
+    return max(1, math.ceil(round(value_count * probability, 9)))
+
+
+def calculate_lower_tail_statistics(values, probabilities: typing.Sequence[float], interpolation: str = "exclusive") -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculates the quantiles and the lower tail means (expected shortfall) for several probabilities in one pass.
+    Only a partial selection (np.partition) is done for the order statistics that are needed, instead of a full sort.
+
+    Parameters:
+        values: values to calculate the statistics for
+        probabilities: probabilities of the lower tail, e.g. 0.01 for 99% VaR
+        interpolation: one of INTERPOLATIONS
+    Returns:
+        quantiles and the lower tail means, in the order of the probabilities
+    """
+    with instrumentation.stage("quantile"):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        value_count = len(values)
+
+        positions = [get_quantile_position(value_count, probability, interpolation) for probability in probabilities]
+        tail_counts = [get_tail_count(value_count, probability) for probability in probabilities]
+
+        kth = sorted(set(index for lower_index, upper_index, _ in positions for index in (lower_index, upper_index))
+                     | set(tail_count - 1 for tail_count in tail_counts))
+        partitioned = np.partition(values, kth)
+
+        quantiles = np.array([(1 - weight) * partitioned[lower_index] + weight * partitioned[upper_index]
+                              for lower_index, upper_index, weight in positions])
+
+        # After partitioning at tail_count - 1, the first tail_count values are the smallest ones
+        tail_means = np.array([partitioned[:tail_count].mean() for tail_count in tail_counts])
+
+    return quantiles, tail_means
+
+
+def get_quantile_scenarios(values, probability: float, interpolation: str = "exclusive") -> typing.Tuple[int, int, float]:
+    """
+    Finds which values the quantile is interpolated from, e.g. to attribute the VaR back to the scenarios.
+
+    Parameters:
+        values: values to calculate the quantile for
+        probability: probability of the quantile, between 0 and 1
+        interpolation: one of INTERPOLATIONS
+    Returns:
+        indices of the lower and upper values in the (unsorted) values, and the weight of the upper value
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    lower_index, upper_index, weight = get_quantile_position(len(values), probability, interpolation)
+    order = np.argpartition(values, sorted({lower_index, upper_index}))
+
+    return int(order[lower_index]), int(order[upper_index]), weight
@@ -0,0 +1,71 @@
+import bisect
+import typing
+
+import numpy as np
+
+from models.dto.rolling_var_result import RollingVarResult
+from models.quantile import get_quantile_position, get_tail_count
+
+
+class RollingVarCalculator:
+    """
+    Calculates the historical VaR and expected shortfall of every date on a trailing window of scenarios.
+
+    The PnL of the scenarios is calculated once (e.g. PortfolioVarModel.get_aggregated_pnl_array), and the window is
+    slid one date at a time over it. The window is kept sorted: when it moves, the leaving scenario is removed and the
+    entering one is inserted with a binary search, instead of sorting the whole window again for every date.
+    As the window size is constant, the positions of the order statistics used for the quantiles are calculated once.
+    """
+
+    DEFAULT_WINDOW_SIZE = 250
+
+    def __init__(self, window_size: typing.Optional[int] = None,
+                       confidence_levels: typing.Sequence[float] = (0.99,),
+                       interpolation="exclusive"):
+        """
+        Parameters:
+            window_size: number of scenarios used for the VaR of a date, defaults to DEFAULT_WINDOW_SIZE
+            confidence_levels: confidence levels of the VaR
+            interpolation: quantile interpolation, see models.quantile.INTERPOLATIONS
+        """
+        self.window_size = window_size or self.DEFAULT_WINDOW_SIZE
+        self.confidence_levels = np.asarray(confidence_levels, dtype=np.float64)
+        self.interpolation = interpolation
+
+        probabilities = [1 - confidence_level for confidence_level in self.confidence_levels]
+        self.__positions = [get_quantile_position(self.window_size, probability, interpolation) for probability in probabilities]
+        self.__tail_counts = [get_tail_count(self.window_size, probability) for probability in probabilities]
+
+
+    def calculate(self, pnl_values) -> RollingVarResult:
+        """
+        Calculates the VaR time series. The VaR of a date is calculated from the window_size scenarios before it,
+        and compared with the PnL of the date itself for the backtest.
+
+        Parameters:
+            pnl_values: PnL of each date, sorted from recent to old like the historical data
+        Returns:
+            VaR, expected shortfall and backtest exceptions for every date that has a full window before it,
+            sorted from recent to old
+        """
+        pnl_values = np.asarray(pnl_values, dtype=np.float64).ravel()
+        date_count = len(pnl_values) - self.window_size
+        assert date_count > 0, f"At least {self.window_size + 1} PnL values are required"
+
+        var = np.empty((date_count, len(self.confidence_levels)))
+        expected_shortfall = np.empty_like(var)
+
+        # Dates are processed from old to recent, the oldest date uses the oldest window_size scenarios
+        pnl_list = pnl_values.tolist()
+        window = sorted(pnl_list[date_count:])
+        for date in range(date_count - 1, -1, -1):
+            for level, ((lower_index, upper_index, weight), tail_count) in enumerate(zip(self.__positions, self.__tail_counts)):
+                var[date, level] = (1 - weight) * window[lower_index] + weight * window[upper_index]
+                expected_shortfall[date, level] = sum(window[:tail_count]) / tail_count
+
+            # Slide the window to the next date: the oldest scenario leaves, the current date enters
+            del window[bisect.bisect_left(window, pnl_list[date + self.window_size])]
+            bisect.insort(window, pnl_list[date])
+
+        realized_pnl = pnl_values[:date_count]
+        return RollingVarResult(self.confidence_levels, var, expected_shortfall, realized_pnl, realized_pnl[:, np.newaxis] < var)
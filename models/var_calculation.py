@@ -1,7 +1,16 @@
-import math
+import os
 import typing
 
+import numpy as np
+
+from models import instrumentation
 from models.dto.asset_information import AssetInformation
+from models.dto.option_position_information import OptionPositionInformation
+from models.dto.rolling_var_result import RollingVarResult
+from models.dto.var_result import VarResult
+from models.option_revaluation import OptionRevaluationModel
+from models.quantile import calculate_lower_tail_statistics, get_quantile_scenarios
+from models.rolling_var import RollingVarCalculator
 
 class HistoricalVarCalculationModel:
     """
@@ -16,105 +25,588 @@ class HistoricalVarCalculationModel:
         self.asset_name = asset_name
 
 
-    def __calculate_1day_shift(self, day_index) -> float:
+    def calculate_shift_array(self) -> np.ndarray:
         """
-        Calculate 1 day shift for the provided asset.
-        It assumes that the data is sorted from recent to old. 
+        Calculate 1 day shifts for the asset in one array operation.
+        It assumes that the data is sorted from recent to old.
         Returns:
-            1 day shift value for the given day.
+            1 day shift values, one less than the number of market rates.
         """
-        assert day_index < len(self.market_rates), f"Provided day index ({day_index}) is out of bounds."
+        return HistoricalVarCalculationModel.calculate_shift_matrix(self.market_rates)
+
 
-        return math.exp(math.log(self.market_rates[day_index] / self.market_rates[day_index + 1])) - 1
+    def calculate_pnl_array(self) -> np.ndarray:
+        """
+        Calculate the PnL array for the asset using the spot value and the historical rates.
+        """
+        with instrumentation.stage("pnl"):
+            pnl = self.spot_value * self.calculate_shift_array()
+
+        instrumentation.count("scenarios_processed", len(pnl))
+        return pnl
 
 
     def calculate_pnl_vector(self) -> typing.List[float]:
         """
         Calculate the PnL vector for the asset using the spot value and the historical rates.
         """
-        daily_shift_vector = [self.__calculate_1day_shift(day_index) for day_index in range(len(self.market_rates) - 1)]
+        return self.calculate_pnl_array().tolist()
 
-        return [self.spot_value * daily_shift for daily_shift in daily_shift_vector]
-    
 
-    def calculate_asset_var(self, confidence_level=0.99) -> float:
+    @staticmethod
+    def calculate_shift_matrix(market_rates, horizon=1) -> np.ndarray:
+        """
+        Calculate overlapping shifts over a number of days for one or more assets.
+        exp(ln(rate[d] / rate[d + h])) - 1 is simplified to rate[d] / rate[d + h] - 1, which is the same value
+        without the extra rounding of exp and log.
+        Parameters:
+            market_rates: market rates sorted from recent to old. Either a single series, or a matrix of assets x days
+            horizon: number of days of each shift
+        Returns:
+            shifts with the same layout as the market rates, horizon less values per asset
+        """
+        market_rates = np.asarray(market_rates, dtype=np.float64)
+        assert horizon >= 1, f"Horizon must be at least 1 day: {horizon}"
+        assert market_rates.shape[-1] > horizon, f"At least {horizon + 1} market rates are required to calculate a shift."
+
+        return market_rates[..., :-horizon] / market_rates[..., horizon:] - 1
+
+
+    @staticmethod
+    def calculate_pnl_matrix(spot_values, market_rates) -> np.ndarray:
+        """
+        Calculate the PnL vectors of many assets at once.
+        Parameters:
+            spot_values: spot value of each asset
+            market_rates: matrix of assets x days, sorted from recent to old
+        Returns:
+            PnL matrix of assets x scenarios
+        """
+        spot_values = np.asarray(spot_values, dtype=np.float64)
+        return spot_values[..., np.newaxis] * HistoricalVarCalculationModel.calculate_shift_matrix(market_rates)
+
+
+    def calculate_asset_var(self, confidence_level=0.99, interpolation="exclusive") -> float:
         """
         Calculates the VaR for the current asset
         Parameters:
             confidence_level (float): desired confidence level
+            interpolation (str): quantile interpolation convention, see models.quantile.INTERPOLATIONS
         Returns:
             VaR for the current asset
         """
-        return HistoricalVarCalculationModel.calculate_asset_var(self.calculate_pnl_vector(), confidence_level)
+        return HistoricalVarCalculationModel.calculate_external_var(self.calculate_pnl_array(), confidence_level, interpolation)
 
 
     @staticmethod
-    def calculate_external_var(pnl_values: typing.List[float], confidence_level=0.99) -> float:
+    def calculate_external_var(pnl_values: typing.List[float], confidence_level=0.99, interpolation="exclusive") -> float:
         """
         Calculates the VaR for the provided pnl values.
         Parameters:
-            confidence_level (float): desired confidence level. Note that it is ignored and hardcoded values are used in the assignment
+            confidence_level (float): desired confidence level
+            interpolation (str): quantile interpolation convention, see models.quantile.INTERPOLATIONS.
+                                 The default one is the convention used in the assessment (Excel PERCENTILE.EXC)
         Returns:
             VaR for the provided PnL values (and confidence level).
         """
-        sorted_pnls = sorted(pnl_values)
+        return HistoricalVarCalculationModel.calculate_external_var_results(pnl_values, [confidence_level], interpolation)[0].var
+
+
+    @staticmethod
+    def calculate_external_var_results(pnl_values: typing.List[float],
+                                       confidence_levels: typing.Sequence[float] = (0.95, 0.975, 0.99, 0.999),
+                                       interpolation="exclusive") -> typing.List[VarResult]:
+        """
+        Calculates the VaR and the expected shortfall for several confidence levels in one pass over the PnL values.
+        Expected shortfall is the average of the worst ceil(n * (1 - confidence level)) PnL values.
+        Parameters:
+            confidence_levels: desired confidence levels
+            interpolation (str): quantile interpolation convention, see models.quantile.INTERPOLATIONS
+        Returns:
+            VarResult for each confidence level, in the same order
+        """
+        quantiles, tail_means = calculate_lower_tail_statistics(pnl_values, [1 - confidence_level for confidence_level in confidence_levels], interpolation)
+
+        return [VarResult(confidence_level, float(var), float(expected_shortfall))
+                for confidence_level, var, expected_shortfall in zip(confidence_levels, quantiles, tail_means)]
+
+
+class HistoricalScenarioMatrix:
+    """
+    Dense matrix of shifts (assets x scenarios) for a set of assets, usually 1 day shifts.
+    It is built once from the historical rates, and can be shared by several portfolios holding the same assets.
+    The matrix can also be saved to the disk and memory-mapped, for portfolios that don't fit in memory.
+    """
+
+    # Number of assets aggregated at once. It limits the memory usage to DEFAULT_CHUNK_SIZE x scenarios
+    DEFAULT_CHUNK_SIZE = 1024
+
+    SHIFT_MATRIX_FILE = "shift_matrix.npy"
+    ASSET_NAMES_FILE = "asset_names.npy"
+    HORIZON_FILE = "horizon.npy"
+
+    def __init__(self, asset_names: typing.Sequence[str], shift_matrix, horizon=1):
+        """
+        Parameters:
+            asset_names: name of the asset for each row of the matrix
+            shift_matrix: shifts, assets x scenarios
+            horizon: number of days of each shift, the volatility shifts of the option positions are taken over the same days
+        """
+        assert horizon >= 1, f"Horizon must be at least 1 day: {horizon}"
+        self.horizon = horizon
+        # np.asarray doesn't copy memory-mapped arrays, the matrix stays on the disk
+        self.shift_matrix = np.asarray(shift_matrix, dtype=np.float64)
+        assert self.shift_matrix.ndim == 2, "Shift matrix must be a matrix of assets x scenarios"
+        assert len(asset_names) == self.shift_matrix.shape[0], "An asset name must be provided for each row of the shift matrix"
+
+        self.asset_names = list(asset_names)
+        self.directory = None  # set when the matrix is memory-mapped from a directory
+        self.asset_indices = {asset_name: index for index, asset_name in enumerate(self.asset_names)}
+        assert len(self.asset_indices) == len(self.asset_names), "Asset names must be unique"
+
+
+    @classmethod
+    def from_market_rates(cls, asset_names: typing.Sequence[str], market_rates, horizon=1) -> "HistoricalScenarioMatrix":
+        """
+        Creates the scenario matrix from the market rates of the assets (assets x days, sorted from recent to old).
+        With a horizon longer than 1 day, the scenarios are the overlapping shifts over that many days.
+        """
+        return cls(asset_names, HistoricalVarCalculationModel.calculate_shift_matrix(market_rates, horizon), horizon)
+
+
+    @classmethod
+    def from_assets(cls, assets: typing.Iterable[AssetInformation]) -> "HistoricalScenarioMatrix":
+        """
+        Creates the scenario matrix from the historical data of the assets. The same asset is only included once,
+        so all the positions of an asset must have the same historical data.
+        """
+        historical_data = {}
+        for asset in assets:
+            rates = historical_data.setdefault(asset.asset_name, asset.historical_data)
+            assert rates is asset.historical_data or np.array_equal(rates, asset.historical_data), \
+                f"Positions of the same asset must have the same historical data: {asset.asset_name}"
+
+        # Note that we are assuming all assets have the same amount of historical data. Otherwise, we
+        # would need a better way to align the data for missing values.
+        assert len(set(len(rates) for rates in historical_data.values())) <= 1, "All assets must have the same amount of historical data"
 
-        return 0.4 * sorted_pnls[1] + 0.6 * sorted_pnls[2]
+        return cls.from_market_rates(list(historical_data.keys()), list(historical_data.values()))
+
+
+    @property
+    def scenario_count(self) -> int:
+        return self.shift_matrix.shape[1]
+
+
+    def get_asset_index(self, asset_name) -> int:
+        """
+        Returns the row of the provided asset in the matrix.
+        """
+        assert asset_name in self.asset_indices, f"Asset is not in the scenario matrix: {asset_name}"
+        return self.asset_indices[asset_name]
+
+
+    def aggregate_pnl(self, asset_names: typing.Sequence[str], spot_values, chunk_size: typing.Optional[int] = None) -> np.ndarray:
+        """
+        Calculates the aggregated PnL of the positions as a weighted reduction: spot vector . shift matrix
+        Only the rows of the portfolio are used when the matrix is shared with a larger set of assets.
+
+        Parameters:
+            asset_names: asset of each position, the same asset can appear multiple times
+            spot_values: spot value of each position
+            chunk_size: number of assets to aggregate at once, see aggregate_rows
+        Returns:
+            Aggregated PnL vector with a value for each scenario
+        """
+        rows = np.fromiter((self.get_asset_index(asset_name) for asset_name in asset_names), dtype=np.intp, count=len(asset_names))
+        spot_values = np.asarray(spot_values, dtype=np.float64)
+
+        # Positions of the same asset are netted before the reduction
+        unique_rows, position_rows = np.unique(rows, return_inverse=True)
+        spot_vector = np.bincount(position_rows, weights=spot_values, minlength=len(unique_rows))
+
+        return self.aggregate_rows(unique_rows, spot_vector, chunk_size)
+
+
+    def aggregate_rows(self, rows, spot_vector, chunk_size: typing.Optional[int] = None) -> np.ndarray:
+        """
+        Calculates spot vector . shift matrix[rows] in chunks of rows.
+        Only a chunk of rows is in memory at a time, so the memory stays bounded to chunk size x scenarios even when
+        the matrix is memory-mapped. The chunks are always aggregated in the same order, so the result is exactly the same
+        for in-memory and memory-mapped matrices.
+
+        Parameters:
+            rows: rows of the matrix to aggregate
+            spot_vector: weight of each row
+            chunk_size: number of rows to aggregate at once, defaults to DEFAULT_CHUNK_SIZE
+        Returns:
+            Aggregated PnL vector with a value for each scenario
+        """
+        chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        rows = np.asarray(rows, dtype=np.intp)
+        spot_vector = np.asarray(spot_vector, dtype=np.float64)
+
+        with instrumentation.stage("aggregation"):
+            aggregated_pnl = np.zeros(self.scenario_count)
+            buffer = np.empty((min(chunk_size, len(rows)), self.scenario_count))
+            for start in range(0, len(rows), chunk_size):
+                chunk = buffer[:len(rows[start:start + chunk_size])]
+                np.take(self.shift_matrix, rows[start:start + chunk_size], axis=0, out=chunk)
+                np.multiply(chunk, spot_vector[start:start + chunk_size, np.newaxis], out=chunk)
+                aggregated_pnl += chunk.sum(axis=0)
+
+        # Every asset is revalued in every scenario
+        instrumentation.count("scenarios_processed", len(rows) * self.scenario_count)
+        return aggregated_pnl
+
+
+    def save(self, directory):
+        """
+        Saves the scenario matrix to a directory, to be memory-mapped later with open_memmap.
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, self.ASSET_NAMES_FILE), np.array(self.asset_names, dtype=str))
+        np.save(os.path.join(directory, self.HORIZON_FILE), np.array(self.horizon))
+
+        shift_matrix = np.lib.format.open_memmap(os.path.join(directory, self.SHIFT_MATRIX_FILE), mode="w+", dtype=np.float64, shape=self.shift_matrix.shape)
+        for start in range(0, self.shift_matrix.shape[0], self.DEFAULT_CHUNK_SIZE):
+            shift_matrix[start:start + self.DEFAULT_CHUNK_SIZE] = self.shift_matrix[start:start + self.DEFAULT_CHUNK_SIZE]
+        shift_matrix.flush()
+
+
+    @classmethod
+    def create_memmap(cls, asset_names: typing.Sequence[str], market_rates, directory, chunk_size: typing.Optional[int] = None) -> "HistoricalScenarioMatrix":
+        """
+        Calculates the shifts from the market rates chunk by chunk directly into a memory-mapped file,
+        so neither the market rates nor the shifts need to fit in memory.
+
+        Parameters:
+            asset_names: name of each asset
+            market_rates: market rates matrix (assets x days, sorted from recent to old), can be memory-mapped as well
+            directory: directory to write the scenario matrix files
+            chunk_size: number of assets to process at once, defaults to DEFAULT_CHUNK_SIZE
+        Returns:
+            Scenario matrix backed by the memory-mapped file
+        """
+        chunk_size = chunk_size or cls.DEFAULT_CHUNK_SIZE
+        asset_count, day_count = market_rates.shape
+        assert len(asset_names) == asset_count, "An asset name must be provided for each row of the market rates"
+
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, cls.ASSET_NAMES_FILE), np.array(asset_names, dtype=str))
+        np.save(os.path.join(directory, cls.HORIZON_FILE), np.array(1))
+
+        shift_matrix = np.lib.format.open_memmap(os.path.join(directory, cls.SHIFT_MATRIX_FILE), mode="w+", dtype=np.float64, shape=(asset_count, day_count - 1))
+        for start in range(0, asset_count, chunk_size):
+            shift_matrix[start:start + chunk_size] = HistoricalVarCalculationModel.calculate_shift_matrix(market_rates[start:start + chunk_size])
+        shift_matrix.flush()
+        del shift_matrix
+
+        return cls.open_memmap(directory)
+
+
+    @classmethod
+    def open_memmap(cls, directory) -> "HistoricalScenarioMatrix":
+        """
+        Opens a saved scenario matrix as a read-only memory-mapped array. The data is only read from the disk when needed,
+        and several processes mapping the same file share the same pages of the OS cache without copying.
+        """
+        asset_names = np.load(os.path.join(directory, cls.ASSET_NAMES_FILE), allow_pickle=False).tolist()
+        shift_matrix = np.load(os.path.join(directory, cls.SHIFT_MATRIX_FILE), mmap_mode="r", allow_pickle=False)
+
+        # Matrices saved before the horizon was stored contain 1 day shifts
+        horizon_path = os.path.join(directory, cls.HORIZON_FILE)
+        horizon = int(np.load(horizon_path, allow_pickle=False)) if os.path.exists(horizon_path) else 1
+
+        scenario_matrix = cls(asset_names, shift_matrix, horizon)
+        scenario_matrix.directory = directory
+
+        return scenario_matrix
 
 
 class PortfolioVarModel:
     """
     Basic porfolio model to store different assets and manage aggregated calculations.
+    The aggregated PnL vector is kept once calculated, and adding or removing an asset only
+    adds or subtracts the PnL vector of that asset instead of recalculating the whole portfolio.
+
+    In streaming mode, the assets are not stored at all. Only the running aggregated PnL vector is kept, so the memory
+    usage is O(scenarios) however many assets are added. Calculations that need the individual assets (removing an asset,
+    marginal/component VaR and recalculating the aggregated PnL) are not available in this mode.
+
+    Option positions are non-linear: their scenario PnL is calculated by repricing them with the shifts of their
+    underlyings, see OptionRevaluationModel. Marginal and component VaR are only available for the linear assets.
+    The volatility changes of the option positions are taken over the horizon of the scenario matrix, so a volatility
+    history needs the same number of values as the market rates. The scenario matrices of HorizonScenarioGenerator's
+    sqrt_time method have a horizon of 1 day, their volatility changes are 1 day changes and are not scaled.
     """
-    def __init__(self):
+    def __init__(self, scenario_matrix: typing.Optional[HistoricalScenarioMatrix] = None, streaming=False,
+                       option_revaluation: typing.Optional[OptionRevaluationModel] = None):
+        """
+        Parameters:
+            scenario_matrix: shared scenario matrix containing all the assets of the portfolio.
+                             If not provided, it is built from the historical data of the assets when needed.
+            streaming: if True, only the aggregated PnL vector is kept instead of the assets
+            option_revaluation: model calculating the PnL of the option positions, defaults to full revaluation
+        """
         self.assets : typing.List[AssetInformation] = []
+        self.option_positions: typing.List[OptionPositionInformation] = []
+        self.option_revaluation = option_revaluation or OptionRevaluationModel()
         self.var_models = []
+        self.scenario_matrix = scenario_matrix
+        self.streaming = streaming
+        self.__owns_scenario_matrix = scenario_matrix is None
+        self.__aggregated_pnl: typing.Optional[np.ndarray] = None
 
 
     def add_asset(self, asset_info: AssetInformation):
         """
-        Adds the provided asset to the portfolio
+        Adds the provided asset to the portfolio, updating the aggregated PnL vector in O(scenarios) if it is already calculated.
+        In streaming mode, the PnL vector of the asset is added to the aggregated PnL vector and the asset is not kept.
         """
+        if self.streaming:
+            asset_pnl = self.get_asset_pnl_array(asset_info)
+            if self.__aggregated_pnl is None:
+                self.__update_aggregated_pnl(asset_pnl)
+            else:
+                self.__update_aggregated_pnl(self.__aggregated_pnl + asset_pnl)
+            return
+
+        if self.__aggregated_pnl is not None:
+            self.__update_aggregated_pnl(self.__aggregated_pnl + self.get_asset_pnl_array(asset_info))
+
         self.assets.append(asset_info)
 
-    def get_aggregated_pnl(self):
+
+    def add_assets(self, assets: typing.Iterable[AssetInformation]):
         """
-        Creates an aggregated PnL vector for the current porfolio.
+        Adds the assets one by one. Assets can be provided by a generator, e.g. BaseDataProvider.iter_assets,
+        so in streaming mode only one asset needs to be in memory at a time.
+        """
+        for asset_info in assets:
+            self.add_asset(asset_info)
+
+
+    def add_option_position(self, position: OptionPositionInformation):
+        """
+        Adds an option position to the portfolio, updating the aggregated PnL vector with its repriced PnL if it is already calculated.
+        In streaming mode, the position is not kept.
+        """
+        if self.streaming or self.__aggregated_pnl is not None:
+            position_pnl = self.get_option_position_pnl_array(position)
+            if self.__aggregated_pnl is None:
+                self.__update_aggregated_pnl(position_pnl)
+            else:
+                self.__update_aggregated_pnl(self.__aggregated_pnl + position_pnl)
+
+        if not self.streaming:
+            self.option_positions.append(position)
+
+
+    def remove_asset(self, asset_name) -> AssetInformation:
+        """
+        Removes the first position of the provided asset from the portfolio, updating the aggregated PnL vector
+        in O(scenarios) if it is already calculated.
+
+        Returns:
+            the removed asset
+        """
+        assert not self.streaming, "Assets can't be removed from a streaming portfolio"
+
+        index = next((index for index, asset in enumerate(self.assets) if asset.asset_name == asset_name), None)
+        assert index is not None, f"Asset is not in the portfolio: {asset_name}"
+
+        if self.__aggregated_pnl is not None:
+            self.__update_aggregated_pnl(self.__aggregated_pnl - self.get_asset_pnl_array(self.assets[index]))
+
+        return self.assets.pop(index)
+
+
+    def __check_scenario_count(self, pnl: np.ndarray) -> np.ndarray:
+        # NumPy would broadcast a PnL vector of another length over the aggregated PnL vector without an error,
+        # so every incremental update checks it against the scenarios of the portfolio first
+        if self.__aggregated_pnl is not None:
+            assert len(pnl) == len(self.__aggregated_pnl), "All assets must have the same amount of historical data"
+        return pnl
+
+
+    def __update_aggregated_pnl(self, aggregated_pnl: np.ndarray):
+        # The cached vector is shared with the callers of get_aggregated_pnl_array, so it is never modified in place
+        aggregated_pnl.flags.writeable = False
+        self.__aggregated_pnl = aggregated_pnl
+
+
+    def get_scenario_matrix(self) -> HistoricalScenarioMatrix:
+        """
+        Returns the scenario matrix for the portfolio, building it once from the historical data of the assets if not shared.
+        The matrix that is built by the portfolio is rebuilt if an asset is added afterwards which is not in the matrix.
+        """
+        if self.__owns_scenario_matrix and self.scenario_matrix is not None:
+            if any(asset.asset_name not in self.scenario_matrix.asset_indices for asset in self.assets):
+                self.scenario_matrix = None
+
+        if self.scenario_matrix is None:
+            self.scenario_matrix = HistoricalScenarioMatrix.from_assets(self.assets)
+
+        return self.scenario_matrix
+
+
+    def __get_asset_shifts(self, asset_info: AssetInformation, scenarios=slice(None)) -> np.ndarray:
+        # Shifts come from the scenario matrix when the asset is in it. Otherwise, only the requested
+        # scenarios are calculated from the historical data to keep single asset updates O(scenarios)
+        if self.scenario_matrix is not None and asset_info.asset_name in self.scenario_matrix.asset_indices:
+            return self.scenario_matrix.shift_matrix[self.scenario_matrix.get_asset_index(asset_info.asset_name), scenarios]
+
+        assert self.__owns_scenario_matrix, f"Asset is not in the scenario matrix: {asset_info.asset_name}"
+        market_rates = np.asarray(asset_info.historical_data, dtype=np.float64)
+        days = np.arange(len(market_rates) - 1)[scenarios]
+
+        return market_rates[days] / market_rates[days + 1] - 1
+
+
+    def get_asset_pnl_array(self, asset_info: AssetInformation) -> np.ndarray:
+        """
+        Returns the PnL vector of a single asset, in the same scenarios as the portfolio.
+        """
+        return self.__check_scenario_count(asset_info.spot_value * self.__get_asset_shifts(asset_info))
+
+
+    def get_option_position_pnl_array(self, position: OptionPositionInformation) -> np.ndarray:
+        """
+        Returns the PnL vector of a single option position, in the same scenarios as the portfolio.
+        """
+        return self.__check_scenario_count(self.__calculate_option_positions_pnl([position]))
+
+
+    def __calculate_option_positions_pnl(self, positions: typing.Sequence[OptionPositionInformation]) -> np.ndarray:
+        spot_shifts = np.array([self.__get_asset_shifts(position) for position in positions])
+        # Assets which are not in the scenario matrix are shifted over 1 day, see __get_asset_shifts
+        horizon = self.scenario_matrix.horizon if self.scenario_matrix is not None else 1
+        volatility_shifts = OptionRevaluationModel.calculate_volatility_shifts(positions, spot_shifts.shape[1], horizon)
+
+        return self.option_revaluation.calculate_aggregated_pnl(positions, spot_shifts, volatility_shifts)
+
+
+    def get_aggregated_pnl_array(self) -> np.ndarray:
+        """
+        Creates an aggregated PnL vector for the current porfolio, as spot vector . shift matrix.
         Ideally, we can have a smarter porfolio manager where the correlation between the assets, or
         the differences in the historical data is handled properly.
         For the sake of the assessment, the problem is in a narrow scope, so current implementation
         should be good enough.
 
-        Note that we are assuming all assets have the same amount of historical data. Otherwise, we
-        would need a better way to align the data for missing values.
-
         Returns:
-            Aggregated PnL vector for the entire portfolio
+            Aggregated PnL vector for the entire portfolio. It is read-only as it is kept for the next calculations.
+        """
+        if self.__aggregated_pnl is None:
+            assert not self.streaming, "Portfolio doesn't have any assets"
+            self.recalculate_aggregated_pnl()
+
+        return self.__aggregated_pnl
+
+
+    def recalculate_aggregated_pnl(self) -> np.ndarray:
+        """
+        Recalculates the aggregated PnL vector from all the assets, dropping the incremental updates.
+        Useful after many incremental updates, as adding and subtracting accumulates floating point errors.
         """
-        pnls = []
+        assert not self.streaming, "Aggregated PnL of a streaming portfolio can't be recalculated as the assets are not kept"
+        assert self.assets or self.option_positions, "Portfolio doesn't have any assets"
+
+        aggregated_pnl = None
+        if self.assets:
+            aggregated_pnl = self.get_scenario_matrix().aggregate_pnl([asset.asset_name for asset in self.assets],
+                                                                      [asset.spot_value for asset in self.assets])
+        if self.option_positions:
+            # All the option positions are repriced together in scenarios x options batches
+            option_pnl = self.__calculate_option_positions_pnl(self.option_positions)
+            aggregated_pnl = option_pnl if aggregated_pnl is None else aggregated_pnl + option_pnl
 
-        # we can separately calculate the PnL for each asset as they are not dependent.
-        for asset in self.assets:
-            asset_model = HistoricalVarCalculationModel(asset.spot_value, asset.historical_data, asset.asset_name)
-            pnls.append(asset_model.calculate_pnl_vector())
+        self.__update_aggregated_pnl(aggregated_pnl)
+        return self.__aggregated_pnl
 
-        total_pnls = []
-        for i in range(len(pnls[0])):
-            total_pnl = 0
-            for pnl in pnls:
-                total_pnl += pnl[i]
 
-            total_pnls.append(total_pnl)
+    def get_aggregated_pnl(self) -> typing.List[float]:
+        """
+        Creates an aggregated PnL vector for the current porfolio.
 
-        return total_pnls
+        Returns:
+            Aggregated PnL vector for the entire portfolio
+        """
+        return self.get_aggregated_pnl_array().tolist()
 
 
-    def calculate_var(self, confidence_level=0.99) -> float:
+    def calculate_var(self, confidence_level=0.99, interpolation="exclusive") -> float:
         """
         Calculate the combined VaR using HistoricalVarCalculationModel and the aggregated PnL vector
 
         Returns:
             the aggregated VaR for the portfolio
         """
-        return HistoricalVarCalculationModel.calculate_external_var(self.get_aggregated_pnl(), confidence_level)
-        
+        return HistoricalVarCalculationModel.calculate_external_var(self.get_aggregated_pnl_array(), confidence_level, interpolation)
+
+
+    def calculate_var_results(self, confidence_levels: typing.Sequence[float] = (0.95, 0.975, 0.99, 0.999), interpolation="exclusive") -> typing.List[VarResult]:
+        """
+        Calculate the combined VaR and expected shortfall for several confidence levels in one pass.
+
+        Returns:
+            VarResult for each confidence level, in the same order
+        """
+        return HistoricalVarCalculationModel.calculate_external_var_results(self.get_aggregated_pnl_array(), confidence_levels, interpolation)
+
+
+    def calculate_rolling_var(self, window_size: typing.Optional[int] = None,
+                                    confidence_levels: typing.Sequence[float] = (0.99,),
+                                    interpolation="exclusive") -> RollingVarResult:
+        """
+        Calculate the VaR time series of the current portfolio on a trailing window, backtested against the PnL of each date.
+
+        Returns:
+            RollingVarResult, see RollingVarCalculator
+        """
+        return RollingVarCalculator(window_size, confidence_levels, interpolation).calculate(self.get_aggregated_pnl_array())
+
+
+    def calculate_incremental_var(self, asset_info: AssetInformation, confidence_level=0.99, interpolation="exclusive") -> float:
+        """
+        Calculates how much the VaR would change if the asset was added, without modifying the portfolio.
+        It is O(scenarios) as only the PnL vector of the new asset is calculated.
+
+        Returns:
+            VaR of the portfolio with the asset minus the current VaR of the portfolio
+        """
+        aggregated_pnl = self.get_aggregated_pnl_array()
+        new_var = HistoricalVarCalculationModel.calculate_external_var(aggregated_pnl + self.get_asset_pnl_array(asset_info), confidence_level, interpolation)
+
+        return new_var - HistoricalVarCalculationModel.calculate_external_var(aggregated_pnl, confidence_level, interpolation)
+
+
+    def calculate_marginal_var(self, confidence_level=0.99, interpolation="exclusive") -> np.ndarray:
+        """
+        Calculates the marginal VaR of each position, i.e. the change in VaR per unit change in its spot value.
+        For historical VaR, this is the shift of the asset in the scenario(s) that the VaR is taken from.
+
+        Returns:
+            marginal VaR for each position, in the same order as the assets
+        """
+        assert not self.streaming, "Marginal VaR requires the assets, which are not kept in a streaming portfolio"
+        assert not self.option_positions, "Marginal VaR is only available for portfolios of linear assets"
+
+        lower_scenario, upper_scenario, weight = get_quantile_scenarios(self.get_aggregated_pnl_array(), 1 - confidence_level, interpolation)
+
+        return np.array([(1 - weight) * shifts[0] + weight * shifts[1]
+                         for shifts in (self.__get_asset_shifts(asset, [lower_scenario, upper_scenario]) for asset in self.assets)])
+
+
+    def calculate_component_var(self, confidence_level=0.99, interpolation="exclusive") -> np.ndarray:
+        """
+        Calculates the component VaR of each position (spot value x marginal VaR).
+        As the portfolio PnL is linear in the positions, the components add up to the portfolio VaR.
+
+        Returns:
+            component VaR for each position, in the same order as the assets
+        """
+        spot_values = np.array([asset.spot_value for asset in self.assets], dtype=np.float64)
+
+        return spot_values * self.calculate_marginal_var(confidence_level, interpolation)
@@ -0,0 +1,326 @@
+import asyncio
+import collections
+import json
+import math
+import time
+import typing
+
+import numpy as np
+
+from models.black_and_scholes_model import VectorizedBlackScholesModel
+from models.dto.base_data_provider import BaseDataProvider
+from models.normal_distribution import get_normal_cdf
+from models.var_calculation import PortfolioVarModel
+
+
+class LatencyStatistics:
+    """
+    Collects the latencies of the handled requests to report the throughput and the latency percentiles.
+    Only the most recent latencies are kept, so the percentiles reflect the current load of a long-running service.
+    """
+
+    DEFAULT_WINDOW_SIZE = 100000
+    PERCENTILES = (50, 90, 99, 99.9)
+
+    def __init__(self, window_size: typing.Optional[int] = None):
+        self.__latencies = collections.deque(maxlen=window_size or self.DEFAULT_WINDOW_SIZE)
+        self.__start_time = time.perf_counter()
+        self.request_count = 0
+        self.error_count = 0
+
+
+    def record(self, latency: float, is_error=False):
+        """
+        Parameters:
+            latency: duration of the request in seconds
+            is_error: whether the request failed
+        """
+        self.__latencies.append(latency)
+        self.request_count += 1
+        self.error_count += is_error
+
+
+    def get_summary(self) -> typing.Dict[str, float]:
+        """
+        Returns:
+            number of requests and errors, requests per second since the start, and the latency percentiles in milliseconds
+        """
+        elapsed = time.perf_counter() - self.__start_time
+        summary = {"request_count": self.request_count,
+                   "error_count": self.error_count,
+                   "throughput": self.request_count / elapsed if elapsed > 0 else 0.0}
+
+        latencies = np.fromiter(self.__latencies, dtype=np.float64, count=len(self.__latencies)) * 1000
+        percentiles = np.percentile(latencies, self.PERCENTILES) if len(latencies) else [0.0] * len(self.PERCENTILES)
+        for percentile, value in zip(self.PERCENTILES, percentiles):
+            summary[f"p{percentile:g}_ms"] = float(value)
+        summary["max_ms"] = float(latencies.max()) if len(latencies) else 0.0
+
+        return summary
+
+
+class PricingBatcher:
+    """
+    Collects the concurrent pricing requests and prices them together with a single VectorizedBlackScholesModel.
+
+    The requests arriving while the event loop is busy are queued, and the batching task takes everything in the
+    queue at once (up to max_batch_size). With the default max_delay of 0 the batcher doesn't wait for more requests,
+    so a single request is priced immediately and the batches grow only under load, keeping the tail latency low.
+    """
+
+    DEFAULT_MAX_BATCH_SIZE = 4096
+
+    def __init__(self, max_batch_size: typing.Optional[int] = None, max_delay=0.0, normal_cdf_backend="ndtr"):
+        """
+        Parameters:
+            max_batch_size: maximum number of options priced together, defaults to DEFAULT_MAX_BATCH_SIZE
+            max_delay: seconds to wait for more requests after the first one of a batch
+            normal_cdf_backend: normal distribution implementation to be used by VectorizedBlackScholesModel.
+                                It is loaded here, so that the first request doesn't pay for importing scipy
+        """
+        self.max_batch_size = max_batch_size or self.DEFAULT_MAX_BATCH_SIZE
+        self.max_delay = max_delay
+        self.normal_cdf = get_normal_cdf(normal_cdf_backend)
+        self.batch_sizes = collections.Counter()
+        self.__queue: typing.Optional[asyncio.Queue] = None
+        self.__task: typing.Optional[asyncio.Task] = None
+
+
+    def start(self):
+        """
+        Starts the batching task in the running event loop.
+        """
+        assert self.__task is None, "Batcher is already started"
+        self.__queue = asyncio.Queue()
+        self.__task = asyncio.get_running_loop().create_task(self.__run())
+
+
+    async def stop(self):
+        if self.__task is not None:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+
+
+    async def price(self, S_current_price, K_strike_price, T_time_to_maturity, r_risk_free_interest_rate, v_volatility) -> typing.Tuple[float, float]:
+        """
+        Queues an option to be priced in the next batch.
+
+        Returns:
+            call and put prices
+        """
+        assert self.__task is not None, "Batcher must be started before pricing"
+        future = asyncio.get_running_loop().create_future()
+        self.__queue.put_nowait(((S_current_price, K_strike_price, T_time_to_maturity, r_risk_free_interest_rate, v_volatility), future))
+        return await future
+
+
+    async def __run(self):
+        while True:
+            batch = [await self.__queue.get()]
+
+            # Lets the other tasks queue their requests before the batch is closed
+            await asyncio.sleep(self.max_delay)
+            while len(batch) < self.max_batch_size and not self.__queue.empty():
+                batch.append(self.__queue.get_nowait())
+
+            self.batch_sizes[len(batch)] += 1
+            try:
+                self.price_batch(batch)
+            except Exception as e:
+                # The batching task must keep running, otherwise all the following requests would wait forever
+                for _, future in batch:
+                    self.__set_exception(future, e)
+
+
+    def price_batch(self, batch):
+        """
+        Prices the batch and sets the results of the futures.
+        If an option in the batch is invalid, the options are priced one by one, so that only the invalid ones fail.
+        """
+        parameters = np.array([option_parameters for option_parameters, _ in batch], dtype=np.float64)
+        try:
+            call_prices, put_prices = VectorizedBlackScholesModel(*parameters.T, normal_cdf_backend=self.normal_cdf).calculate_option_prices()
+        except AssertionError as e:
+            if len(batch) == 1:
+                self.__set_exception(batch[0][1], e)
+                return
+            for item in batch:
+                self.price_batch([item])
+            return
+
+        for (_, future), call_price, put_price in zip(batch, call_prices.tolist(), put_prices.tolist()):
+            # The client may have disconnected and cancelled the request in the meantime
+            if not future.done():
+                future.set_result((call_price, put_price))
+
+
+    @staticmethod
+    def __set_exception(future: asyncio.Future, exception: Exception):
+        if not future.done():
+            future.set_exception(exception)
+
+
+class PricingService:
+    """
+    Long-running asyncio service answering pricing and VaR requests with the market data kept in memory.
+
+    The protocol is JSON lines over TCP: every line is a request, and every response is a line with the same id.
+    Requests of a connection are handled concurrently, so the responses may be in a different order than the requests.
+        {"id": 1, "method": "price", "params": {"S_current_price": 19, "v_volatility": 0.3}}
+        {"id": 2, "method": "var", "params": {"confidence_levels": [0.99], "interpolation": "exclusive"}}
+        {"id": 3, "method": "stats"}
+    Missing option parameters default to the option of the data provider.
+    Responses have either a "result" or an "error" field.
+    """
+
+    DEFAULT_HOST = "127.0.0.1"
+    DEFAULT_PORT = 8765
+    OPTION_PARAMETERS = ("S_current_price", "K_strike_price", "T_time_to_maturity", "r_risk_free_interest_rate", "v_volatility")
+    POSITIVE_OPTION_PARAMETERS = ("S_current_price", "K_strike_price", "T_time_to_maturity", "v_volatility")
+
+    def __init__(self, data_provider: BaseDataProvider, host=DEFAULT_HOST, port=DEFAULT_PORT, batcher: typing.Optional[PricingBatcher] = None):
+        """
+        Loads the market data once and calculates the aggregated PnL of the portfolio, so that the requests don't need to.
+
+        Parameters:
+            data_provider: provider of the option and the portfolio
+            host, port: address to listen to, port 0 selects a free port
+            batcher: pricing batcher, defaults to a PricingBatcher with the default parameters
+        """
+        self.host = host
+        self.port = port
+        self.batcher = batcher or PricingBatcher()
+        self.statistics = collections.defaultdict(LatencyStatistics)
+
+        option_info = data_provider.get_option_information()
+        self.default_option_parameters = {name: getattr(option_info, name) for name in self.OPTION_PARAMETERS}
+
+        self.portfolio = PortfolioVarModel()
+        self.portfolio.add_assets(data_provider.iter_assets())
+        self.portfolio.get_aggregated_pnl_array()
+
+        self.__server: typing.Optional[asyncio.AbstractServer] = None
+        self.__handlers = {"price": self.__price, "var": self.__calculate_var, "stats": self.__get_statistics}
+
+
+    async def start(self):
+        """
+        Starts listening. The actual port is available in self.port after the call, if port 0 was requested.
+        """
+        self.batcher.start()
+        self.__server = await asyncio.start_server(self.__handle_connection, self.host, self.port)
+        self.port = self.__server.sockets[0].getsockname()[1]
+
+
+    async def stop(self):
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+        await self.batcher.stop()
+
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.__server.serve_forever()
+        finally:
+            await self.stop()
+
+
+    async def handle_request(self, request: dict) -> dict:
+        """
+        Handles a single request and records its latency.
+
+        Parameters:
+            request: decoded request with "id", "method" and optional "params"
+        Returns:
+            response with the request id and either "result" or "error"
+        """
+        start = time.perf_counter()
+        method = request.get("method") if isinstance(request, dict) else None
+        response = {"id": request.get("id") if isinstance(request, dict) else None}
+
+        try:
+            assert method in self.__handlers, f"Unknown method: {method}"
+            params = request.get("params") or {}
+            assert isinstance(params, dict), "Parameters must be an object"
+            response["result"] = await self.__handlers[method](params)
+        except (AssertionError, KeyError, TypeError, ValueError) as e:
+            response["error"] = str(e) or type(e).__name__
+
+        if method in self.__handlers:
+            self.statistics[method].record(time.perf_counter() - start, "error" in response)
+        return response
+
+
+    async def __price(self, params: dict) -> dict:
+        unknown_parameters = set(params) - set(self.OPTION_PARAMETERS)
+        assert not unknown_parameters, f"Unknown parameters: {sorted(unknown_parameters)}"
+        option_parameters = [float(params.get(name, default)) for name, default in self.default_option_parameters.items()]
+
+        # NaN and infinite prices can't be written as JSON, so such inputs are rejected before pricing
+        for name, value in zip(self.OPTION_PARAMETERS, option_parameters):
+            assert math.isfinite(value), f"{name} must be finite: {value}"
+            assert name not in self.POSITIVE_OPTION_PARAMETERS or value > 0, f"{name} must be positive: {value}"
+
+        call_price, put_price = await self.batcher.price(*option_parameters)
+        return {"call_price": call_price, "put_price": put_price}
+
+
+    async def __calculate_var(self, params: dict) -> typing.List[dict]:
+        confidence_levels = params.get("confidence_levels", [0.99])
+        interpolation = params.get("interpolation", "exclusive")
+        assert isinstance(confidence_levels, list) and confidence_levels, "Confidence levels must be a non-empty list"
+        assert all(isinstance(level, (int, float)) and not isinstance(level, bool) and 0 < level < 1 for level in confidence_levels), \
+            f"Confidence levels must be numbers between 0 and 1: {confidence_levels}"
+
+        var_results = self.portfolio.calculate_var_results([float(level) for level in confidence_levels], interpolation)
+        return [{"confidence_level": result.confidence_level, "var": result.var, "expected_shortfall": result.expected_shortfall}
+                for result in var_results]
+
+
+    async def __get_statistics(self, params: dict) -> dict:
+        return {"methods": {method: statistics.get_summary() for method, statistics in self.statistics.items()},
+                "batch_sizes": dict(self.batcher.batch_sizes)}
+
+
+    async def __handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        pending = set()
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self.__respond(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.gather(*pending)
+        except ConnectionError:
+            for task in pending:
+                task.cancel()
+        finally:
+            writer.close()
+
+
+    async def __respond(self, line: bytes, writer: asyncio.StreamWriter):
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {"id": None, "error": f"Invalid JSON: {e}"}
+        else:
+            response = await self.handle_request(request)
+
+        try:
+            # NaN and Infinity are not valid JSON, a strict client couldn't parse the line
+            line = json.dumps(response, allow_nan=False)
+        except ValueError as e:
+            line = json.dumps({"id": response["id"], "error": f"Response can't be written as JSON: {e}"})
+
+        writer.write(line.encode() + b"\n")
+        await writer.drain()
@@ -0,0 +1,17 @@
+from models.dto.base_data_provider import BaseDataProvider
+
+
+class InMemoryDataProvider(BaseDataProvider):
+    """
+    Provides the assets and the option given in the constructor, for the tests which need a data provider.
+    """
+    def __init__(self, assets, option_info):
+        super().__init__(None)
+        self.assets = assets
+        self.option_info = option_info
+
+    def get_assets(self):
+        return self.assets
+
+    def get_option_information(self):
+        return self.option_info
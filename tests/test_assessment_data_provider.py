@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import openpyxl
+from assessment_data_provider import AssessmentDataProvider
+from benchmarks.synthetic_data import create_assessment_workbook, create_market_rates
+
+
+class TestAssessmentDataProvider(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Create a synthetic excel file with the same layout as the assessment file.
+        """
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.input_file = os.path.join(cls.directory.name, "assessment.xlsx")
+        create_assessment_workbook(cls.input_file, day_count=30, seed=1)
+
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+
+    def test_assets(self):
+        """
+        Test that the spot values and the historical data of both currencies are read.
+        """
+        assets = AssessmentDataProvider(self.input_file).get_assets()
+        market_rates = create_market_rates(2, 30, seed=1)
+
+        self.assertEqual([asset.asset_name for asset in assets], ["ccy1", "ccy2"])
+        self.assertEqual([asset.spot_value for asset in assets], [153084.81, 95891.51])
+        # excel keeps 15 significant digits
+        np.testing.assert_allclose(assets[0].historical_data, market_rates[0], rtol=1e-14)
+        np.testing.assert_allclose(assets[1].historical_data, market_rates[1], rtol=1e-14)
+
+
+    def test_option_information(self):
+        """
+        Test that the option parameters and the expected prices are read.
+        """
+        option_info = AssessmentDataProvider(self.input_file).get_option_information()
+
+        self.assertEqual((option_info.S_current_price, option_info.K_strike_price, option_info.T_time_to_maturity,
+                          option_info.r_risk_free_interest_rate, option_info.v_volatility), (19, 17, 0.46, 0.005, 0.3))
+        self.assertGreater(option_info.expected_call_price, 0)
+        self.assertGreater(option_info.expected_put_price, 0)
+
+
+    def test_workbook_is_loaded_once(self):
+        """
+        Test that the workbook is opened only once, however many times the data is requested.
+        """
+        data_provider = AssessmentDataProvider(self.input_file)
+        with mock.patch("openpyxl.load_workbook", wraps=openpyxl.load_workbook) as load_workbook:
+            first_assets = data_provider.get_assets()
+            data_provider.get_option_information()
+            second_assets = data_provider.get_assets()
+
+        self.assertEqual(load_workbook.call_count, 1)
+
+        # Cached data shouldn't be affected by the changes in the returned assets
+        first_assets[0].historical_data.append(1.0)
+        self.assertEqual(len(second_assets[0].historical_data), 30)
+        self.assertEqual(len(data_provider.get_assets()[0].historical_data), 30)
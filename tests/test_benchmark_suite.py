@@ -0,0 +1,37 @@
+import unittest
+from benchmarks.suite import find_regressions, parse_arguments, run_suite
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_run_suite(self):
+        results = run_suite("quick", ["portfolio_var"], print_results=False)
+
+        self.assertEqual(set(results), {"portfolio_var[2]", "portfolio_var[1000]"})
+        for result in results.values():
+            self.assertGreater(result["median_seconds"], 0)
+            self.assertGreaterEqual(result["median_seconds"], result["min_seconds"])
+            self.assertGreater(result["throughput"], 0)
+
+
+    def test_find_regressions(self):
+        baseline = {"case[1]": {"median_seconds": 1.0, "peak_memory_bytes": 1000},
+                    "case[2]": {"median_seconds": 2.0, "peak_memory_bytes": 0},
+                    "removed[1]": {"median_seconds": 1.0, "peak_memory_bytes": 1000}}
+        results = {"case[1]": {"median_seconds": 1.1, "peak_memory_bytes": 1500},
+                   "case[2]": {"median_seconds": 3.0, "peak_memory_bytes": 100},
+                   "new[1]": {"median_seconds": 1.0, "peak_memory_bytes": 1000}}
+
+        regressions = find_regressions(results, baseline, threshold=0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("case[1] peak_memory_bytes"))
+        self.assertTrue(regressions[1].startswith("case[2] median_seconds"))
+
+
+    def test_parse_arguments(self):
+        options = parse_arguments(["full", "--baseline", "base.json", "--threshold", "0.5", "--cases", "a,b"])
+        self.assertEqual(options, {"profile": "full", "baseline": "base.json", "save_baseline": None, "threshold": 0.5, "cases": ["a", "b"]})
+
+        self.assertEqual(parse_arguments([])["profile"], "quick")
+        self.assertRaises(AssertionError, parse_arguments, ["--unknown", "1"])
+        self.assertRaises(AssertionError, parse_arguments, ["slow"])
@@ -221,3 +221,87 @@ class TestBlackScholesModel(unittest.TestCase):
         option_info.r_risk_free_interest_rate = -0.01
         model = BlackScholesModel(option_info)
         self.assertGreater(model.calculate_put_option_price(), 0)
+
+
+    def test_intermediate_values_are_reused(self):
+        """
+        Test that call and put prices share the normal distribution calculations instead of repeating them.
+        """
+        model = BlackScholesModel(self.test_option)
+        calls = []
+        original_calculation = model.calculate_normal_distribution
+        model.calculate_normal_distribution = lambda d: calls.append(d) or original_calculation(d)
+
+        model.calculate_call_option_price()
+        model.calculate_put_option_price()
+        model.calculate_call_option_price()
+        self.assertEqual(len(calls), 4, "N(d1), N(d2), N(-d1) and N(-d2) should be calculated only once.")
+
+
+    def test_cache_is_invalidated_when_parameter_changes(self):
+        """
+        Test that changing a parameter after a calculation gives the same result as a fresh model.
+        """
+        model = BlackScholesModel(self.test_option)
+        model.calculate_call_option_price()
+        model.calculate_put_option_price()
+
+        model.S_current_price = 110
+        option_info = copy.copy(self.test_option)
+        option_info.S_current_price = 110
+        fresh_model = BlackScholesModel(option_info)
+
+        self.assertEqual(model.calculate_d1(), fresh_model.calculate_d1())
+        self.assertEqual(model.calculate_call_option_price(), fresh_model.calculate_call_option_price())
+        self.assertEqual(model.calculate_put_option_price(), fresh_model.calculate_put_option_price())
+
+
+    def test_invalid_parameter_is_not_cached(self):
+        """
+        Test that a failed calculation doesn't leave a stale value behind once the parameter is fixed.
+        """
+        option_info = copy.copy(self.test_option)
+        option_info.T_time_to_maturity = 0
+        model = BlackScholesModel(option_info)
+        self.assertRaises(AssertionError, model.calculate_call_option_price)
+
+        model.T_time_to_maturity = self.test_option.T_time_to_maturity
+        self.assertAlmostEqual(model.calculate_call_option_price(), BlackScholesModel(self.test_option).calculate_call_option_price(), places=12)
+
+
+    def test_greeks_match_finite_differences(self):
+        """
+        Test the closed-form sensitivities against bump-and-reprice results.
+        """
+        def price(**changes):
+            option_info = copy.copy(self.test_option)
+            for name, change in changes.items():
+                setattr(option_info, name, getattr(option_info, name) + change)
+            model = BlackScholesModel(option_info)
+            return model.calculate_call_option_price(), model.calculate_put_option_price()
+
+        def central_difference(name, bump):
+            (call_up, put_up), (call_down, put_down) = price(**{name: bump}), price(**{name: -bump})
+            return (call_up - call_down) / (2 * bump), (put_up - put_down) / (2 * bump)
+
+        greeks = BlackScholesModel(self.test_option).calculate_greeks()
+
+        call_delta, put_delta = central_difference("S_current_price", 1e-4)
+        self.assertAlmostEqual(greeks.call_delta, call_delta, places=6)
+        self.assertAlmostEqual(greeks.put_delta, put_delta, places=6)
+
+        call_vega, put_vega = central_difference("v_volatility", 1e-5)
+        self.assertAlmostEqual(greeks.vega, call_vega, places=4)
+        self.assertAlmostEqual(greeks.vega, put_vega, places=4)
+
+        call_rho, put_rho = central_difference("r_risk_free_interest_rate", 1e-5)
+        self.assertAlmostEqual(greeks.call_rho, call_rho, places=4)
+        self.assertAlmostEqual(greeks.put_rho, put_rho, places=4)
+
+        # theta is the sensitivity to the passage of time, i.e. the opposite of time to maturity
+        call_theta, put_theta = central_difference("T_time_to_maturity", 1e-5)
+        self.assertAlmostEqual(greeks.call_theta, -call_theta, places=4)
+        self.assertAlmostEqual(greeks.put_theta, -put_theta, places=4)
+
+        (call_up, _), (call_mid, _), (call_down, _) = price(S_current_price=1e-2), price(), price(S_current_price=-1e-2)
+        self.assertAlmostEqual(greeks.gamma, (call_up - 2 * call_mid + call_down) / 1e-4, places=5)
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from columnar_data_provider import ColumnarDataProvider
+from in_memory_data_provider import InMemoryDataProvider
+from models.dto.asset_information import AssetInformation
+from models.dto.option_information import OptionInformation
+from models.var_calculation import PortfolioVarModel
+
+
+class TestColumnarDataProvider(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(9)
+        market_rates = np.exp(np.cumsum(rng.normal(0, 0.01, (3, 40)), axis=1))
+        self.assets = [AssetInformation(f"ccy{i}", spot_value, market_rates[i].tolist()) for i, spot_value in enumerate([1000.0, -250.5, 42.0])]
+        self.option_info = OptionInformation(19, 17, 0.46, 0.005, 0.3, 2.7, None)
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_source = os.path.join(self.directory.name, "market_data.npz")
+        ColumnarDataProvider.convert(InMemoryDataProvider(self.assets, self.option_info), self.data_source)
+
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+    def test_assets_round_trip(self):
+        """
+        Test that the converted assets are the same as the original ones, with contiguous float64 historical data.
+        """
+        assets = ColumnarDataProvider(self.data_source).get_assets()
+
+        self.assertEqual(len(assets), 3)
+        for asset, expected_asset in zip(assets, self.assets):
+            self.assertEqual(asset.asset_name, expected_asset.asset_name)
+            self.assertEqual(asset.spot_value, expected_asset.spot_value)
+            self.assertEqual(asset.historical_data.dtype, np.float64)
+            self.assertTrue(asset.historical_data.flags.c_contiguous)
+            np.testing.assert_array_equal(asset.historical_data, expected_asset.historical_data)
+
+
+    def test_asset_panel(self):
+        panel = ColumnarDataProvider(self.data_source).get_asset_panel()
+
+        self.assertEqual(panel.asset_names, [asset.asset_name for asset in self.assets])
+        np.testing.assert_array_equal(panel.spot_values, [asset.spot_value for asset in self.assets])
+        np.testing.assert_array_equal(panel.historical_rates, [asset.historical_data for asset in self.assets])
+
+
+    def test_option_information_round_trip(self):
+        """
+        Test that the option parameters are the same, and a missing expected price is still missing.
+        """
+        option_info = ColumnarDataProvider(self.data_source).get_option_information()
+        for name in OptionInformation.__slots__:
+            self.assertEqual(getattr(option_info, name), getattr(self.option_info, name), name)
+
+
+    def test_same_var_as_original_data(self):
+        """
+        Test that the VaR calculated from the converted data is the same as the original data.
+        """
+        original_portfolio = PortfolioVarModel()
+        converted_portfolio = PortfolioVarModel()
+        for original_asset, converted_asset in zip(self.assets, ColumnarDataProvider(self.data_source).get_assets()):
+            original_portfolio.add_asset(original_asset)
+            converted_portfolio.add_asset(converted_asset)
+
+        self.assertEqual(original_portfolio.calculate_var(), converted_portfolio.calculate_var())
+
+
+    def test_iter_assets(self):
+        """
+        Test that the assets can be consumed lazily, and give the same VaR as the list of assets in a streaming portfolio.
+        """
+        data_provider = ColumnarDataProvider(self.data_source)
+        assets = data_provider.iter_assets()
+        self.assertEqual(next(assets).asset_name, "ccy0")
+
+        portfolio = PortfolioVarModel()
+        portfolio.add_assets(data_provider.get_assets())
+        streaming_portfolio = PortfolioVarModel(streaming=True)
+        streaming_portfolio.add_assets(data_provider.iter_assets())
+        self.assertAlmostEqual(streaming_portfolio.calculate_var(), portfolio.calculate_var(), places=9)
+
+
+    def test_different_history_lengths(self):
+        """
+        Assets with different amount of historical data can't be stored in the same matrix.
+        """
+        self.assets[0].historical_data = self.assets[0].historical_data[1:]
+        self.assertRaises(AssertionError, ColumnarDataProvider.convert, InMemoryDataProvider(self.assets, self.option_info), self.data_source)
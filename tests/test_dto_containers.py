@@ -0,0 +1,118 @@
+import copy
+import unittest
+import numpy as np
+from models.black_and_scholes_model import BlackScholesModel, VectorizedBlackScholesModel
+from models.dto.asset_information import AssetInformation
+from models.dto.asset_panel import AssetPanel
+from models.dto.option_book import OptionBook
+from models.dto.option_information import OptionInformation
+from models.var_calculation import HistoricalScenarioMatrix, PortfolioVarModel
+
+
+class TestOptionBook(unittest.TestCase):
+
+    def setUp(self):
+        self.options = [OptionInformation(19, 17, 0.46, 0.005, 0.3, 2.7, None),
+                        OptionInformation(100, 95, 1.0, 0.05, 0.2),
+                        OptionInformation(85, 95, 0.25, -0.01, 0.5, None, 12.5)]
+        self.book = OptionBook.from_option_informations(self.options)
+
+
+    def test_views_have_the_same_values(self):
+        self.assertEqual(len(self.book), 3)
+        for option, view in zip(self.options, self.book):
+            for name in OptionInformation.__slots__:
+                self.assertEqual(getattr(view, name), getattr(option, name), name)
+
+        self.assertEqual(self.book[-1].v_volatility, 0.5)
+
+
+    def test_columns_are_float64_arrays(self):
+        for name in OptionBook.FIELDS:
+            self.assertEqual(self.book.columns[name].dtype, np.float64)
+        self.assertTrue(np.isnan(self.book.columns["expected_put_price"][0]))
+
+
+    def test_view_writes_to_book(self):
+        view = self.book[1]
+        view.v_volatility = 0.25
+        view.expected_call_price = None
+
+        self.assertEqual(self.book.columns["v_volatility"][1], 0.25)
+        self.assertIsNone(self.book[1].expected_call_price)
+
+
+    def test_pricing(self):
+        """
+        Test that the book can be priced in one vectorized call, or one view at a time with the scalar model.
+        """
+        call_prices, _ = VectorizedBlackScholesModel.from_table(self.book.columns).calculate_option_prices()
+        for option, view, call_price in zip(self.options, self.book, call_prices):
+            self.assertEqual(BlackScholesModel(view).calculate_call_option_price(), BlackScholesModel(option).calculate_call_option_price())
+            self.assertAlmostEqual(call_price, BlackScholesModel(option).calculate_call_option_price(), places=12)
+
+
+    def test_scalars_are_broadcast(self):
+        book = OptionBook(np.array([90.0, 100.0, 110.0]), 100, 1, 0.05, 0.2)
+        self.assertEqual(book[2].S_current_price, 110.0)
+        self.assertEqual(book[2].K_strike_price, 100.0)
+        self.assertIsNone(book[2].expected_call_price)
+
+        # Each option has its own value after broadcasting
+        book[0].K_strike_price = 80
+        self.assertEqual(book[1].K_strike_price, 100.0)
+
+
+    def test_index_out_of_range(self):
+        self.assertRaises(AssertionError, self.book.__getitem__, 3)
+
+
+class TestAssetPanel(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(18)
+        market_rates = np.exp(np.cumsum(rng.normal(0, 0.01, (3, 50)), axis=1))
+        self.assets = [AssetInformation(f"ccy{i}", spot_value, market_rates[i].tolist()) for i, spot_value in enumerate([1000.0, -250.5, 42.0])]
+        self.panel = AssetPanel.from_asset_informations(self.assets)
+
+
+    def test_views_have_the_same_values(self):
+        for asset, view in zip(self.assets, self.panel):
+            self.assertEqual(view.asset_name, asset.asset_name)
+            self.assertEqual(view.spot_value, asset.spot_value)
+            np.testing.assert_array_equal(view.historical_data, asset.historical_data)
+
+        # historical data is a view of the panel's matrix
+        self.assertTrue(np.shares_memory(self.panel[1].historical_data, self.panel.historical_rates))
+
+
+    def test_same_var_as_asset_informations(self):
+        portfolio = PortfolioVarModel()
+        portfolio.add_assets(self.assets)
+
+        panel_portfolio = PortfolioVarModel()
+        panel_portfolio.add_assets(self.panel)
+
+        scenario_portfolio = PortfolioVarModel(HistoricalScenarioMatrix.from_market_rates(self.panel.asset_names, self.panel.historical_rates))
+        scenario_portfolio.add_assets(self.panel)
+
+        self.assertEqual(panel_portfolio.calculate_var(), portfolio.calculate_var())
+        self.assertEqual(scenario_portfolio.calculate_var(), portfolio.calculate_var())
+
+
+    def test_different_history_lengths(self):
+        self.assets[1].historical_data = self.assets[1].historical_data[:-1]
+        self.assertRaises(ValueError, AssetPanel.from_asset_informations, self.assets)
+
+
+class TestSlotDtos(unittest.TestCase):
+
+    def test_copy(self):
+        option = OptionInformation(19, 17, 0.46, 0.005, 0.3, 2.7)
+        option_copy = copy.copy(option)
+        option_copy.v_volatility = 0.4
+
+        self.assertEqual(option.v_volatility, 0.3)
+        self.assertEqual(option_copy.expected_call_price, 2.7)
+        self.assertFalse(hasattr(option, "__dict__"))
+        self.assertFalse(hasattr(AssetInformation("ccy", 1, []), "__dict__"))
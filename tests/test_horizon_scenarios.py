@@ -0,0 +1,69 @@
+import math
+import unittest
+import numpy as np
+from models.dto.asset_information import AssetInformation
+from models.horizon_scenarios import HorizonScenarioGenerator
+from models.var_calculation import HistoricalVarCalculationModel, PortfolioVarModel
+
+
+class TestHorizonScenarioGenerator(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(21)
+        self.asset_names = ["ccy1", "ccy2", "ccy3"]
+        self.spot_values = [1000.0, -250.5, 42.0]
+        self.market_rates = np.exp(np.cumsum(rng.normal(0, 0.01, (3, 300)), axis=1))
+
+
+    def test_overlapping_shifts(self):
+        """
+        Test that the shifts are the same as compounding the 1 day shifts over the horizon.
+        """
+        shift_matrices = HorizonScenarioGenerator(horizons=(1, 5, 10)).calculate_shift_matrices(self.market_rates)
+
+        one_day_shifts = HistoricalVarCalculationModel.calculate_shift_matrix(self.market_rates)
+        np.testing.assert_array_equal(shift_matrices[1], one_day_shifts)
+        for horizon in (5, 10):
+            self.assertEqual(shift_matrices[horizon].shape, (3, 300 - horizon))
+            compounded = np.prod([1 + one_day_shifts[:, day:299 - horizon + 1 + day] for day in range(horizon)], axis=0) - 1
+            np.testing.assert_allclose(shift_matrices[horizon], compounded, rtol=1e-10, atol=1e-14)
+
+
+    def test_sqrt_time_shifts(self):
+        shift_matrices = HorizonScenarioGenerator(horizons=(1, 10), method=HorizonScenarioGenerator.SQRT_TIME).calculate_shift_matrices(self.market_rates)
+
+        self.assertEqual(shift_matrices[10].shape, (3, 299))
+        np.testing.assert_allclose(shift_matrices[10], shift_matrices[1] * math.sqrt(10), rtol=1e-15)
+
+
+    def test_var_results_match_portfolio(self):
+        """
+        Test that the VaR of each horizon is the same as a PortfolioVarModel using the horizon's scenario matrix.
+        """
+        generator = HorizonScenarioGenerator(horizons=(1, 10))
+        var_results = generator.calculate_var_results(self.asset_names, self.spot_values, self.market_rates, confidence_levels=(0.99, 0.975))
+        scenario_matrices = generator.create_scenario_matrices(self.asset_names, self.market_rates)
+
+        for horizon in (1, 10):
+            portfolio = PortfolioVarModel(scenario_matrices[horizon])
+            portfolio.add_assets(AssetInformation(*asset) for asset in zip(self.asset_names, self.spot_values, self.market_rates))
+            self.assertEqual(var_results[horizon][0].var, portfolio.calculate_var(0.99))
+            self.assertEqual(var_results[horizon][1].var, portfolio.calculate_var(0.975))
+
+        # The one day VaR is the same as the default portfolio calculation
+        portfolio = PortfolioVarModel()
+        portfolio.add_assets(AssetInformation(*asset) for asset in zip(self.asset_names, self.spot_values, self.market_rates))
+        self.assertEqual(var_results[1][0].var, portfolio.calculate_var(0.99))
+
+
+    def test_sqrt_time_var(self):
+        generator = HorizonScenarioGenerator(horizons=(1, 10), method=HorizonScenarioGenerator.SQRT_TIME)
+        var_results = generator.calculate_var_results(self.asset_names, self.spot_values, self.market_rates)
+
+        self.assertAlmostEqual(var_results[10][0].var, var_results[1][0].var * math.sqrt(10), places=9)
+
+
+    def test_invalid_parameters(self):
+        self.assertRaises(AssertionError, HorizonScenarioGenerator, (0, 10))
+        self.assertRaises(AssertionError, HorizonScenarioGenerator, (10,), "unknown")
+        self.assertRaises(AssertionError, HorizonScenarioGenerator((300,)).calculate_shift_matrices, self.market_rates)
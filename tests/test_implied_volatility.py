@@ -0,0 +1,87 @@
+import unittest
+import numpy as np
+from models.black_and_scholes_model import VectorizedBlackScholesModel
+from models.implied_volatility import ImpliedVolatilitySolver
+
+
+class TestImpliedVolatilitySolver(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a book of calls and puts with known volatilities, and price them to be used as market prices.
+        """
+        self.S = np.array([100.0, 100.0, 100.0, 100.0, 50.0, 150.0, 100.0, 100.0])
+        self.K = np.array([100.0, 80.0, 120.0, 100.0, 60.0, 140.0, 95.0, 105.0])
+        self.T = np.array([1.0, 0.5, 2.0, 0.1, 1.5, 0.75, 3.0, 0.25])
+        self.r = np.array([0.05, 0.0, 0.02, -0.01, 0.03, 0.05, 0.01, 0.04])
+        self.v = np.array([0.2, 0.35, 0.15, 0.8, 0.05, 1.5, 0.25, 0.4])
+        self.is_call = np.array([True, False, True, False, True, False, True, False])
+
+        model = VectorizedBlackScholesModel(self.S, self.K, self.T, self.r, self.v)
+        self.market_prices = np.where(self.is_call, model.calculate_call_option_price(), model.calculate_put_option_price())
+
+
+    def test_recovers_volatilities(self):
+        """
+        The solver should find the volatilities used to create the market prices.
+        """
+        result = ImpliedVolatilitySolver().solve(self.market_prices, self.S, self.K, self.T, self.r, self.is_call)
+
+        np.testing.assert_array_equal(result.status, ImpliedVolatilitySolver.CONVERGED)
+        np.testing.assert_allclose(result.volatility, self.v, rtol=1e-8)
+        self.assertTrue(np.all(result.iterations > 0))
+
+
+    def test_scalar_option(self):
+        """
+        Scalars should be accepted for a single option.
+        """
+        result = ImpliedVolatilitySolver().solve(self.market_prices[0], 100, 100, 1, 0.05, True)
+        self.assertEqual(result.status, ImpliedVolatilitySolver.CONVERGED)
+        self.assertAlmostEqual(float(result.volatility), 0.2, places=8)
+
+
+    def test_price_out_of_bounds(self):
+        """
+        Prices below the intrinsic value or above the underlying can't be matched, which should be reported per option.
+        """
+        market_prices = self.market_prices.copy()
+        market_prices[1] = 0.0  # put with no time value
+        market_prices[2] = self.S[2] + 1  # call more expensive than the underlying
+        result = ImpliedVolatilitySolver().solve(market_prices, self.S, self.K, self.T, self.r, self.is_call)
+
+        self.assertEqual(result.status[1], ImpliedVolatilitySolver.PRICE_OUT_OF_BOUNDS)
+        self.assertEqual(result.status[2], ImpliedVolatilitySolver.PRICE_OUT_OF_BOUNDS)
+        self.assertTrue(np.isnan(result.volatility[1]))
+        self.assertEqual(result.status[0], ImpliedVolatilitySolver.CONVERGED)
+
+
+    def test_volatility_above_bounds(self):
+        """
+        A price whose implied volatility is above max_volatility should be flagged instead of converging on the bound.
+        """
+        market_price = VectorizedBlackScholesModel(100, 100, 1, 0, 12.0).calculate_call_option_price()
+        result = ImpliedVolatilitySolver().solve(np.array([market_price, self.market_prices[0]]), 100, 100, 1, [0, 0.05], True)
+
+        self.assertEqual(result.status[0], ImpliedVolatilitySolver.VOLATILITY_OUT_OF_BOUNDS)
+        self.assertTrue(np.isnan(result.volatility[0]))
+        self.assertEqual(result.status[1], ImpliedVolatilitySolver.CONVERGED)
+        self.assertAlmostEqual(result.volatility[1], 0.2, places=8)
+
+
+    def test_not_converged(self):
+        """
+        Options that can't converge in the allowed iterations should be flagged, keeping the last estimate.
+        """
+        result = ImpliedVolatilitySolver(max_iterations=1).solve(self.market_prices, self.S, self.K, self.T, self.r, self.is_call)
+
+        self.assertTrue(np.any(result.status == ImpliedVolatilitySolver.NOT_CONVERGED))
+        self.assertFalse(np.any(np.isnan(result.volatility)))
+
+
+    def test_initial_guess_is_close(self):
+        """
+        The rational approximation should already be close to the solution for near-the-money options.
+        """
+        guess = ImpliedVolatilitySolver.calculate_initial_guess(self.market_prices[:1], self.S[:1], self.K[:1], self.T[:1], self.r[:1])
+        self.assertAlmostEqual(guess[0], self.v[0], delta=0.01)
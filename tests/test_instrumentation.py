@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from models import instrumentation
+from models.black_and_scholes_model import BlackScholesModel, VectorizedBlackScholesModel
+from models.dto.asset_information import AssetInformation
+from models.dto.option_information import OptionInformation
+from models.pricing_cache import PricingCache
+from models.var_calculation import PortfolioVarModel
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def tearDown(self):
+        instrumentation.disable()
+
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(instrumentation.get_profiler())
+        self.assertIsNone(instrumentation.disable())
+
+        # Hooks do nothing without a profiler
+        with instrumentation.stage("stage"):
+            instrumentation.count("counter")
+
+
+    def test_nested_stages(self):
+        profiler = instrumentation.enable()
+        for _ in range(2):
+            with instrumentation.stage("outer"):
+                with instrumentation.stage("inner"):
+                    pass
+        with instrumentation.stage("inner"):
+            pass
+        instrumentation.disable()
+
+        report = profiler.get_report()
+        self.assertEqual(list(report["stages"]), ["outer", "outer/inner", "inner"])
+        self.assertEqual([stage["count"] for stage in report["stages"].values()], [2, 2, 1])
+        self.assertGreaterEqual(report["stages"]["outer"]["total_seconds"], report["stages"]["outer/inner"]["total_seconds"])
+        self.assertGreaterEqual(report["total_seconds"], report["stages"]["outer"]["total_seconds"])
+        self.assertIsNone(report["peak_memory_bytes"])
+
+
+    def test_stage_is_recorded_on_exception(self):
+        profiler = instrumentation.enable()
+        with self.assertRaises(ValueError):
+            with instrumentation.stage("failing"):
+                raise ValueError()
+
+        with instrumentation.stage("next"):
+            pass
+
+        self.assertEqual(list(profiler.stages), ["failing", "next"])
+
+
+    def test_peak_memory(self):
+        profiler = instrumentation.enable(track_memory=True)
+        with instrumentation.stage("outer"):
+            with instrumentation.stage("allocation"):
+                values = np.ones(2 ** 20)
+            del values
+            with instrumentation.stage("small"):
+                pass
+        instrumentation.disable()
+
+        stages = profiler.get_report()["stages"]
+        # The peak of a nested stage is included in the enclosing stage, but not in the stages after it
+        self.assertGreaterEqual(stages["outer/allocation"]["peak_memory_bytes"], 8 * 2 ** 20)
+        self.assertGreaterEqual(stages["outer"]["peak_memory_bytes"], stages["outer/allocation"]["peak_memory_bytes"])
+        self.assertLess(stages["outer/small"]["peak_memory_bytes"], 8 * 2 ** 20)
+        self.assertEqual(profiler.peak_memory, stages["outer"]["peak_memory_bytes"])
+
+
+    def test_hot_path_hooks(self):
+        profiler = instrumentation.enable()
+
+        BlackScholesModel(OptionInformation(19, 17, 0.46, 0.005, 0.3)).calculate_call_option_price()
+        VectorizedBlackScholesModel(np.full(10, 19.0), 17, 0.46, 0.005, 0.3).calculate_option_prices()
+
+        cache = PricingCache()
+        for _ in range(3):
+            cache.calculate_call_option_price(OptionInformation(19, 17, 0.46, 0.005, 0.3))
+
+        portfolio = PortfolioVarModel()
+        portfolio.add_asset(AssetInformation("ccy1", 100, [1.0, 1.1, 1.05, 1.2]))
+        portfolio.add_asset(AssetInformation("ccy2", 200, [2.0, 2.1, 2.05, 2.2]))
+        portfolio.calculate_var()
+        instrumentation.disable()
+
+        # 1 scalar call, 10 calls and 10 puts of the vectorized model and 1 cache miss
+        self.assertEqual(profiler.counters["options_priced"], 22)
+        self.assertEqual(profiler.counters["cache_hits"], 2)
+        self.assertEqual(profiler.counters["cache_misses"], 1)
+        self.assertEqual(profiler.counters["scenarios_processed"], 6)
+        self.assertEqual(profiler.stages["aggregation"]["count"], 1)
+        self.assertEqual(profiler.stages["quantile"]["count"], 1)
+
+
+    def test_greeks_do_not_count_as_priced_options(self):
+        profiler = instrumentation.enable()
+        VectorizedBlackScholesModel(np.full(10, 19.0), 17, 0.46, 0.005, 0.3).calculate_greeks()
+        instrumentation.disable()
+
+        self.assertEqual(profiler.counters["options_priced"], 0)
+
+
+    def test_export(self):
+        profiler = instrumentation.enable()
+        with instrumentation.stage("stage"):
+            instrumentation.count("counter", 5)
+        instrumentation.disable()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.json")
+            profiler.export(path)
+            with open(path) as report_file:
+                report = json.load(report_file)
+
+        self.assertEqual(report["counters"], {"counter": 5})
+        self.assertEqual(report["stages"]["stage"]["count"], 1)
+        self.assertIn("stage", profiler.format_report())
+        self.assertIn("counter: 5", profiler.format_report())
+
+
+if __name__ == '__main__':
+    unittest.main()
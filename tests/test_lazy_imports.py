@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_loaded_modules(code, modules=("scipy", "pandas", "openpyxl", "asyncio")):
+    """
+    Runs the code in a new interpreter and returns which of the modules are loaded after it.
+    """
+    check = f"import sys\n{code}\nprint(' '.join(m for m in {modules!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", check], cwd=REPOSITORY_ROOT, capture_output=True, text=True, check=True).stdout
+    return set(output.split())
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_main_imports_no_heavy_dependencies(self):
+        self.assertEqual(get_loaded_modules("import main"), set())
+
+
+    def test_scalar_pricing_and_var_do_not_load_scipy(self):
+        """
+        Test that the default scalar pricing and the VaR calculation run without loading scipy.
+        """
+        code = """
+from models.black_and_scholes_model import BlackScholesModel
+from models.dto.asset_information import AssetInformation
+from models.dto.option_information import OptionInformation
+from models.var_calculation import PortfolioVarModel
+BlackScholesModel(OptionInformation(19, 17, 0.46, 0.005, 0.3)).calculate_call_option_price()
+portfolio = PortfolioVarModel()
+portfolio.add_asset(AssetInformation("ccy", 100, [1.0, 1.1, 1.05, 1.2]))
+portfolio.calculate_var()
+"""
+        self.assertEqual(get_loaded_modules(code), set())
+
+
+    def test_scipy_backend_is_loaded_on_request(self):
+        code = "from models.normal_distribution import get_normal_cdf\nget_normal_cdf('ndtr')"
+        self.assertEqual(get_loaded_modules(code), {"scipy"})
+
+
+    def test_pricing_batcher_loads_backend_before_the_first_request(self):
+        """
+        Test that the service loads scipy when the batcher is created, not in the first pricing request.
+        """
+        self.assertEqual(get_loaded_modules("from pricing_service import PricingBatcher\nPricingBatcher()") - {"asyncio"}, {"scipy"})
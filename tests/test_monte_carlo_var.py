@@ -0,0 +1,82 @@
+import math
+import unittest
+import numpy as np
+from models.dto.asset_information import AssetInformation
+from models.monte_carlo_var import MonteCarloVarModel
+from models.quantile import calculate_lower_tail_statistics
+
+
+class TestMonteCarloVarModel(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(23)
+        correlated_returns = rng.multivariate_normal([0, 0, 0], [[1e-4, 5e-5, 0], [5e-5, 1e-4, 0], [0, 0, 4e-4]], 500).T
+        self.market_rates = np.exp(np.cumsum(correlated_returns, axis=1))
+        self.spot_values = [1000.0, -250.5, 42.0]
+
+
+    def test_covariance(self):
+        covariance = MonteCarloVarModel.calculate_covariance(self.market_rates)
+        log_returns = np.log(self.market_rates[:, :-1] / self.market_rates[:, 1:])
+
+        np.testing.assert_allclose(covariance, np.cov(log_returns))
+        factor = MonteCarloVarModel.calculate_cholesky_factor(covariance)
+        np.testing.assert_allclose(factor @ factor.T, covariance, rtol=1e-12)
+
+
+    def test_singular_covariance(self):
+        """
+        Test that a factor is calculated when there are more assets than historical days.
+        """
+        market_rates = np.exp(np.cumsum(np.random.default_rng(1).normal(0, 0.01, (20, 10)), axis=1))
+        covariance = MonteCarloVarModel.calculate_covariance(market_rates)
+        factor = MonteCarloVarModel.calculate_cholesky_factor(covariance)
+
+        np.testing.assert_allclose(factor @ factor.T, covariance, atol=1e-15)
+
+
+    def test_tail_is_exact(self):
+        """
+        Test that keeping only the tail of each block gives the same statistics as keeping all the paths.
+        """
+        model = MonteCarloVarModel(path_count=5000, seed=7, block_size=700)
+        results = model.calculate_var_results(self.spot_values, self.market_rates, confidence_levels=(0.99, 0.95))
+
+        factor = MonteCarloVarModel.calculate_cholesky_factor(MonteCarloVarModel.calculate_covariance(self.market_rates))
+        shocks = np.random.default_rng(7).standard_normal((5000, 3))
+        all_pnl = np.expm1(shocks @ factor.T) @ np.array(self.spot_values)
+        quantiles, tail_means = calculate_lower_tail_statistics(all_pnl, [0.01, 0.05])
+
+        np.testing.assert_allclose([result.var for result in results], quantiles, rtol=1e-12)
+        np.testing.assert_allclose([result.expected_shortfall for result in results], tail_means, rtol=1e-12)
+
+
+    def test_reproducible_with_any_block_size(self):
+        results = [MonteCarloVarModel(path_count=3000, seed=11, block_size=block_size).calculate_var_results(self.spot_values, self.market_rates)
+                   for block_size in (3000, 1000, 257)]
+
+        for result in results[1:]:
+            self.assertAlmostEqual(result[0].var, results[0][0].var, places=9)
+
+
+    def test_single_asset_matches_analytical_var(self):
+        """
+        Test that the VaR of a single asset is close to the analytical quantile of the lognormal return.
+        """
+        model = MonteCarloVarModel(path_count=200000, seed=3, horizon=10)
+        var = model.calculate_var_results([1000.0], self.market_rates[2:3])[0].var
+
+        volatility = math.sqrt(MonteCarloVarModel.calculate_covariance(self.market_rates[2:3])[0, 0] * 10)
+        expected_var = 1000.0 * math.expm1(-2.3263478740408408 * volatility)
+        self.assertAlmostEqual(var, expected_var, delta=abs(expected_var) * 0.02)
+
+
+    def test_portfolio_assets_are_netted(self):
+        assets = [AssetInformation("ccy1", 600.0, self.market_rates[0]),
+                  AssetInformation("ccy2", -250.5, self.market_rates[1]),
+                  AssetInformation("ccy1", 400.0, self.market_rates[0]),
+                  AssetInformation("ccy3", 42.0, self.market_rates[2])]
+        model = MonteCarloVarModel(path_count=2000, seed=5)
+
+        self.assertAlmostEqual(model.calculate_portfolio_var_results(assets)[0].var,
+                               model.calculate_var_results(self.spot_values, self.market_rates)[0].var, places=9)
@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+from scipy.stats import norm
+from models.black_and_scholes_model import BlackScholesModel, VectorizedBlackScholesModel
+from models.dto.option_information import OptionInformation
+from models.normal_distribution import NORMAL_CDF_BACKENDS, erfc_normal_cdf, get_normal_cdf
+
+
+class TestNormalDistribution(unittest.TestCase):
+
+    def test_erfc_within_documented_tolerance(self):
+        """
+        The erfc based implementation should be within 1 ulp of 1.0 of scipy for all values.
+        """
+        values = np.linspace(-37, 9, 20001)
+        erfc_values = np.array([erfc_normal_cdf(d) for d in values])
+        self.assertLessEqual(np.max(np.abs(erfc_values - norm.cdf(values))), 2.3e-16)
+
+        central = np.abs(values) <= 8
+        np.testing.assert_allclose(erfc_values[central], norm.cdf(values[central]), rtol=1.3e-14, atol=0)
+
+
+    def test_ndtr_matches_scipy_stats(self):
+        """
+        ndtr is the kernel of scipy.stats.norm.cdf, so the results should be identical.
+        """
+        values = np.linspace(-40, 10, 10001)
+        np.testing.assert_array_equal(get_normal_cdf("ndtr")(values), get_normal_cdf("scipy.stats")(values))
+
+
+    def test_get_normal_cdf(self):
+        """
+        Backends can be selected by name or provided as a callable. Unknown names are rejected.
+        """
+        self.assertIs(get_normal_cdf("erfc"), erfc_normal_cdf)
+        self.assertEqual(set(NORMAL_CDF_BACKENDS), {"erfc", "ndtr", "scipy.stats"})
+        self.assertIs(get_normal_cdf(erfc_normal_cdf), erfc_normal_cdf)
+        self.assertRaises(AssertionError, get_normal_cdf, "unknown")
+
+
+    def test_pricing_with_different_backends(self):
+        """
+        Option prices should be the same within tolerance whichever backend is used.
+        """
+        option_info = OptionInformation(100, 95, 1, 0.05, 0.2)
+        reference = BlackScholesModel(option_info, normal_cdf_backend="scipy.stats")
+        fast = BlackScholesModel(option_info)
+
+        self.assertAlmostEqual(fast.calculate_call_option_price(), reference.calculate_call_option_price(), places=12)
+        self.assertAlmostEqual(fast.calculate_put_option_price(), reference.calculate_put_option_price(), places=12)
+
+        vectorized = VectorizedBlackScholesModel(100, [90, 95, 100], 1, 0.05, 0.2, normal_cdf_backend="scipy.stats")
+        np.testing.assert_array_equal(vectorized.calculate_call_option_price(),
+                                      VectorizedBlackScholesModel(100, [90, 95, 100], 1, 0.05, 0.2).calculate_call_option_price())
@@ -0,0 +1,162 @@
+import unittest
+import numpy as np
+from models.black_and_scholes_model import BlackScholesModel
+from models.dto.asset_information import AssetInformation
+from models.dto.option_information import OptionInformation
+from models.dto.option_position_information import OptionPositionInformation
+from models.option_revaluation import OptionRevaluationModel
+from models.var_calculation import HistoricalScenarioMatrix, HistoricalVarCalculationModel, PortfolioVarModel
+
+
+class TestOptionRevaluationModel(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(22)
+        self.market_rates = np.exp(np.cumsum(rng.normal(0, 0.01, (2, 41)), axis=1))
+        self.positions = [OptionPositionInformation("ccy1", self.market_rates[0], OptionInformation(100, 95, 0.5, 0.02, 0.2), 10),
+                          OptionPositionInformation("ccy2", self.market_rates[1], OptionInformation(50, 55, 1.0, 0.01, 0.3), -4, is_call=False),
+                          OptionPositionInformation("ccy1", self.market_rates[0], OptionInformation(100, 110, 0.25, 0.02, 0.25), 3, is_call=False)]
+        self.spot_shifts = HistoricalVarCalculationModel.calculate_shift_matrix(self.market_rates[[0, 1, 0]])
+
+
+    def get_scalar_pnl(self, position, spot_shift, volatility_shift=0.0):
+        """
+        Reprice a position in a single scenario with the scalar model.
+        """
+        option = position.option_info
+        base_model = BlackScholesModel(option)
+        shocked_model = BlackScholesModel(OptionInformation(option.S_current_price * (1 + spot_shift), option.K_strike_price,
+                                                            option.T_time_to_maturity, option.r_risk_free_interest_rate,
+                                                            option.v_volatility + volatility_shift))
+        if position.is_call:
+            return position.quantity * (shocked_model.calculate_call_option_price() - base_model.calculate_call_option_price())
+        return position.quantity * (shocked_model.calculate_put_option_price() - base_model.calculate_put_option_price())
+
+
+    def test_full_revaluation_matches_scalar_model(self):
+        pnl_matrix = OptionRevaluationModel().calculate_pnl_matrix(self.positions, self.spot_shifts)
+
+        self.assertEqual(pnl_matrix.shape, (40, 3))
+        for scenario in range(40):
+            for index, position in enumerate(self.positions):
+                self.assertAlmostEqual(pnl_matrix[scenario, index], self.get_scalar_pnl(position, self.spot_shifts[index, scenario]), places=10)
+
+
+    def test_volatility_shifts(self):
+        volatility_history = 0.2 + np.linspace(0, 0.04, 41)
+        self.positions[0].volatility_history = volatility_history
+        volatility_shifts = OptionRevaluationModel.calculate_volatility_shifts(self.positions, 40)
+
+        np.testing.assert_array_equal(volatility_shifts[1:], 0)
+        pnl_matrix = OptionRevaluationModel().calculate_pnl_matrix(self.positions, self.spot_shifts, volatility_shifts)
+        for scenario in range(40):
+            expected = self.get_scalar_pnl(self.positions[0], self.spot_shifts[0, scenario], volatility_history[scenario] - volatility_history[scenario + 1])
+            self.assertAlmostEqual(pnl_matrix[scenario, 0], expected, places=10)
+
+
+    def test_volatility_shifts_over_horizon(self):
+        volatility_history = 0.2 + np.linspace(0, 0.04, 41)
+        self.positions[0].volatility_history = volatility_history
+        volatility_shifts = OptionRevaluationModel.calculate_volatility_shifts(self.positions, 31, horizon=10)
+
+        np.testing.assert_allclose(volatility_shifts[0], volatility_history[:-10] - volatility_history[10:], rtol=1e-12)
+        self.assertRaises(AssertionError, OptionRevaluationModel.calculate_volatility_shifts, self.positions, 40, 10)
+
+
+    def test_delta_gamma_approximation(self):
+        """
+        Test that the delta-gamma PnL follows its formula, and it is close to the full revaluation for small shifts.
+        """
+        delta_gamma = OptionRevaluationModel(OptionRevaluationModel.DELTA_GAMMA)
+        pnl_matrix = delta_gamma.calculate_pnl_matrix(self.positions, self.spot_shifts)
+
+        position = self.positions[1]
+        model = BlackScholesModel(position.option_info)
+        spot_changes = position.option_info.S_current_price * self.spot_shifts[1]
+        expected = position.quantity * (model.calculate_put_delta() * spot_changes + 0.5 * model.calculate_gamma() * spot_changes ** 2)
+        np.testing.assert_allclose(pnl_matrix[:, 1], expected, rtol=1e-10)
+
+        full_pnl_matrix = OptionRevaluationModel().calculate_pnl_matrix(self.positions, self.spot_shifts)
+        np.testing.assert_allclose(pnl_matrix, full_pnl_matrix, atol=0.05)
+
+
+    def test_chunks(self):
+        full_pnl = OptionRevaluationModel().calculate_pnl_matrix(self.positions, self.spot_shifts).sum(axis=1)
+        chunked_pnl = OptionRevaluationModel(chunk_size=2).calculate_aggregated_pnl(self.positions, self.spot_shifts)
+
+        np.testing.assert_allclose(chunked_pnl, full_pnl, rtol=1e-12, atol=1e-12)
+
+
+    def test_invalid_method(self):
+        self.assertRaises(AssertionError, OptionRevaluationModel, "unknown")
+
+
+class TestPortfolioWithOptionPositions(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(23)
+        market_rates = np.exp(np.cumsum(rng.normal(0, 0.01, (2, 100)), axis=1))
+        self.assets = [AssetInformation("ccy1", 1000, market_rates[0]), AssetInformation("ccy2", -500, market_rates[1])]
+        self.positions = [OptionPositionInformation("ccy1", market_rates[0], OptionInformation(1.0, 1.0, 0.5, 0.02, 0.1), 5000),
+                          OptionPositionInformation("ccy3", market_rates[1] * 2, OptionInformation(2.0, 1.9, 1.0, 0.01, 0.15), -2000, is_call=False)]
+
+
+    def test_aggregated_pnl(self):
+        """
+        Test that the portfolio PnL is the sum of the linear PnL and the repriced option PnL, and the incremental
+        update gives the same result as the batched recalculation.
+        """
+        portfolio = PortfolioVarModel()
+        portfolio.add_assets(self.assets)
+        linear_pnl = portfolio.get_aggregated_pnl_array().copy()
+
+        for position in self.positions:
+            portfolio.add_option_position(position)
+        incremental_pnl = portfolio.get_aggregated_pnl_array().copy()
+
+        option_pnl = sum(portfolio.get_option_position_pnl_array(position) for position in self.positions)
+        np.testing.assert_allclose(incremental_pnl, linear_pnl + option_pnl, rtol=1e-12)
+        np.testing.assert_allclose(portfolio.recalculate_aggregated_pnl(), incremental_pnl, rtol=1e-12, atol=1e-9)
+
+
+    def test_multi_day_scenario_matrix(self):
+        """
+        Test that the volatility changes are taken over the same horizon as the shifts of a multi-day scenario matrix.
+        """
+        market_rates = np.array([asset.historical_data for asset in self.assets])
+        scenario_matrix = HistoricalScenarioMatrix.from_market_rates(["ccy1", "ccy2"], market_rates, horizon=10)
+        self.assertEqual(scenario_matrix.horizon, 10)
+
+        volatility_history = 0.1 + 0.02 * np.sin(np.arange(100) / 5)
+        position = OptionPositionInformation("ccy1", market_rates[0], OptionInformation(1.0, 1.0, 0.5, 0.02, 0.1), 5000, volatility_history=volatility_history)
+        portfolio = PortfolioVarModel(scenario_matrix)
+        portfolio.add_option_position(position)
+
+        volatility_shifts = (volatility_history[:-10] - volatility_history[10:])[np.newaxis]
+        expected_pnl = OptionRevaluationModel().calculate_aggregated_pnl([position], scenario_matrix.shift_matrix[[0]], volatility_shifts)
+        np.testing.assert_allclose(portfolio.get_aggregated_pnl_array(), expected_pnl, rtol=1e-12)
+
+
+    def test_only_option_positions(self):
+        portfolio = PortfolioVarModel(option_revaluation=OptionRevaluationModel(OptionRevaluationModel.DELTA_GAMMA))
+        for position in self.positions:
+            portfolio.add_option_position(position)
+
+        self.assertEqual(len(portfolio.get_aggregated_pnl_array()), 99)
+        self.assertLess(portfolio.calculate_var(), 0)
+        self.assertRaises(AssertionError, portfolio.calculate_marginal_var)
+
+
+    def test_streaming(self):
+        portfolio = PortfolioVarModel()
+        portfolio.add_assets(self.assets)
+        for position in self.positions:
+            portfolio.add_option_position(position)
+
+        streaming_portfolio = PortfolioVarModel(streaming=True)
+        streaming_portfolio.add_assets(self.assets)
+        for position in self.positions:
+            streaming_portfolio.add_option_position(position)
+
+        self.assertEqual(streaming_portfolio.option_positions, [])
+        self.assertAlmostEqual(streaming_portfolio.calculate_var(), portfolio.calculate_var(), places=9)
@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+from models.black_and_scholes_model import VectorizedBlackScholesModel
+from models.parallel_pricing import ParallelOptionPricer
+
+
+class TestParallelOptionPricer(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(21)
+        option_count = 10007  # not a multiple of the chunk sizes, so the last chunk is partial
+        self.S = rng.uniform(50, 150, option_count)
+        self.K = rng.uniform(50, 150, option_count)
+        self.T = rng.uniform(0.01, 3, option_count)
+        self.r = rng.uniform(-0.01, 0.05, option_count)
+        self.v = rng.uniform(0.05, 1.0, option_count)
+
+
+    def test_matches_single_threaded_model_exactly(self):
+        """
+        Test that the prices are exactly the same as a single pass, whatever the chunk size and the number of workers are.
+        """
+        expected_calls, expected_puts = VectorizedBlackScholesModel(self.S, self.K, self.T, self.r, self.v).calculate_option_prices()
+
+        for chunk_size, max_workers in ((1000, 4), (333, 2), (4096, 1), (None, None)):
+            call_prices, put_prices = ParallelOptionPricer(chunk_size, max_workers).calculate_option_prices(self.S, self.K, self.T, self.r, self.v)
+            np.testing.assert_array_equal(call_prices, expected_calls)
+            np.testing.assert_array_equal(put_prices, expected_puts)
+
+
+    def test_preallocated_results(self):
+        """
+        Test that the prices are written into the provided arrays, and broadcasting works for 2-D books.
+        """
+        S = self.S[:10000].reshape(100, 100)
+        call_prices = np.empty((100, 100))
+        put_prices = np.empty((100, 100))
+
+        returned_calls, returned_puts = ParallelOptionPricer(chunk_size=777, max_workers=3).calculate_option_prices(S, 100, 1, 0.05, 0.2, call_prices, put_prices)
+
+        self.assertIs(returned_calls, call_prices)
+        self.assertIs(returned_puts, put_prices)
+        expected_calls, expected_puts = VectorizedBlackScholesModel(S, 100, 1, 0.05, 0.2).calculate_option_prices()
+        np.testing.assert_array_equal(call_prices, expected_calls)
+        np.testing.assert_array_equal(put_prices, expected_puts)
+
+
+    def test_invalid_result_array(self):
+        pricer = ParallelOptionPricer(chunk_size=1000)
+        self.assertRaises(AssertionError, pricer.calculate_option_prices, self.S, self.K, self.T, self.r, self.v, np.empty(10))
+        self.assertRaises(AssertionError, pricer.calculate_option_prices, self.S, self.K, self.T, self.r, self.v, np.empty(len(self.S), dtype=np.float32))
+
+
+    def test_invalid_option_in_chunk(self):
+        """
+        Test that the validation errors of the chunks are raised.
+        """
+        self.v[5000] = 0
+        self.assertRaises(AssertionError, ParallelOptionPricer(chunk_size=1000, max_workers=2).calculate_option_prices, self.S, self.K, self.T, self.r, self.v)
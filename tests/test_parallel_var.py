@@ -0,0 +1,66 @@
+import tempfile
+import unittest
+import numpy as np
+from models.dto.asset_information import AssetInformation
+from models.dto.portfolio_node import PortfolioNode
+from models.parallel_var import ParallelPortfolioVarCalculator
+from models.var_calculation import HistoricalScenarioMatrix, PortfolioVarModel
+
+
+class TestParallelPortfolioVarCalculator(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a hierarchy of a firm with two desks, where one desk holds positions directly as well as through its books.
+        """
+        rng = np.random.default_rng(17)
+        self.asset_names = [f"asset{i}" for i in range(20)]
+        self.market_rates = np.exp(np.cumsum(rng.normal(0, 0.01, (20, 251)), axis=1))
+        self.scenario_matrix = HistoricalScenarioMatrix.from_market_rates(self.asset_names, self.market_rates)
+
+        def create_node(name, asset_indices, children=None):
+            return PortfolioNode(name, [self.asset_names[i] for i in asset_indices], rng.uniform(-1000, 1000, len(asset_indices)), children)
+
+        self.root = PortfolioNode("firm", children=[
+            create_node("rates desk", [0, 1], [create_node("book1", range(2, 8)), create_node("book2", [3, 8, 9, 10])]),
+            PortfolioNode("fx desk", children=[create_node("book3", range(11, 20))]),
+        ])
+
+
+    def get_serial_var(self, node, confidence_level=0.99):
+        """
+        VaR of the node with a PortfolioVarModel holding all the positions of the node and its children.
+        """
+        portfolio = PortfolioVarModel()
+        for hierarchy_node in ParallelPortfolioVarCalculator.get_nodes(node):
+            for asset_name, spot_value in zip(hierarchy_node.asset_names, hierarchy_node.spot_values):
+                portfolio.add_asset(AssetInformation(asset_name, spot_value, self.market_rates[self.asset_names.index(asset_name)]))
+
+        return portfolio.calculate_var(confidence_level)
+
+
+    def assert_matches_serial(self, calculator, confidence_level=0.99):
+        node_vars = calculator.calculate_var(self.root, confidence_level)
+
+        self.assertEqual(set(node_vars), {"firm", "rates desk", "book1", "book2", "fx desk", "book3"})
+        for node in ParallelPortfolioVarCalculator.get_nodes(self.root):
+            self.assertAlmostEqual(node_vars[node.name], self.get_serial_var(node, confidence_level), places=8, msg=node.name)
+
+
+    def test_single_worker(self):
+        self.assert_matches_serial(ParallelPortfolioVarCalculator(self.scenario_matrix, max_workers=1, task_size=3))
+
+
+    def test_process_pool_with_shared_memory(self):
+        self.assert_matches_serial(ParallelPortfolioVarCalculator(self.scenario_matrix, max_workers=2, task_size=3), 0.95)
+
+
+    def test_process_pool_with_memmap(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.scenario_matrix.save(directory)
+            self.assert_matches_serial(ParallelPortfolioVarCalculator(HistoricalScenarioMatrix.open_memmap(directory), max_workers=2))
+
+
+    def test_node_names_must_be_unique(self):
+        root = PortfolioNode("firm", children=[PortfolioNode("book"), PortfolioNode("book")])
+        self.assertRaises(AssertionError, ParallelPortfolioVarCalculator.get_nodes, root)
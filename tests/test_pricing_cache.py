@@ -0,0 +1,89 @@
+import unittest
+from models.black_and_scholes_model import BlackScholesModel
+from models.dto.option_information import OptionInformation
+from models.pricing_cache import PricingCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+class TestPricingCache(unittest.TestCase):
+
+    def setUp(self):
+        self.option = OptionInformation(19, 17, 0.46, 0.005, 0.3)
+
+
+    def test_same_prices_as_model(self):
+        cache = PricingCache()
+        model = BlackScholesModel(self.option)
+
+        self.assertEqual(cache.calculate_call_option_price(self.option), model.calculate_call_option_price())
+        self.assertEqual(cache.calculate_put_option_price(self.option), model.calculate_put_option_price())
+        self.assertEqual(cache.calculate_greeks(self.option).gamma, model.calculate_greeks().gamma)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+
+    def test_quantized_key(self):
+        """
+        Test that options differing below the rounding precision share the same entry.
+        """
+        cache = PricingCache(decimals=6)
+        cache.calculate_call_option_price(self.option)
+        cache.calculate_call_option_price(OptionInformation(19 + 1e-9, 17, 0.46, 0.005, 0.3))
+        cache.calculate_call_option_price(OptionInformation(19 + 1e-5, 17, 0.46, 0.005, 0.3))
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+
+    def test_lru_eviction(self):
+        cache = PricingCache(max_size=2)
+        options = [OptionInformation(19, strike, 0.46, 0.005, 0.3) for strike in (16, 17, 18)]
+
+        cache.get_model(options[0])
+        cache.get_model(options[1])
+        cache.get_model(options[0])  # options[1] is now the least recently used
+        cache.get_model(options[2])
+
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(len(cache), 2)
+        cache.get_model(options[0])
+        self.assertEqual(cache.hits, 2)
+        cache.get_model(options[1])
+        self.assertEqual(cache.misses, 4)
+
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = PricingCache(ttl=1.0, clock=clock)
+
+        cache.get_model(self.option)
+        clock.time = 0.5
+        cache.get_model(self.option)
+        clock.time = 1.5
+        cache.get_model(self.option)
+
+        statistics = cache.get_statistics()
+        self.assertEqual((statistics["hits"], statistics["misses"], statistics["expirations"]), (1, 2, 1))
+        self.assertAlmostEqual(statistics["hit_rate"], 1 / 3)
+
+
+    def test_invalidate(self):
+        cache = PricingCache()
+        cache.get_model(self.option)
+        cache.invalidate()
+
+        self.assertEqual(len(cache), 0)
+        cache.get_model(self.option)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+
+    def test_invalid_option(self):
+        cache = PricingCache()
+        option = OptionInformation(19, 17, 0.46, 0.005, 0)
+        self.assertRaises(AssertionError, cache.calculate_call_option_price, option)
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import unittest
+import numpy as np
+from in_memory_data_provider import InMemoryDataProvider
+from models.black_and_scholes_model import BlackScholesModel
+from models.dto.asset_information import AssetInformation
+from models.dto.option_information import OptionInformation
+from models.var_calculation import PortfolioVarModel
+from pricing_service import LatencyStatistics, PricingBatcher, PricingService
+
+
+class TestPricingService(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        rng = np.random.default_rng(16)
+        market_rates = np.exp(np.cumsum(rng.normal(0, 0.01, (3, 120)), axis=1))
+        self.assets = [AssetInformation(f"ccy{i}", spot_value, market_rates[i].tolist()) for i, spot_value in enumerate([1000.0, -250.5, 42.0])]
+        self.option_info = OptionInformation(19, 17, 0.46, 0.005, 0.3)
+
+        self.service = PricingService(InMemoryDataProvider(self.assets, self.option_info), port=0)
+        await self.service.start()
+        self.reader, self.writer = await asyncio.open_connection(self.service.host, self.service.port)
+
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self.service.stop()
+
+
+    async def send_requests(self, requests):
+        """
+        Sends all the requests before reading the responses, and returns the responses by id.
+        """
+        for request in requests:
+            self.writer.write(json.dumps(request).encode() + b"\n")
+        await self.writer.drain()
+
+        responses = [json.loads(await self.reader.readline()) for _ in requests]
+        return {response["id"]: response for response in responses}
+
+
+    async def test_concurrent_pricing_requests_are_batched(self):
+        """
+        Test that the requests sent together are priced in a single batch, with the same prices as the scalar model.
+        """
+        volatilities = [0.1 + i * 0.01 for i in range(50)]
+        responses = await self.send_requests([{"id": i, "method": "price", "params": {"v_volatility": v}} for i, v in enumerate(volatilities)])
+
+        for i, v in enumerate(volatilities):
+            model = BlackScholesModel(OptionInformation(19, 17, 0.46, 0.005, v))
+            self.assertAlmostEqual(responses[i]["result"]["call_price"], model.calculate_call_option_price(), places=12)
+            self.assertAlmostEqual(responses[i]["result"]["put_price"], model.calculate_put_option_price(), places=12)
+
+        self.assertGreater(max(self.service.batcher.batch_sizes), 1)
+        self.assertEqual(sum(size * count for size, count in self.service.batcher.batch_sizes.items()), len(volatilities))
+
+
+    async def test_invalid_option_fails_only_its_request(self):
+        responses = await self.send_requests([{"id": 1, "method": "price"},
+                                              {"id": 2, "method": "price", "params": {"v_volatility": 0}},
+                                              {"id": 3, "method": "price", "params": {"S_current_price": 20}}])
+
+        self.assertIn("result", responses[1])
+        self.assertIn("v_volatility must be positive", responses[2]["error"])
+        self.assertIn("result", responses[3])
+
+
+    async def test_non_finite_option_parameters(self):
+        """
+        Test that NaN and infinite parameters are rejected, and every response line is strict JSON.
+        """
+        self.writer.write(b'{"id": 1, "method": "price", "params": {"v_volatility": "nan"}}\n'
+                          b'{"id": 2, "method": "price", "params": {"S_current_price": "inf"}}\n')
+        await self.writer.drain()
+
+        def parse_strict(line):
+            return json.loads(line, parse_constant=lambda constant: self.fail(f"Invalid JSON constant: {constant}"))
+        responses = {response["id"]: response for response in [parse_strict(await self.reader.readline()) for _ in range(2)]}
+
+        self.assertIn("v_volatility must be finite", responses[1]["error"])
+        self.assertIn("S_current_price must be finite", responses[2]["error"])
+
+
+    async def test_var(self):
+        """
+        Test that the VaR is calculated from the warm portfolio, with the same result as the one-shot calculation.
+        """
+        responses = await self.send_requests([{"id": 1, "method": "var", "params": {"confidence_levels": [0.99, 0.95]}}])
+
+        portfolio = PortfolioVarModel()
+        portfolio.add_assets(self.assets)
+        result = responses[1]["result"]
+        self.assertEqual([item["confidence_level"] for item in result], [0.99, 0.95])
+        self.assertEqual(result[0]["var"], portfolio.calculate_var(0.99))
+        self.assertEqual(result[1]["var"], portfolio.calculate_var(0.95))
+
+
+    async def test_invalid_confidence_levels(self):
+        responses = await self.send_requests([{"id": 1, "method": "var", "params": {"confidence_levels": []}},
+                                              {"id": 2, "method": "var", "params": {"confidence_levels": "0.99"}},
+                                              {"id": 3, "method": "var", "params": {"confidence_levels": [0.99, 1.5]}}])
+
+        self.assertIn("non-empty list", responses[1]["error"])
+        self.assertIn("non-empty list", responses[2]["error"])
+        self.assertIn("between 0 and 1", responses[3]["error"])
+
+
+    async def test_invalid_requests(self):
+        self.writer.write(b"not json\n")
+        self.assertIn("Invalid JSON", json.loads(await self.reader.readline())["error"])
+
+        responses = await self.send_requests([{"id": 1, "method": "unknown"},
+                                              {"id": 2, "method": "price", "params": {"x": 1}}])
+        self.assertIn("Unknown method", responses[1]["error"])
+        self.assertIn("Unknown parameters", responses[2]["error"])
+
+
+    async def test_statistics(self):
+        await self.send_requests([{"id": i, "method": "price"} for i in range(10)] + [{"id": 10, "method": "var"}])
+        responses = await self.send_requests([{"id": 11, "method": "stats"}])
+
+        statistics = responses[11]["result"]["methods"]
+        self.assertEqual(statistics["price"]["request_count"], 10)
+        self.assertEqual(statistics["var"]["request_count"], 1)
+        self.assertGreater(statistics["price"]["throughput"], 0)
+        self.assertLessEqual(statistics["price"]["p50_ms"], statistics["price"]["p99_ms"])
+
+
+class TestLatencyStatistics(unittest.TestCase):
+
+    def test_percentiles_of_recent_latencies(self):
+        statistics = LatencyStatistics(window_size=100)
+        statistics.record(10.0, is_error=True)
+        for i in range(1, 101):
+            statistics.record(i / 1000)
+
+        summary = statistics.get_summary()
+        self.assertEqual(summary["request_count"], 101)
+        self.assertEqual(summary["error_count"], 1)
+        # The 10 seconds latency is out of the window
+        self.assertEqual(summary["max_ms"], 100.0)
+        self.assertAlmostEqual(summary["p50_ms"], 50.5)
+
+
+    def test_empty(self):
+        summary = LatencyStatistics().get_summary()
+        self.assertEqual(summary["request_count"], 0)
+        self.assertEqual(summary["p99_ms"], 0.0)
+
+
+class TestPricingBatcher(unittest.IsolatedAsyncioTestCase):
+
+    async def test_max_batch_size(self):
+        batcher = PricingBatcher(max_batch_size=4)
+        batcher.start()
+        try:
+            prices = await asyncio.gather(*[batcher.price(100, 100, 1, 0.05, 0.2) for _ in range(10)])
+        finally:
+            await batcher.stop()
+
+        self.assertEqual(len(set(prices)), 1)
+        self.assertEqual(dict(batcher.batch_sizes), {4: 2, 2: 1})
@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+from models.quantile import INTERPOLATIONS, calculate_lower_tail_statistics, get_quantile_position, get_tail_count
+
+
+class TestQuantile(unittest.TestCase):
+
+    def setUp(self):
+        self.values = np.random.default_rng(3).normal(0, 100, 1001)
+        self.probabilities = [0.001, 0.01, 0.025, 0.05, 0.5]
+
+
+    def test_matches_numpy_quantile(self):
+        """
+        Each interpolation convention should be the same as the equivalent numpy method.
+        """
+        numpy_methods = {"exclusive": "weibull", "inclusive": "linear", "lower": "lower", "higher": "higher", "nearest": "nearest"}
+        self.assertEqual(set(numpy_methods), set(INTERPOLATIONS))
+
+        for interpolation, numpy_method in numpy_methods.items():
+            quantiles, _ = calculate_lower_tail_statistics(self.values, self.probabilities, interpolation)
+            np.testing.assert_allclose(quantiles, np.quantile(self.values, self.probabilities, method=numpy_method), rtol=1e-12, err_msg=interpolation)
+
+
+    def test_nearest_rounds_ties_to_even(self):
+        """
+        Exact ties of the nearest convention should be rounded to the even index, same as numpy.
+        """
+        for values in ([1.0, 2.0, 3.0, 4.0], [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]):
+            probabilities = [index / (2 * (len(values) - 1)) for index in range(1, 2 * len(values) - 2, 2)]
+            quantiles, _ = calculate_lower_tail_statistics(values, probabilities, "nearest")
+            np.testing.assert_array_equal(quantiles, np.quantile(values, probabilities, method="nearest"))
+
+        self.assertEqual(calculate_lower_tail_statistics([1.0, 2.0, 3.0, 4.0], [0.5], "nearest")[0][0], 3.0)
+
+
+    def test_tail_means(self):
+        """
+        Tail means should be the average of the smallest ceil(n * p) values.
+        """
+        sorted_values = np.sort(self.values)
+        _, tail_means = calculate_lower_tail_statistics(self.values, self.probabilities)
+
+        for probability, tail_mean in zip(self.probabilities, tail_means):
+            self.assertAlmostEqual(tail_mean, sorted_values[:get_tail_count(len(self.values), probability)].mean(), places=9)
+
+
+    def test_assessment_convention(self):
+        """
+        The exclusive convention should give the weights previously hardcoded for the assessment data (259 scenarios at 99%).
+        """
+        self.assertEqual(get_quantile_position(259, 0.01, "exclusive"), (1, 2, 0.6))
+        self.assertEqual(get_tail_count(259, 0.01), 3)
+
+
+    def test_positions_are_clamped(self):
+        """
+        Probabilities beyond the data should use the first/last values.
+        """
+        self.assertEqual(get_quantile_position(10, 0.001, "exclusive"), (0, 0, 0.0))
+        self.assertEqual(get_quantile_position(10, 1, "exclusive"), (9, 9, 0.0))
+        self.assertEqual(get_quantile_position(1, 0.5, "inclusive"), (0, 0, 0.0))
+
+
+    def test_invalid_parameters(self):
+        self.assertRaises(AssertionError, get_quantile_position, 0, 0.01)
+        self.assertRaises(AssertionError, get_quantile_position, 10, 1.5)
+        self.assertRaises(AssertionError, get_quantile_position, 10, 0.01, "unknown")
@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+from models.dto.asset_information import AssetInformation
+from models.quantile import calculate_lower_tail_statistics
+from models.rolling_var import RollingVarCalculator
+from models.var_calculation import PortfolioVarModel
+
+
+class TestRollingVarCalculator(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(20)
+        self.pnl = rng.standard_t(4, 400) * 1000
+        # Repeated values should be removed from the window one at a time
+        self.pnl[10:20] = self.pnl[30]
+
+
+    def test_matches_full_calculation_of_each_window(self):
+        """
+        Test that every date has the same VaR and expected shortfall as calculating its window from scratch.
+        """
+        confidence_levels = (0.95, 0.99)
+        result = RollingVarCalculator(window_size=100, confidence_levels=confidence_levels).calculate(self.pnl)
+
+        self.assertEqual(result.var.shape, (300, 2))
+        for date in range(300):
+            quantiles, tail_means = calculate_lower_tail_statistics(self.pnl[date + 1:date + 101], [0.05, 0.01])
+            np.testing.assert_array_equal(result.var[date], quantiles)
+            np.testing.assert_allclose(result.expected_shortfall[date], tail_means, rtol=1e-12)
+
+
+    def test_backtest_exceptions(self):
+        result = RollingVarCalculator(window_size=250, confidence_levels=(0.99, 0.95)).calculate(self.pnl)
+
+        np.testing.assert_array_equal(result.realized_pnl, self.pnl[:150])
+        expected_exceptions = self.pnl[:150, np.newaxis] < result.var
+        np.testing.assert_array_equal(result.exceptions, expected_exceptions)
+        np.testing.assert_array_equal(result.exception_counts, expected_exceptions.sum(axis=0))
+        np.testing.assert_allclose(result.expected_exception_counts, [1.5, 7.5])
+
+
+    def test_window_larger_than_data(self):
+        self.assertRaises(AssertionError, RollingVarCalculator(window_size=400).calculate, self.pnl)
+
+
+    def test_portfolio_rolling_var(self):
+        """
+        Test that the last date of the portfolio's time series uses the same scenarios as the portfolio VaR without the most recent one.
+        """
+        rng = np.random.default_rng(21)
+        market_rates = np.exp(np.cumsum(rng.normal(0, 0.01, (2, 300)), axis=1))
+        portfolio = PortfolioVarModel()
+        portfolio.add_assets([AssetInformation("ccy1", 1000, market_rates[0]), AssetInformation("ccy2", -500, market_rates[1])])
+
+        result = portfolio.calculate_rolling_var(window_size=250)
+        pnl = portfolio.get_aggregated_pnl_array()
+
+        self.assertEqual(len(result.var), 299 - 250)
+        self.assertEqual(result.var[0, 0], calculate_lower_tail_statistics(pnl[1:251], [0.01])[0][0])
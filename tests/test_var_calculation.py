@@ -0,0 +1,363 @@
+import math
+import os
+import tempfile
+import tracemalloc
+import unittest
+import numpy as np
+from models.dto.asset_information import AssetInformation
+from models.var_calculation import HistoricalScenarioMatrix, HistoricalVarCalculationModel, PortfolioVarModel
+
+
+class TestHistoricalVarCalculationModel(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create market rates for a few assets, sorted from recent to old.
+        """
+        rng = np.random.default_rng(7)
+        self.market_rates = 1.2 * np.exp(np.cumsum(rng.normal(0, 0.01, (3, 30)), axis=1))
+        self.spot_values = np.array([1000.0, -500.0, 250.0])
+
+
+    def get_expected_pnls(self, spot_value, market_rates):
+        """
+        PnLs with the original formula of the model, one day at a time.
+        """
+        return [spot_value * (math.exp(math.log(market_rates[day] / market_rates[day + 1])) - 1) for day in range(len(market_rates) - 1)]
+
+
+    def test_pnl_vector(self):
+        """
+        Test that the PnL vector is still a list, and the same as the day by day calculation within tolerance.
+        """
+        model = HistoricalVarCalculationModel(self.spot_values[0], self.market_rates[0].tolist(), "ccy1")
+        pnl_vector = model.calculate_pnl_vector()
+
+        self.assertIsInstance(pnl_vector, list)
+        self.assertEqual(len(pnl_vector), self.market_rates.shape[1] - 1)
+        np.testing.assert_allclose(pnl_vector, self.get_expected_pnls(self.spot_values[0], self.market_rates[0]), rtol=1e-12, atol=1e-12)
+
+
+    def test_pnl_matrix(self):
+        """
+        Test that the PnL matrix has the same rows as the PnL vectors of each asset.
+        """
+        pnl_matrix = HistoricalVarCalculationModel.calculate_pnl_matrix(self.spot_values, self.market_rates)
+
+        self.assertEqual(pnl_matrix.shape, (3, self.market_rates.shape[1] - 1))
+        for asset_index, spot_value in enumerate(self.spot_values):
+            model = HistoricalVarCalculationModel(spot_value, self.market_rates[asset_index])
+            np.testing.assert_array_equal(pnl_matrix[asset_index], model.calculate_pnl_array())
+
+
+    def test_external_var_assessment_convention(self):
+        """
+        Test that the default convention gives the previously hardcoded value for 259 scenarios at 99%.
+        """
+        pnls = np.random.default_rng(5).normal(0, 1000, 259)
+        sorted_pnls = sorted(pnls)
+
+        var = HistoricalVarCalculationModel.calculate_external_var(pnls.tolist(), 0.99)
+        self.assertEqual(var, 0.4 * sorted_pnls[1] + 0.6 * sorted_pnls[2])
+
+
+    def test_external_var_uses_confidence_level(self):
+        """
+        Test that VaR and expected shortfall are calculated for each confidence level, with the worse results for higher levels.
+        """
+        pnls = np.random.default_rng(5).normal(0, 1000, 1000)
+        results = HistoricalVarCalculationModel.calculate_external_var_results(pnls, [0.95, 0.975, 0.99, 0.999])
+
+        self.assertEqual([result.confidence_level for result in results], [0.95, 0.975, 0.99, 0.999])
+        for result in results:
+            self.assertEqual(result.var, HistoricalVarCalculationModel.calculate_external_var(pnls, result.confidence_level))
+            self.assertAlmostEqual(result.var, np.quantile(pnls, 1 - result.confidence_level, method="weibull"), places=9)
+            self.assertLessEqual(result.expected_shortfall, result.var)
+
+        for worse, better in zip(results[1:], results[:-1]):
+            self.assertLess(worse.var, better.var)
+            self.assertLess(worse.expected_shortfall, better.expected_shortfall)
+
+        inclusive_var = HistoricalVarCalculationModel.calculate_external_var(pnls, 0.99, "inclusive")
+        self.assertAlmostEqual(inclusive_var, np.quantile(pnls, 0.01), places=9)
+
+
+    def test_asset_var(self):
+        """
+        Test that the asset VaR is the VaR of its PnL vector.
+        """
+        model = HistoricalVarCalculationModel(self.spot_values[0], self.market_rates[0])
+        self.assertEqual(model.calculate_asset_var(0.95), HistoricalVarCalculationModel.calculate_external_var(model.calculate_pnl_vector(), 0.95))
+
+
+    def test_not_enough_market_rates(self):
+        """
+        A single market rate is not enough to calculate a shift.
+        """
+        model = HistoricalVarCalculationModel(100, [1.1])
+        self.assertRaises(AssertionError, model.calculate_pnl_vector)
+
+
+class TestPortfolioVarModel(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a few assets with the same amount of historical data.
+        """
+        rng = np.random.default_rng(11)
+        self.market_rates = 1.2 * np.exp(np.cumsum(rng.normal(0, 0.01, (4, 50)), axis=1))
+        self.assets = [AssetInformation(f"ccy{i}", spot_value, self.market_rates[i].tolist())
+                       for i, spot_value in enumerate([1000.0, -500.0, 250.0, 2000.0])]
+
+
+    def get_expected_aggregated_pnl(self, assets):
+        """
+        Sum of the PnL vectors of each asset.
+        """
+        return np.sum([HistoricalVarCalculationModel(asset.spot_value, asset.historical_data).calculate_pnl_array() for asset in assets], axis=0)
+
+
+    def test_aggregated_pnl(self):
+        """
+        Test that the aggregated PnL is the sum of the PnL vectors of the assets.
+        """
+        portfolio = PortfolioVarModel()
+        for asset in self.assets:
+            portfolio.add_asset(asset)
+
+        aggregated_pnl = portfolio.get_aggregated_pnl()
+        self.assertIsInstance(aggregated_pnl, list)
+        np.testing.assert_allclose(aggregated_pnl, self.get_expected_aggregated_pnl(self.assets), rtol=1e-12, atol=1e-9)
+
+
+    def test_scenario_matrix_is_rebuilt_when_asset_added(self):
+        """
+        Test that an asset added after a calculation is included in the next calculation.
+        """
+        portfolio = PortfolioVarModel()
+        portfolio.add_asset(self.assets[0])
+        portfolio.get_aggregated_pnl()
+        portfolio.add_asset(self.assets[1])
+
+        np.testing.assert_allclose(portfolio.get_aggregated_pnl_array(), self.get_expected_aggregated_pnl(self.assets[:2]), rtol=1e-12, atol=1e-9)
+
+
+    def test_shared_scenario_matrix(self):
+        """
+        Test that portfolios with different subsets of the assets can share the same scenario matrix.
+        """
+        scenario_matrix = HistoricalScenarioMatrix.from_assets(self.assets)
+        self.assertEqual(scenario_matrix.shift_matrix.shape, (4, 49))
+
+        for portfolio_assets in (self.assets, self.assets[1:3], [self.assets[2], self.assets[0], self.assets[2]]):
+            portfolio = PortfolioVarModel(scenario_matrix)
+            for asset in portfolio_assets:
+                portfolio.add_asset(asset)
+
+            self.assertIs(portfolio.get_scenario_matrix(), scenario_matrix)
+            np.testing.assert_allclose(portfolio.get_aggregated_pnl_array(), self.get_expected_aggregated_pnl(portfolio_assets), rtol=1e-12, atol=1e-9)
+
+
+    def test_repeated_asset_with_different_historical_data(self):
+        """
+        Test that positions of the same asset must have the same historical data, as the asset is only in the matrix once.
+        """
+        same_history = AssetInformation("ccy0", 10.0, list(self.assets[0].historical_data))
+        self.assertEqual(HistoricalScenarioMatrix.from_assets([self.assets[0], same_history]).asset_names, ["ccy0"])
+
+        different_history = AssetInformation("ccy0", 10.0, self.assets[1].historical_data)
+        self.assertRaises(AssertionError, HistoricalScenarioMatrix.from_assets, [self.assets[0], different_history])
+
+
+    def test_asset_missing_from_shared_scenario_matrix(self):
+        """
+        Test that an asset which is not in the shared scenario matrix is rejected.
+        """
+        portfolio = PortfolioVarModel(HistoricalScenarioMatrix.from_assets(self.assets[:2]))
+        portfolio.add_asset(self.assets[3])
+        self.assertRaises(AssertionError, portfolio.get_aggregated_pnl)
+
+
+    def test_incremental_updates(self):
+        """
+        Test that adding and removing assets after a calculation updates the aggregated PnL the same as a full recalculation.
+        """
+        portfolio = PortfolioVarModel()
+        for asset in self.assets[:2]:
+            portfolio.add_asset(asset)
+        portfolio.calculate_var()
+
+        portfolio.add_asset(self.assets[2])
+        portfolio.add_asset(self.assets[3])
+        np.testing.assert_allclose(portfolio.get_aggregated_pnl_array(), self.get_expected_aggregated_pnl(self.assets), rtol=1e-12, atol=1e-9)
+
+        removed_asset = portfolio.remove_asset("ccy1")
+        self.assertIs(removed_asset, self.assets[1])
+        expected_assets = [self.assets[0], self.assets[2], self.assets[3]]
+        self.assertEqual(portfolio.assets, expected_assets)
+        np.testing.assert_allclose(portfolio.get_aggregated_pnl_array(), self.get_expected_aggregated_pnl(expected_assets), rtol=1e-12, atol=1e-9)
+        np.testing.assert_allclose(portfolio.get_aggregated_pnl_array(), portfolio.recalculate_aggregated_pnl(), rtol=1e-12, atol=1e-9)
+
+        self.assertRaises(AssertionError, portfolio.remove_asset, "unknown")
+
+
+    def test_incremental_var(self):
+        """
+        Test that the incremental VaR of a candidate asset is the VaR difference, without adding the asset.
+        """
+        portfolio = PortfolioVarModel()
+        for asset in self.assets[:3]:
+            portfolio.add_asset(asset)
+        current_var = portfolio.calculate_var()
+
+        incremental_var = portfolio.calculate_incremental_var(self.assets[3])
+        self.assertEqual(len(portfolio.assets), 3)
+        self.assertEqual(portfolio.calculate_var(), current_var)
+
+        portfolio.add_asset(self.assets[3])
+        self.assertAlmostEqual(current_var + incremental_var, portfolio.calculate_var(), places=9)
+
+
+    def test_incremental_updates_check_scenario_count(self):
+        """
+        Test that an asset with a different amount of historical data is rejected once the aggregated PnL is calculated,
+        instead of being broadcast over all the scenarios.
+        """
+        portfolio = PortfolioVarModel()
+        portfolio.add_assets(self.assets)
+        current_var = portfolio.calculate_var()
+
+        short_asset = AssetInformation("short", 1000.0, self.assets[0].historical_data[:2])
+        self.assertRaises(AssertionError, portfolio.calculate_incremental_var, short_asset)
+        self.assertRaises(AssertionError, portfolio.add_asset, short_asset)
+
+        self.assertEqual(portfolio.assets, self.assets)
+        self.assertEqual(portfolio.calculate_var(), current_var)
+
+
+    def test_component_var(self):
+        """
+        Test that the component VaRs add up to the portfolio VaR, and marginal VaR is the sensitivity to the spot value.
+        """
+        portfolio = PortfolioVarModel()
+        for asset in self.assets:
+            portfolio.add_asset(asset)
+
+        for interpolation in ("exclusive", "inclusive", "lower"):
+            component_var = portfolio.calculate_component_var(0.95, interpolation)
+            self.assertEqual(component_var.shape, (4,))
+            self.assertAlmostEqual(np.sum(component_var), portfolio.calculate_var(0.95, interpolation), places=9)
+
+        marginal_var = portfolio.calculate_marginal_var(0.95)
+        bump = 1e-3
+        bumped_portfolio = PortfolioVarModel()
+        for asset in self.assets:
+            bumped_portfolio.add_asset(AssetInformation(asset.asset_name, asset.spot_value + (bump if asset is self.assets[0] else 0), asset.historical_data))
+        self.assertAlmostEqual((bumped_portfolio.calculate_var(0.95) - portfolio.calculate_var(0.95)) / bump, marginal_var[0], places=6)
+
+
+    def test_streaming_portfolio(self):
+        """
+        Test that a streaming portfolio gives the same VaR without keeping the assets.
+        """
+        portfolio = PortfolioVarModel()
+        portfolio.add_assets(self.assets)
+
+        streaming_portfolio = PortfolioVarModel(streaming=True)
+        streaming_portfolio.add_assets(asset for asset in self.assets)
+
+        self.assertEqual(streaming_portfolio.assets, [])
+        np.testing.assert_allclose(streaming_portfolio.get_aggregated_pnl_array(), portfolio.get_aggregated_pnl_array(), rtol=1e-12, atol=1e-9)
+        self.assertAlmostEqual(streaming_portfolio.calculate_var(), portfolio.calculate_var(), places=9)
+        self.assertAlmostEqual(streaming_portfolio.calculate_incremental_var(self.assets[0]), portfolio.calculate_incremental_var(self.assets[0]), places=9)
+
+
+    def test_streaming_portfolio_limitations(self):
+        """
+        Test that the calculations which need the individual assets are rejected in streaming mode.
+        """
+        streaming_portfolio = PortfolioVarModel(streaming=True)
+        self.assertRaises(AssertionError, streaming_portfolio.calculate_var)
+
+        streaming_portfolio.add_assets(self.assets)
+        self.assertRaises(AssertionError, streaming_portfolio.remove_asset, "ccy0")
+        self.assertRaises(AssertionError, streaming_portfolio.calculate_component_var)
+        self.assertRaises(AssertionError, streaming_portfolio.recalculate_aggregated_pnl)
+
+        short_asset = AssetInformation("short", 1.0, self.assets[0].historical_data[1:])
+        self.assertRaises(AssertionError, streaming_portfolio.add_asset, short_asset)
+
+
+class TestHistoricalScenarioMatrix(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(13)
+        self.asset_names = [f"asset{i}" for i in range(300)]
+        self.market_rates = np.exp(np.cumsum(rng.normal(0, 0.01, (300, 501)), axis=1))
+        self.spot_values = rng.uniform(-1000, 1000, 300)
+        self.directory = tempfile.TemporaryDirectory()
+
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+    def get_var(self, scenario_matrix, chunk_size=None):
+        return HistoricalVarCalculationModel.calculate_external_var(scenario_matrix.aggregate_pnl(self.asset_names, self.spot_values, chunk_size))
+
+
+    def test_memmap_matches_in_memory(self):
+        """
+        Test that the memory-mapped matrix gives exactly the same PnL and VaR as the in-memory matrix.
+        """
+        scenario_matrix = HistoricalScenarioMatrix.from_market_rates(self.asset_names, self.market_rates)
+        scenario_matrix.save(self.directory.name)
+        memmap_matrix = HistoricalScenarioMatrix.open_memmap(self.directory.name)
+
+        self.assertIsInstance(memmap_matrix.shift_matrix.base, np.memmap)
+        self.assertEqual(memmap_matrix.asset_names, self.asset_names)
+        for chunk_size in (None, 1, 7, 1000):
+            np.testing.assert_array_equal(memmap_matrix.aggregate_pnl(self.asset_names, self.spot_values, chunk_size),
+                                          scenario_matrix.aggregate_pnl(self.asset_names, self.spot_values, chunk_size))
+            self.assertEqual(self.get_var(memmap_matrix, chunk_size), self.get_var(scenario_matrix, chunk_size))
+
+        np.testing.assert_allclose(scenario_matrix.aggregate_pnl(self.asset_names, self.spot_values), self.spot_values @ scenario_matrix.shift_matrix, rtol=1e-9, atol=1e-9)
+
+
+    def test_memmap_keeps_horizon(self):
+        directory = os.path.join(self.directory.name, "horizon")
+        HistoricalScenarioMatrix.from_market_rates(self.asset_names, self.market_rates, horizon=5).save(directory)
+        self.assertEqual(HistoricalScenarioMatrix.open_memmap(directory).horizon, 5)
+
+
+    def test_create_memmap_from_memmap_market_rates(self):
+        """
+        Test that the shifts can be calculated from memory-mapped market rates directly into a memory-mapped matrix.
+        """
+        market_rates_path = os.path.join(self.directory.name, "market_rates.npy")
+        np.save(market_rates_path, self.market_rates)
+        market_rates = np.load(market_rates_path, mmap_mode="r")
+
+        memmap_matrix = HistoricalScenarioMatrix.create_memmap(self.asset_names, market_rates, os.path.join(self.directory.name, "scenarios"), chunk_size=64)
+        np.testing.assert_array_equal(memmap_matrix.shift_matrix, HistoricalVarCalculationModel.calculate_shift_matrix(self.market_rates))
+
+        portfolio = PortfolioVarModel(memmap_matrix)
+        for asset_name, spot_value in zip(self.asset_names, self.spot_values):
+            portfolio.add_asset(AssetInformation(asset_name, spot_value, None))
+        self.assertEqual(portfolio.calculate_var(), self.get_var(HistoricalScenarioMatrix.from_market_rates(self.asset_names, self.market_rates)))
+
+
+    def test_aggregation_memory_is_bounded(self):
+        """
+        Test that the aggregation of a memory-mapped matrix only keeps a chunk of rows in memory.
+        """
+        HistoricalScenarioMatrix.from_market_rates(self.asset_names, self.market_rates).save(self.directory.name)
+        memmap_matrix = HistoricalScenarioMatrix.open_memmap(self.directory.name)
+        matrix_size = memmap_matrix.shift_matrix.nbytes
+
+        tracemalloc.start()
+        memmap_matrix.aggregate_pnl(self.asset_names, self.spot_values, chunk_size=10)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.assertLess(peak_memory, matrix_size / 10)
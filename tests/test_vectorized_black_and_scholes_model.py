@@ -0,0 +1,115 @@
+import unittest
+import numpy as np
+from models.dto.option_information import OptionInformation
+from models.black_and_scholes_model import BlackScholesModel, VectorizedBlackScholesModel
+
+
+class TestVectorizedBlackScholesModel(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a small book of options covering in/at/out-of-the-money cases and different parameters.
+        """
+        self.S = np.array([105.0, 95.0, 85.0, 100.0, 100.0, 100.0])
+        self.K = np.array([95.0, 95.0, 95.0, 100.0, 120.0, 80.0])
+        self.T = np.array([1.0, 1.0, 1.0, 0.25, 2.0, 0.5])
+        self.r = np.array([0.05, 0.05, 0.05, 0.0, -0.01, 0.03])
+        self.v = np.array([0.2, 0.2, 0.2, 0.35, 0.15, 0.5])
+
+
+    def get_scalar_prices(self):
+        """
+        Price the same book one by one using the scalar model.
+        """
+        calls = []
+        puts = []
+        for S, K, T, r, v in zip(self.S, self.K, self.T, self.r, self.v):
+            model = BlackScholesModel(OptionInformation(S, K, T, r, v))
+            calls.append(model.calculate_call_option_price())
+            puts.append(model.calculate_put_option_price())
+
+        return np.array(calls), np.array(puts)
+
+
+    def test_prices_match_scalar_model(self):
+        """
+        Vectorized call/put prices should be the same as the scalar model within tolerance.
+        """
+        model = VectorizedBlackScholesModel(self.S, self.K, self.T, self.r, self.v)
+        call_prices, put_prices = model.calculate_option_prices()
+        expected_calls, expected_puts = self.get_scalar_prices()
+
+        np.testing.assert_allclose(call_prices, expected_calls, rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(put_prices, expected_puts, rtol=1e-12, atol=1e-12)
+        np.testing.assert_array_equal(model.calculate_call_option_price(), call_prices)
+        np.testing.assert_array_equal(model.calculate_put_option_price(), put_prices)
+
+
+    def test_scalars_are_broadcast(self):
+        """
+        Scalar parameters should be broadcast against the array parameters.
+        """
+        model = VectorizedBlackScholesModel(self.S, 95, 1, 0.05, 0.2)
+        call_prices, put_prices = model.calculate_option_prices()
+
+        self.assertEqual(call_prices.shape, self.S.shape)
+        self.assertEqual(put_prices.shape, self.S.shape)
+        for i, S in enumerate(self.S):
+            scalar_model = BlackScholesModel(OptionInformation(S, 95, 1, 0.05, 0.2))
+            self.assertAlmostEqual(call_prices[i], scalar_model.calculate_call_option_price(), places=12)
+            self.assertAlmostEqual(put_prices[i], scalar_model.calculate_put_option_price(), places=12)
+
+
+    def test_from_table(self):
+        """
+        A columnar table with the default column names should give the same prices as the arrays.
+        """
+        table = {"S_current_price": self.S,
+                 "K_strike_price": self.K,
+                 "T_time_to_maturity": self.T,
+                 "r_risk_free_interest_rate": self.r,
+                 "v_volatility": self.v}
+        model = VectorizedBlackScholesModel.from_table(table)
+        expected_model = VectorizedBlackScholesModel(self.S, self.K, self.T, self.r, self.v)
+
+        np.testing.assert_array_equal(model.calculate_call_option_price(), expected_model.calculate_call_option_price())
+
+
+    def test_from_option_informations(self):
+        """
+        A list of DTOs should give the same prices as the arrays.
+        """
+        options = [OptionInformation(*params) for params in zip(self.S, self.K, self.T, self.r, self.v)]
+        model = VectorizedBlackScholesModel.from_option_informations(options)
+        expected_calls, _ = self.get_scalar_prices()
+
+        np.testing.assert_allclose(model.calculate_call_option_price(), expected_calls, rtol=1e-12, atol=1e-12)
+
+
+    def test_zero_volatility_in_book(self):
+        """
+        A single invalid option in the book should fail the same way as the scalar model.
+        """
+        v = self.v.copy()
+        v[2] = 0
+        self.assertRaises(AssertionError, VectorizedBlackScholesModel, self.S, self.K, self.T, self.r, v)
+
+
+    def test_zero_time_to_maturity_in_book(self):
+        """
+        Zero time to maturity is treated as invalid, similar to the scalar model.
+        """
+        self.assertRaises(AssertionError, VectorizedBlackScholesModel, self.S, self.K, 0, self.r, self.v)
+
+
+    def test_greeks_match_scalar_model(self):
+        """
+        Vectorized sensitivities should be the same as the scalar ones for every option in the book.
+        """
+        greeks = VectorizedBlackScholesModel(self.S, self.K, self.T, self.r, self.v).calculate_greeks()
+        greek_names = ["call_delta", "put_delta", "gamma", "vega", "call_theta", "put_theta", "call_rho", "put_rho"]
+
+        for i, params in enumerate(zip(self.S, self.K, self.T, self.r, self.v)):
+            scalar_greeks = BlackScholesModel(OptionInformation(*params)).calculate_greeks()
+            for name in greek_names:
+                self.assertAlmostEqual(getattr(greeks, name)[i], getattr(scalar_greeks, name), places=10, msg=f"{name} mismatch for option {i}")